@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""Compare how long it takes to load a large synthetic test suite with the pure
+Python yaml loader and the libyaml-backed one.
+
+Usage:
+
+    ./scripts/benchmark_collection.py --files 4000 --tests-per-file 3
+"""
+
+import argparse
+import pathlib
+import tempfile
+import time
+from textwrap import dedent
+
+import yaml
+
+from tavern._core.loader import FastIncludeLoader, IncludeLoader
+
+COMMON = dedent(
+    """
+    name: common
+    variables:
+      host: http://localhost:5000
+      token: abc123
+    """
+)
+
+TEST_DOC = dedent(
+    """
+    ---
+    test_name: test {idx}
+    includes:
+      - !include common.yaml
+    marks:
+      - slow
+    stages:
+      - &login_{idx}
+        name: login
+        request:
+          url: "{{host}}/login"
+          method: POST
+          json:
+            user: user{idx}
+            password: pass
+        response:
+          status_code: 200
+          json:
+            token: !anystr
+          save:
+            json:
+              token: token
+      - name: get data
+        request:
+          url: "{{host}}/data/{idx}"
+          headers:
+            Authorization: "Bearer {{token}}"
+        response:
+          status_code: 200
+          json:
+            id: !int "{idx}"
+            values: [1, 2, 3, 4, 5]
+            nested:
+              a: !anything
+              b: !anyint
+    """
+)
+
+
+def generate_suite(root: pathlib.Path, n_files: int, tests_per_file: int) -> list:
+    (root / "common.yaml").write_text(COMMON, encoding="utf-8")
+
+    paths = []
+    for file_idx in range(n_files):
+        path = root / f"test_{file_idx}.tavern.yaml"
+        content = "".join(
+            TEST_DOC.format(idx=file_idx * tests_per_file + i)
+            for i in range(tests_per_file)
+        )
+        path.write_text(content, encoding="utf-8")
+        paths.append(path)
+
+    return paths
+
+
+def time_loader(paths: list, loader) -> float:
+    start = time.perf_counter()
+    for path in paths:
+        with path.open(encoding="utf-8") as infile:
+            list(yaml.load_all(infile, Loader=loader))
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--files", type=int, default=1000)
+    parser.add_argument("--tests-per-file", type=int, default=3)
+    args = parser.parse_args()
+
+    if FastIncludeLoader is IncludeLoader:
+        raise SystemExit("libyaml is not available, nothing to compare against")
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        paths = generate_suite(pathlib.Path(tmpdir), args.files, args.tests_per_file)
+
+        python_time = time_loader(paths, IncludeLoader)
+        libyaml_time = time_loader(paths, FastIncludeLoader)
+
+    print(f"{len(paths)} files, {len(paths) * args.tests_per_file} tests")  # noqa: T201
+    print(f"pure python: {python_time:.2f}s")  # noqa: T201
+    print(  # noqa: T201
+        f"libyaml:     {libyaml_time:.2f}s ({python_time / libyaml_time:.1f}x faster)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,5 @@
 import asyncio
+import atexit
 import logging
 import threading
 from typing import Any, Optional
@@ -67,3 +68,32 @@ class ThreadedAsyncLoop(threading.Thread):
         """
         future = asyncio.run_coroutine_threadsafe(coro, self._loop)
         return future.result(timeout=timeout)
+
+
+class _SharedLoop:
+    """An event loop shared by everything in this process which needs one, so
+    async clients can keep connections open between tests without needing a
+    thread each
+
+    The loop is started the first time it is used and stopped when the process
+    exits.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._loop: Optional[ThreadedAsyncLoop] = None
+
+    def __call__(self) -> ThreadedAsyncLoop:
+        with self._lock:
+            if self._loop is None or not self._loop.is_alive():
+                loop = ThreadedAsyncLoop()
+                # Don't stop the interpreter from exiting
+                loop.daemon = True
+                loop.__enter__()
+                atexit.register(loop.__exit__, None, None, None)
+                self._loop = loop
+
+            return self._loop
+
+
+shared_loop = _SharedLoop()
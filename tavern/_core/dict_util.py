@@ -1,11 +1,12 @@
+import dataclasses
 import functools
 import logging
 import os
 import re
 import string
 import typing
-from collections.abc import Collection, Iterator, Mapping, Sequence
-from typing import Any, Union
+from collections.abc import Callable, Collection, Iterator, Mapping, Sequence
+from typing import Any, Optional, Union
 
 import box
 import jmespath
@@ -18,6 +19,8 @@ from tavern._core.loader import (
     RegexSentinel,
     TypeConvertToken,
     TypeSentinel,
+    dict_node,
+    list_node,
 )
 
 from .formatted_str import FormattedString
@@ -26,23 +29,175 @@ from .strict_util import StrictSetting, StrictSettingKinds, extract_strict_setti
 logger: logging.Logger = logging.getLogger(__name__)
 
 
-def _check_and_format_values(to_format: str, box_vars: Box) -> str:
-    """Checks and formats a string with the given variables.
+_CONVERSIONS: dict[str, Callable[[Any], str]] = {"s": str, "r": repr, "a": ascii}
 
-    Parses the input string to identify format placeholders and verifies that
-    all required variables exist in the provided box_vars. Performs string
-    formatting after validation, optionally ignoring missing format variables.
+# Matches field names in format strings like 'a.b[0][c]', to split them into the
+# first name then each attribute/item access
+_FIELD_NAME = re.compile(r"^([^.[]*)((?:\.[^.[]+|\[[^\]]+\])*)$")
+_FIELD_ACCESS = re.compile(r"\.([^.[]+)|\[([^\]]+)\]")
+_DIGITS = re.compile(r"^[0-9]+$")
 
-    Args:
-        to_format: String with format placeholders to be formatted
-        box_vars: Box object containing variables for formatting
 
-    Raises:
-        MissingFormatError: If a required format variable is not found in
-            box_vars (and dangerously_ignore_string_format_errors is False)
+class VariablesView(Mapping):
+    """Read only view over variables used for formatting
 
-    Returns:
-        Formatted string with variables replaced by their values
+    Keys in mappings can be accessed as attributes, so '{a.b[0].c}' works in
+    the same way as if the variables were in a Box, but nothing is copied or
+    converted - nested mappings and lists are wrapped in another view when
+    they are accessed.
+    """
+
+    __slots__ = ("_raw",)
+
+    def __init__(self, raw: Mapping | list) -> None:
+        self._raw = raw
+
+    @staticmethod
+    def wrap(value: Any) -> Any:
+        if isinstance(value, dict | list):
+            return VariablesView(value)
+        return value
+
+    @staticmethod
+    def unwrap(value: Any) -> Any:
+        if isinstance(value, VariablesView):
+            return value._raw
+        return value
+
+    def __getitem__(self, key: Any) -> Any:
+        return self.wrap(self._raw[key])
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("__"):
+            # Stops infinite recursion when copying before _raw is set
+            raise AttributeError(name)
+
+        raw = self._raw
+
+        # Like Box, methods and attributes take priority over keys
+        if hasattr(type(raw), name):
+            return getattr(raw, name)
+
+        if not isinstance(raw, Mapping):
+            raise AttributeError(name)
+
+        try:
+            return self.wrap(raw[name])
+        except KeyError:
+            pass
+
+        # Fall back to Box, which can also convert names like 'my_key' into
+        # the key 'my-key'. This raises a BoxKeyError (a KeyError) if there is
+        # no matching key.
+        return self.wrap(getattr(Box(raw), name))
+
+    def __contains__(self, key: Any) -> bool:
+        return key in self._raw
+
+    def __iter__(self) -> Iterator:
+        return iter(self._raw)
+
+    def __len__(self) -> int:
+        return len(self._raw)
+
+    def __format__(self, format_spec: str) -> str:
+        return format(self._raw, format_spec)
+
+    def __str__(self) -> str:
+        return str(self._raw)
+
+    def __repr__(self) -> str:
+        return repr(self._raw)
+
+
+@dataclasses.dataclass(frozen=True)
+class FormatField:
+    """A replacement field in a format string
+
+    Attributes:
+        field_name: name of the field, as written in the format string
+        first: first name in the field name
+        rest: each attribute (True) or item (False) access after the first
+            name. None if the field name is unusual, in which case it is
+            looked up with string.Formatter instead.
+        conversion: conversion to apply to the value, if any
+        format_spec: format spec for the value
+    """
+
+    field_name: str
+    first: str | int
+    rest: Optional[tuple[tuple[bool, str | int], ...]]
+    conversion: Optional[str]
+    format_spec: str
+
+    @classmethod
+    def from_field_name(
+        cls, field_name: str, conversion: Optional[str], format_spec: str
+    ) -> "FormatField":
+        first: str | int = field_name
+        rest: Optional[list[tuple[bool, str | int]]] = None
+
+        if match := _FIELD_NAME.match(field_name):
+            first, accesses = match.groups()
+            if _DIGITS.match(first):
+                first = int(first)
+
+            rest = []
+            for attr, item in _FIELD_ACCESS.findall(accesses):
+                if attr:
+                    rest.append((True, attr))
+                else:
+                    rest.append((False, int(item) if _DIGITS.match(item) else item))
+
+        return cls(
+            field_name=field_name,
+            first=first,
+            rest=None if rest is None else tuple(rest),
+            conversion=conversion,
+            format_spec=format_spec,
+        )
+
+    def resolve(self, variables: VariablesView) -> Any:
+        """Look up the value for this field in the same way as str.format"""
+        if self.rest is None:
+            value = string.Formatter().get_field(self.field_name, [], variables)[0]
+            return VariablesView.unwrap(value)
+
+        if isinstance(self.first, int):
+            # Positional arguments are never passed
+            raise IndexError(self.first)
+
+        value = variables[self.first]
+        for is_attr, key in self.rest:
+            value = getattr(value, key) if is_attr else value[key]  # type:ignore
+
+        return VariablesView.unwrap(value)
+
+
+@dataclasses.dataclass(frozen=True)
+class FormatTemplate:
+    """A parsed format string
+
+    Attributes:
+        parts: literal text and replacement fields, in order
+        use_str_format: whether the string has to be formatted with str.format
+            after looking up the fields, because it uses nested fields in a
+            format spec
+    """
+
+    parts: tuple[str | FormatField, ...]
+    use_str_format: bool
+
+
+@functools.lru_cache(maxsize=4096)
+def compile_format_string(to_format: str) -> FormatTemplate:
+    """Parse a format string
+
+    This is cached, so strings used in multiple tests or stages (or each time a
+    stage is retried) are only parsed once.
+
+    Raises:
+        BadSchemaError: if the string is not a valid format string
     """
     formatter = string.Formatter()
     try:
@@ -53,33 +208,89 @@ def _check_and_format_values(to_format: str, box_vars: Box) -> str:
             " Escape literal braces as '{{{{' and '}}}}' if they are not format placeholders."
         ) from e
 
-    for _, field_name, _, _ in would_format:
+    parts: list[str | FormatField] = []
+    use_str_format = False
+
+    for literal_text, field_name, format_spec, conversion in would_format:
+        if literal_text:
+            parts.append(literal_text)
+
         if field_name is None:
             continue
 
+        if (format_spec and "{" in format_spec) or (
+            conversion is not None and conversion not in _CONVERSIONS
+        ):
+            # Let str.format deal with these
+            use_str_format = True
+
+        parts.append(
+            FormatField.from_field_name(field_name, conversion, format_spec or "")
+        )
+
+    return FormatTemplate(parts=tuple(parts), use_str_format=use_str_format)
+
+
+def _check_and_format_values(to_format: str, variables: VariablesView) -> str:
+    """Checks and formats a string with the given variables.
+
+    Parses the input string to identify format placeholders and verifies that
+    all required variables exist in the provided variables. Performs string
+    formatting after validation, optionally ignoring missing format variables.
+
+    Args:
+        to_format: String with format placeholders to be formatted
+        variables: variables for formatting
+
+    Raises:
+        MissingFormatError: If a required format variable is not found in
+            variables (and dangerously_ignore_string_format_errors is False)
+
+    Returns:
+        Formatted string with variables replaced by their values
+    """
+    template = compile_format_string(to_format)
+
+    formatted: list[str] = []
+
+    for part in template.parts:
+        if isinstance(part, str):
+            formatted.append(part)
+            continue
+
         try:
-            would_replace = formatter.get_field(field_name, [], box_vars)[0]
+            would_replace = part.resolve(variables)
         except KeyError as e:
             logger.error(
-                "Failed to resolve string '%s' with variables '%s'", to_format, box_vars
+                "Failed to resolve string '%s' with variables '%s'",
+                to_format,
+                variables,
             )
-            logger.error("Key(s) not found in format: %s", field_name)
-            raise exceptions.MissingFormatError(field_name) from e
+            logger.error("Key(s) not found in format: %s", part.field_name)
+            raise exceptions.MissingFormatError(part.field_name) from e
         except IndexError as e:
             logger.error("Empty format values are invalid")
-            raise exceptions.MissingFormatError(field_name) from e
-        else:
-            if not isinstance(would_replace, str | int | float):
-                logger.warning(
-                    "Formatting '%s' will result in it being coerced to a string (it is a %s)",
-                    field_name,
-                    type(would_replace),
-                )
+            raise exceptions.MissingFormatError(part.field_name) from e
+
+        if not isinstance(would_replace, str | int | float):
+            logger.warning(
+                "Formatting '%s' will result in it being coerced to a string (it is a %s)",
+                part.field_name,
+                type(would_replace),
+            )
 
-    return to_format.format(**box_vars)
+        if not template.use_str_format:
+            if part.conversion is not None:
+                would_replace = _CONVERSIONS[part.conversion](would_replace)
+            formatted.append(format(would_replace, part.format_spec))
 
+    if template.use_str_format:
+        return to_format.format(**variables)
 
-def _attempt_find_include(to_format: str, box_vars: box.Box) -> str | None:
+    return "".join(formatted)
+
+
+def _attempt_find_include(to_format: str, variables: VariablesView) -> Any:
     """Attempts to find and return a value to include based on a format string.
 
     This function parses the format string expecting exactly one format placeholder
@@ -88,7 +299,7 @@ def _attempt_find_include(to_format: str, box_vars: box.Box) -> str | None:
 
     Args:
         to_format: String with format placeholders to be parsed
-        box_vars: Box object containing variables to retrieve values from
+        variables: variables to retrieve values from
 
     Raises:
         InvalidFormattedJsonError: If the format string doesn't meet the
@@ -132,7 +343,9 @@ def _attempt_find_include(to_format: str, box_vars: box.Box) -> str | None:
             "Conversion specifier '%s' will be ignored for %s", format_spec, to_format
         )
 
-    would_replace = formatter.get_field(field_name, [], box_vars)[0]
+    would_replace = VariablesView.unwrap(
+        formatter.get_field(field_name, [], variables)[0]
+    )
 
     if conversion is None:
         return would_replace
@@ -167,46 +380,68 @@ def format_keys(
     Returns:
         recursively formatted values
     """
-    format_keys_ = functools.partial(
-        format_keys,
-        dangerously_ignore_string_format_errors=dangerously_ignore_string_format_errors,
+    return _format_keys(
+        val,
+        VariablesView(variables),
+        no_double_format,
+        dangerously_ignore_string_format_errors,
     )
 
-    if not isinstance(variables, Box):
-        box_vars = Box(variables)
-    else:
-        box_vars = variables
+
+def _format_keys(
+    val: Any,
+    variables: VariablesView,
+    no_double_format: bool,
+    dangerously_ignore_string_format_errors: bool,
+) -> Any:
+    """Implementation of format_keys, once the variables have been wrapped"""
+
+    def format_inner(inner: Any) -> Any:
+        if isinstance(inner, dict_node | list_node) and inner.is_static:
+            # Nothing in here needs formatting. This is only done for nested
+            # values, so the caller always gets a new top level container
+            # which it can modify.
+            return inner
+
+        return _format_keys(
+            inner, variables, True, dangerously_ignore_string_format_errors
+        )
 
     if isinstance(val, dict):
-        return {key: format_keys_(val[key], box_vars) for key in val}
+        return {key: format_inner(val[key]) for key in val}
     elif isinstance(val, tuple):
-        return tuple(format_keys_(item, box_vars) for item in val)
+        return tuple(format_inner(item) for item in val)
     elif isinstance(val, list):
-        return [format_keys_(item, box_vars) for item in val]
+        return [format_inner(item) for item in val]
     elif isinstance(val, FormattedString):
         logger.debug("Already formatted %s, not double-formatting", val)
     elif isinstance(val, str):
+        if "{" not in val and "}" not in val:
+            # Nothing to format, and formatting it again would give the same
+            # thing, so there's no need to mark it as already formatted
+            return val
+
         formatted = val
         try:
-            formatted = _check_and_format_values(val, box_vars)
+            formatted = _check_and_format_values(val, variables)
         except exceptions.MissingFormatError:
             if not dangerously_ignore_string_format_errors:
                 raise
 
         if no_double_format:
-            formatted = FormattedString(formatted)  # type: ignore
+            formatted = FormattedString(formatted)
 
         return formatted
     elif isinstance(val, TypeConvertToken):
         logger.debug("Got type convert token '%s'", val)
         if isinstance(val, ForceIncludeToken):
-            return _attempt_find_include(val.value, box_vars)
+            return _attempt_find_include(val.value, variables)
         elif isinstance(val.constructor, tuple):
             raise exceptions.BadSchemaError(
                 f"Can not use {val.yaml_tag} for formatting as it has multiple possible constructors"
             )
         else:
-            value = format_keys_(val.value, box_vars)
+            value = format_inner(val.value)
             return val.constructor(value)
     else:
         logger.debug("Not formatting something of type '%s'", type(val))
@@ -558,6 +793,60 @@ def check_keys_match_recursive(
             raise exceptions.KeyMismatchError(f"Key mismatch: ({full_err()})") from e
 
 
-def get_tavern_box() -> box.Box:
-    """Get the 'tavern' box"""
-    return Box({"tavern": {"env_vars": dict(os.environ)}})
+class EnvironmentVariables(Mapping[str, str]):
+    """Read only view of environment variables, which are looked up when they
+    are used instead of being copied for every test
+
+    Like a Box, variables can be accessed as attributes, so this can be used
+    for formatting '{tavern.env_vars.HOME}'.
+    """
+
+    __slots__ = ("_environ",)
+
+    def __init__(self, environ: Optional[Mapping[str, str]] = None) -> None:
+        self._environ = os.environ if environ is None else environ
+
+    @classmethod
+    def snapshot(cls) -> "EnvironmentVariables":
+        """Environment variables as they are now, which won't change if the
+        environment does"""
+        return cls(dict(os.environ))
+
+    def __getitem__(self, key: str) -> str:
+        return self._environ[key]
+
+    def __getattr__(self, name: str) -> str:
+        if name.startswith("__"):
+            raise AttributeError(name)
+
+        try:
+            return self._environ[name]
+        except KeyError as e:
+            # Same as Box, so it's reported as a missing format variable
+            raise box.BoxKeyError(f"No environment variable '{name}'") from e
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._environ)
+
+    def __len__(self) -> int:
+        return len(self._environ)
+
+    def __reduce__(self):
+        # os.environ can't be pickled
+        return type(self), (dict(self._environ),)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({len(self)} variables)"
+
+
+def get_tavern_box(env_vars: Optional[EnvironmentVariables] = None) -> box.Box:
+    """Get the 'tavern' box
+
+    Args:
+        env_vars: environment variables to use. If not passed, they are looked
+            up in the environment when they are used.
+    """
+    if env_vars is None:
+        env_vars = EnvironmentVariables()
+
+    return Box({"tavern": {"env_vars": env_vars}})
@@ -1,8 +1,10 @@
+import copy
 import functools
 import importlib
 import logging
-from collections.abc import Callable, Iterable, Mapping
-from typing import Any
+import sys
+from collections.abc import Callable, Hashable, Iterable, Mapping
+from typing import Any, Optional
 
 from tavern._core import exceptions
 
@@ -83,6 +85,140 @@ def import_ext_function(entrypoint: str) -> Callable:
     return function
 
 
+def _freeze(value: Any) -> Hashable:
+    """Get a hashable version of an argument to an ext function
+
+    The type is included, so that arguments which compare equal but are
+    different types (like 1 and True) are not mixed up.
+
+    Raises:
+        TypeError: if the value can't be made hashable
+    """
+    if isinstance(value, Mapping):
+        return type(value), tuple((_freeze(k), _freeze(v)) for k, v in value.items())
+    if isinstance(value, list | tuple):
+        return type(value), tuple(_freeze(v) for v in value)
+    if isinstance(value, set | frozenset):
+        return type(value), frozenset(_freeze(v) for v in value)
+
+    hash(value)
+    return type(value), value
+
+
+def _is_immutable(value: Any) -> bool:
+    """Whether an argument to an ext function can be passed to it without being
+    copied first, because the function can't change it"""
+    if isinstance(value, tuple | frozenset):
+        return all(_is_immutable(v) for v in value)
+    return isinstance(value, str | bytes | int | float | complex | type(None))
+
+
+def _copies_arguments(args: Iterable, kwargs: Mapping) -> Callable[[], tuple]:
+    """Get a function which returns the arguments to pass to an ext function
+
+    Whether the arguments need copying is decided once here, so arguments
+    which can't be changed (like most arguments from test files, which are just
+    strings and numbers) are not copied every time the function is called.
+    """
+    if (
+        isinstance(args, list | tuple)
+        and isinstance(kwargs, Mapping)
+        and all(map(_is_immutable, args))
+        and all(map(_is_immutable, kwargs.values()))
+    ):
+        return lambda: (args, kwargs)
+
+    return lambda: (copy.deepcopy(args), copy.deepcopy(kwargs))
+
+
+def _late_lookup(entrypoint: str, func: Callable) -> Callable[[], Callable]:
+    """Get a function which looks up an imported ext function again, so that
+    replacing it on its module (eg. with monkeypatch) after it has been
+    wrapped still works"""
+    module_name, _, name = entrypoint.partition(":")
+    module = sys.modules.get(module_name)
+    if module is None:
+        return lambda: func
+    return lambda: getattr(module, name, func)
+
+
+class _ExtFunctionRegistry:
+    """Wrapped ext functions, keyed on the entrypoint and the arguments passed
+    to it, so the same $ext block used in many tests or stages is only imported
+    and wrapped once per session
+
+    The function is looked up on its module every time it is called, and it is
+    passed a copy of any arguments which it could change, so the same wrapper can be shared between
+    tests which patch the function or change its arguments.
+
+    If the arguments can't be made hashable, the function is wrapped every time.
+    """
+
+    def __init__(self, maxsize: int = 4096) -> None:
+        self._maxsize = maxsize
+        self._wrappers: dict[Hashable, Callable] = {}
+
+    @staticmethod
+    def _key(ext: Mapping, with_response: bool) -> Optional[Hashable]:
+        if not isinstance(ext, Mapping):
+            return None
+
+        try:
+            return (
+                with_response,
+                _freeze(ext.get("function")),
+                _freeze(ext.get("extra_args") or ()),
+                _freeze(ext.get("extra_kwargs") or {}),
+            )
+        except TypeError:
+            _getlogger().debug("Arguments to %s are not hashable", ext.get("function"))
+            return None
+
+    def get(self, ext: Mapping, with_response: bool) -> Callable:
+        key = self._key(ext, with_response)
+        if key is not None and (wrapped := self._wrappers.get(key)) is not None:
+            return wrapped
+
+        func, args, kwargs = _get_ext_values(ext)
+        lookup = _late_lookup(ext["function"], func)
+        arguments = _copies_arguments(args, kwargs)
+
+        if with_response:
+
+            @functools.wraps(func)
+            def inner(response):
+                current = lookup()
+                call_args, call_kwargs = arguments()
+                result = current(response, *call_args, **call_kwargs)
+                _getlogger().debug("Result of calling '%s': '%s'", current, result)
+                return result
+
+        else:
+
+            @functools.wraps(func)
+            def inner():
+                current = lookup()
+                call_args, call_kwargs = arguments()
+                result = current(*call_args, **call_kwargs)
+                _getlogger().debug("Result of calling '%s': '%s'", current, result)
+                return result
+
+        inner.func = func  # type: ignore
+
+        if key is not None:
+            if len(self._wrappers) >= self._maxsize:
+                self._wrappers.clear()
+            self._wrappers[key] = inner
+
+        return inner
+
+    def clear(self) -> None:
+        self._wrappers.clear()
+
+
+ext_function_registry = _ExtFunctionRegistry()
+
+
 def get_wrapped_response_function(ext: Mapping) -> Callable:
     """Wraps a ext function with arguments given in the test file
 
@@ -97,33 +233,13 @@ def get_wrapped_response_function(ext: Mapping) -> Callable:
         Wrapped function
     """
 
-    func, args, kwargs = _get_ext_values(ext)
-
-    @functools.wraps(func)
-    def inner(response):
-        result = func(response, *args, **kwargs)
-        _getlogger().debug("Result of calling '%s': '%s'", func, result)
-        return result
-
-    inner.func = func  # type: ignore
-
-    return inner
+    return ext_function_registry.get(ext, with_response=True)
 
 
 def get_wrapped_create_function(ext: Mapping) -> Callable:
     """Same as get_wrapped_response_function, but don't require a response"""
 
-    func, args, kwargs = _get_ext_values(ext)
-
-    @functools.wraps(func)
-    def inner():
-        result = func(*args, **kwargs)
-        _getlogger().debug("Result of calling '%s': '%s'", func, result)
-        return result
-
-    inner.func = func  # type: ignore
-
-    return inner
+    return ext_function_registry.get(ext, with_response=False)
 
 
 def _get_ext_values(ext: Mapping) -> tuple[Callable, Iterable, Mapping]:
@@ -0,0 +1,343 @@
+"""Check test files against the schema without running them through Pytest"""
+
+import concurrent.futures
+import contextlib
+import dataclasses
+import json
+import logging
+import os
+import pathlib
+import re
+import tempfile
+from collections.abc import Iterable, Iterator, Mapping
+from typing import Any, Optional
+
+import yaml
+
+import tavern
+from tavern._core.loader import FastIncludeLoader, IncludeLoader, record_loaded_files
+from tavern._core.plugins import load_plugins
+from tavern._core.pytest.collection_cache import file_digest
+from tavern._core.pytest.config import TavernInternalConfig, TestConfig
+from tavern._core.pytest.file import specs_from_documents
+from tavern._core.schema.files import verify_tests
+from tavern._core.stage_lines import start_mark
+from tavern._core.strict_util import StrictLevel
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+# Bump this if the format of the cache file changes
+_CACHE_FORMAT = 1
+
+
+@dataclasses.dataclass(frozen=True)
+class Diagnostic:
+    """A problem found in a test file
+
+    Attributes:
+        path: test file the problem is in
+        message: description of the problem
+        kind: name of the exception that was raised
+        test_name: name of the test the problem is in, if it's in one test
+        line: line in the file the problem is on (starting from 1), if known
+    """
+
+    path: str
+    message: str
+    kind: str
+    test_name: Optional[str] = None
+    line: Optional[int] = None
+
+    def format(self) -> str:
+        location = self.path if self.line is None else f"{self.path}:{self.line}"
+        test = "" if self.test_name is None else f" [{self.test_name}]"
+        return f"{location}:{test} {self.kind}: {self.message.strip()}"
+
+
+@dataclasses.dataclass
+class FileResult:
+    """Result of checking one test file
+
+    Attributes:
+        path: test file
+        digest: digest of the test file when it was checked
+        includes: every file included while loading it, with its digest
+        diagnostics: problems found in the file
+        cacheable: whether the result would be the same if it was checked
+            again without anything changing
+    """
+
+    path: str
+    digest: str
+    includes: list[tuple[str, str]]
+    diagnostics: list[Diagnostic]
+    cacheable: bool = True
+
+
+def _from_exception(
+    path: str, e: Exception, test_spec: Optional[Mapping] = None
+) -> Diagnostic:
+    line = None
+    test_name = None
+
+    if test_spec is not None:
+        test_name = test_spec.get("test_name")
+        # Specs with defaults merged in don't have a mark
+        if getattr(test_spec, "start_mark", None) is not None:
+            line = start_mark(test_spec).line + 1
+    elif isinstance(e, yaml.MarkedYAMLError) and e.problem_mark is not None:
+        line = e.problem_mark.line + 1
+
+    return Diagnostic(
+        path=path,
+        message=str(e),
+        kind=type(e).__name__,
+        test_name=test_name,
+        line=line,
+    )
+
+
+def lint_file(path: str) -> FileResult:
+    """Load a test file and check every test in it against the schema
+
+    Plugins must have been loaded before calling this.
+
+    Args:
+        path: test file to check
+
+    Returns:
+        result of checking the file
+    """
+    try:
+        digest = file_digest(path)
+    except OSError as e:
+        return FileResult(
+            path=path,
+            digest="",
+            includes=[],
+            diagnostics=[_from_exception(path, e)],
+            cacheable=False,
+        )
+
+    diagnostics: list[Diagnostic] = []
+
+    with record_loaded_files() as loaded:
+        try:
+            with open(path, encoding="utf-8") as infile:
+                documents = list(yaml.load_all(infile, Loader=FastIncludeLoader))  # type:ignore
+
+            test_specs = specs_from_documents(pathlib.Path(path), documents)
+        except Exception as e:
+            diagnostics.append(_from_exception(path, e))
+            test_specs = []
+
+    for test_spec in test_specs:
+        try:
+            verify_tests(test_spec)
+        except Exception as e:
+            diagnostics.append(_from_exception(path, e, test_spec))
+
+    cacheable = loaded.deterministic
+    try:
+        includes = [(i, file_digest(i)) for i in loaded.paths]
+    except OSError:
+        # Deleted since it was loaded, so this result shouldn't be reused
+        includes = []
+        cacheable = False
+
+    return FileResult(
+        path=path,
+        digest=digest,
+        includes=includes,
+        diagnostics=diagnostics,
+        cacheable=cacheable,
+    )
+
+
+def _init_worker(backends: dict[str, Optional[str]]) -> None:
+    """Load plugins, so the plugin schemas are used when checking tests"""
+    config = TestConfig(
+        variables={},
+        strict=StrictLevel.all_on(),
+        follow_redirects=False,
+        stages=[],
+        tavern_internal=TavernInternalConfig(
+            pytest_hook_caller=None,
+            backends=backends,
+        ),
+    )
+
+    load_plugins(config)
+
+
+class LintCache:
+    """Results of checking each test file, stored in a JSON file
+
+    Results are keyed on the path of each test file, and are only used if the
+    digest of the file and of every file it included are still the same.
+    """
+
+    def __init__(self, cache_file: str | os.PathLike, settings: Mapping) -> None:
+        self._cache_file = pathlib.Path(cache_file)
+        self._header = {
+            "format": _CACHE_FORMAT,
+            "tavern": tavern.__version__,
+            "include_path": os.environ.get(IncludeLoader.env_var_name, ""),
+            "settings": dict(settings),
+        }
+        self._entries: dict[str, Any] = {}
+
+        try:
+            with self._cache_file.open(encoding="utf-8") as infile:
+                contents = json.load(infile)
+        except FileNotFoundError:
+            logger.debug("No lint cache at %s", self._cache_file)
+            return
+        except Exception:
+            logger.warning(
+                "Unable to read lint cache from %s", self._cache_file, exc_info=True
+            )
+            return
+
+        if contents.get("header") == self._header:
+            self._entries = contents.get("entries", {})
+        else:
+            logger.debug("Lint cache was written with different settings, ignoring")
+
+    def get(self, path: str) -> Optional[FileResult]:
+        """Get the cached result for a file, if it hasn't changed"""
+        try:
+            entry = self._entries[path]
+        except KeyError:
+            return None
+
+        try:
+            current = [file_digest(path)] + [
+                file_digest(i) for i, _ in entry["includes"]
+            ]
+        except OSError:
+            logger.debug("%s or a file it includes was deleted", path)
+            return None
+
+        if current != [entry["digest"]] + [d for _, d in entry["includes"]]:
+            logger.debug("%s changed since it was last checked", path)
+            return None
+
+        return FileResult(
+            path=path,
+            digest=entry["digest"],
+            includes=[tuple(i) for i in entry["includes"]],  # type:ignore
+            diagnostics=[Diagnostic(**d) for d in entry["diagnostics"]],
+        )
+
+    def put(self, result: FileResult) -> None:
+        if not result.cacheable:
+            self._entries.pop(result.path, None)
+            return
+
+        self._entries[result.path] = {
+            "digest": result.digest,
+            "includes": result.includes,
+            "diagnostics": [dataclasses.asdict(d) for d in result.diagnostics],
+        }
+
+    def save(self) -> None:
+        tmp_path: Optional[str] = None
+
+        try:
+            # Write to a temporary file then move it, in case two processes
+            # are checking tests at the same time
+            with tempfile.NamedTemporaryFile(
+                "w",
+                dir=self._cache_file.parent,
+                suffix=".tmp",
+                delete=False,
+                encoding="utf-8",
+            ) as tmp_file:
+                tmp_path = tmp_file.name
+                json.dump({"header": self._header, "entries": self._entries}, tmp_file)
+            os.replace(tmp_path, self._cache_file)
+        except Exception:
+            logger.warning(
+                "Unable to write lint cache to %s", self._cache_file, exc_info=True
+            )
+            if tmp_path is not None:
+                with contextlib.suppress(OSError):
+                    os.remove(tmp_path)
+
+
+def find_test_files(paths: Iterable[str], file_path_regex: str) -> Iterator[str]:
+    """Get every test file in the given paths
+
+    Files which are passed explicitly are always used. Directories are searched
+    recursively for files matching the regex.
+    """
+    pattern = re.compile(file_path_regex)
+
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, files in os.walk(path):
+                dirs[:] = sorted(d for d in dirs if not d.startswith("."))
+                for filename in sorted(files):
+                    if pattern.match(filename):
+                        yield os.path.join(root, filename)
+        else:
+            yield path
+
+
+def lint_files(
+    paths: list[str],
+    backends: dict[str, Optional[str]],
+    jobs: Optional[int] = None,
+    cache: Optional[LintCache] = None,
+) -> list[FileResult]:
+    """Check test files against the schema, in parallel
+
+    Args:
+        paths: test files to check
+        backends: which plugin to use for each backend, as in the
+            tavern-*-backend options
+        jobs: number of processes to use. Defaults to the number of CPUs.
+        cache: if passed, files which have not changed since they were last
+            checked are not checked again
+
+    Returns:
+        result for each file, in the same order as the paths
+    """
+    results: dict[str, FileResult] = {}
+
+    if cache is not None:
+        for path in paths:
+            if (cached := cache.get(path)) is not None:
+                results[path] = cached
+
+    to_check = [p for p in dict.fromkeys(paths) if p not in results]
+
+    logger.debug(
+        "Checking %d files (%d unchanged)", len(to_check), len(paths) - len(to_check)
+    )
+
+    if jobs is None:
+        jobs = os.cpu_count() or 1
+    jobs = min(jobs, len(to_check))
+
+    if jobs <= 1:
+        _init_worker(backends)
+        checked: Iterable[FileResult] = map(lint_file, to_check)
+    else:
+        executor = concurrent.futures.ProcessPoolExecutor(
+            max_workers=jobs, initializer=_init_worker, initargs=(backends,)
+        )
+        chunksize = max(1, len(to_check) // (jobs * 4))
+        with executor:
+            checked = list(executor.map(lint_file, to_check, chunksize=chunksize))
+
+    for result in checked:
+        results[result.path] = result
+        if cache is not None:
+            cache.put(result)
+
+    if cache is not None:
+        cache.save()
+
+    return [results[p] for p in paths]
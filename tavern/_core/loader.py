@@ -1,5 +1,8 @@
 # https://gist.github.com/joshbode/569627ced3076931b02f
+import contextlib
+import copy
 import dataclasses
+import datetime as dt
 import logging
 import os.path
 import pathlib
@@ -7,6 +10,7 @@ import re
 import typing
 import uuid
 from abc import abstractmethod
+from collections.abc import Iterator
 from itertools import chain
 from typing import Optional
 
@@ -28,7 +32,47 @@ from tavern._core.strtobool import strtobool
 logger: logging.Logger = logging.getLogger(__name__)
 
 
+@dataclasses.dataclass
+class LoadedFiles:
+    """Files which were read while loading some YAML
+
+    Attributes:
+        paths: absolute paths of every file included, directly or not
+        deterministic: False if loading the same files again could give a
+            different result (eg, if !uuid was used)
+    """
+
+    paths: list[str] = dataclasses.field(default_factory=list)
+    deterministic: bool = True
+
+
+_load_recorders: list[LoadedFiles] = []
+
+
+@contextlib.contextmanager
+def record_loaded_files() -> Iterator[LoadedFiles]:
+    """Record which files are included while loading YAML inside this context"""
+    recorder = LoadedFiles()
+    _load_recorders.append(recorder)
+    try:
+        yield recorder
+    finally:
+        _load_recorders.remove(recorder)
+
+
+def _record_loaded_file(filename: str) -> None:
+    for recorder in _load_recorders:
+        if filename not in recorder.paths:
+            recorder.paths.append(filename)
+
+
+def _record_nondeterministic() -> None:
+    for recorder in _load_recorders:
+        recorder.deterministic = False
+
+
 def makeuuid(loader, node) -> str:
+    _record_nondeterministic()
     return str(uuid.uuid4())
 
 
@@ -56,12 +100,17 @@ class RememberComposer(Composer):
 
 def create_node_class(cls):
     class node_class(cls):
+        # Whether nothing in this node needs formatting - see is_static_value
+        is_static = False
+
         def __init__(self, x, start_mark, end_mark):
             cls.__init__(self, x)
             self.start_mark = start_mark
             self.end_mark = end_mark
 
     node_class.__name__ = f"{cls.__name__}_node"
+    # So it can be pickled using the module level name
+    node_class.__qualname__ = node_class.__name__
     return node_class
 
 
@@ -77,11 +126,18 @@ class SourceMappingConstructor(SafeConstructor):
     # copies.
     def construct_yaml_map(self, node):
         (obj,) = SafeConstructor.construct_yaml_map(self, node)
-        return dict_node(obj, node.start_mark, node.end_mark)
+        constructed = dict_node(obj, node.start_mark, node.end_mark)
+        # Children are constructed first, so only this level needs checking
+        constructed.is_static = "$ext" not in obj and all(
+            map(is_static_value, obj.values())
+        )
+        return constructed
 
     def construct_yaml_seq(self, node):
         (obj,) = SafeConstructor.construct_yaml_seq(self, node)
-        return list_node(obj, node.start_mark, node.end_mark)
+        constructed = list_node(obj, node.start_mark, node.end_mark)
+        constructed.is_static = all(map(is_static_value, obj))
+        return constructed
 
 
 SourceMappingConstructor.add_constructor(  # type: ignore
@@ -109,10 +165,7 @@ class IncludeLoader(
     between documents"""
 
     def __init__(self, stream):
-        try:
-            self._root = os.path.split(stream.name)[0]
-        except AttributeError:
-            self._root = os.path.curdir
+        self._root = _get_stream_root(stream)
 
         Reader.__init__(self, stream)
         Scanner.__init__(self)
@@ -126,6 +179,14 @@ class IncludeLoader(
     env_var_name = "TAVERN_INCLUDE"
 
 
+def _get_stream_root(stream) -> str:
+    """Directory that includes in this stream are relative to"""
+    try:
+        return os.path.split(stream.name)[0]
+    except AttributeError:
+        return os.path.curdir
+
+
 def _get_include_dirs(loader):
     loader_list = [loader._root]
 
@@ -155,15 +216,126 @@ def find_include(loader, node) -> str:
     )
 
 
+def _copy_loaded(value):
+    """Copy something that was loaded from YAML, sharing anything immutable
+
+    This is much faster than a deepcopy and keeps the start/end marks and
+    whether each node is static"""
+    if isinstance(value, dict):
+        copied = {k: _copy_loaded(v) for k, v in value.items()}
+        if isinstance(value, dict_node):
+            node = dict_node(copied, value.start_mark, value.end_mark)
+            node.is_static = value.is_static
+            return node
+        return copied
+    elif isinstance(value, list):
+        copied_list = [_copy_loaded(v) for v in value]
+        if isinstance(value, list_node):
+            list_copy = list_node(copied_list, value.start_mark, value.end_mark)
+            list_copy.is_static = value.is_static
+            return list_copy
+        return copied_list
+    elif value is None or isinstance(
+        value,
+        str | bytes | int | float | TypeSentinel | TypeConvertToken | ApproxScalar,
+    ):
+        return value
+
+    return copy.deepcopy(value)
+
+
+_FileStamp = tuple[str, int, int]
+
+
+def _stamp(filename: str) -> _FileStamp:
+    stat = os.stat(filename)
+    return filename, stat.st_mtime_ns, stat.st_size
+
+
+def _is_current(stamps: tuple[_FileStamp, ...]) -> bool:
+    """Whether none of the files have changed since they were stamped"""
+    try:
+        return all(_stamp(stamp[0]) == stamp for stamp in stamps)
+    except OSError:
+        return False
+
+
+class IncludeCache:
+    """Caches files loaded with !include for the whole session
+
+    Entries are keyed on the path of the file, and are only used if the
+    modification time and size of the file, and of every file it included, are
+    the same as when it was loaded. Each caller gets its own copy of the
+    contents so that modifying an included file in one test doesn't change it
+    in any others.
+    """
+
+    def __init__(self) -> None:
+        self._loaded: dict[
+            str, tuple[tuple[_FileStamp, ...], typing.Any, LoadedFiles]
+        ] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __call__(self, filename: str) -> typing.Any:
+        """Load a single document yaml file, or get it from the cache
+
+        Args:
+            filename: absolute path to file
+
+        Returns:
+            copy of the contents of the file
+        """
+        entry = self._loaded.get(filename)
+
+        if entry is not None and _is_current(entry[0]):
+            self.hits += 1
+            _, contents, loaded = entry
+
+            # Make sure anything collecting the included files still sees
+            # anything this file included
+            for path in loaded.paths:
+                _record_loaded_file(path)
+
+            return _copy_loaded(contents)
+
+        self.misses += 1
+
+        # Stamped before loading, so changes made while it is being loaded are
+        # picked up next time
+        stamp = _stamp(filename)
+
+        with record_loaded_files() as loaded:
+            contents = load_single_document_yaml(filename)
+
+        if not loaded.deterministic:
+            self._loaded.pop(filename, None)
+            return contents
+
+        nested = tuple(_stamp(path) for path in loaded.paths if path != filename)
+        self._loaded[filename] = ((stamp, *nested), contents, loaded)
+
+        return _copy_loaded(contents)
+
+    def clear(self) -> None:
+        self._loaded.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+load_included_yaml = IncludeCache()
+
+
 def construct_include(loader, node: yaml.ScalarNode):
     """Include file referenced at node."""
 
     filename = find_include(loader, node)
+    _record_loaded_file(filename)
     resolved_path = pathlib.Path(filename)
     extension = resolved_path.suffix.lstrip(".").lower()
 
     if extension in ("yaml", "yml", "json"):
-        return load_single_document_yaml(filename)
+        return load_included_yaml(filename)
     elif extension == "graphql":
         return resolved_path.read_text(encoding="utf-8")
 
@@ -178,6 +350,7 @@ def construct_include_raw(loader, node: yaml.ScalarNode):
     This is useful for including text files for response body validation.
     """
     filename = find_include(loader, node)
+    _record_loaded_file(filename)
     resolved_path = pathlib.Path(filename)
 
     if not resolved_path.exists():
@@ -191,6 +364,67 @@ IncludeLoader.add_constructor("!include_raw", construct_include_raw)
 IncludeLoader.add_constructor("!uuid", makeuuid)
 
 
+def _is_empty_scalar(event) -> bool:
+    """Whether libyaml generated this event for a missing value, which is what
+    the pure Python parser calls process_empty_scalar for"""
+    return (
+        isinstance(event, yaml.ScalarEvent)
+        and event.value == ""
+        and not event.style
+        and event.tag is None
+        and event.anchor is None
+    )
+
+
+if yaml.__with_libyaml__:
+    from yaml.cyaml import CParser  # type:ignore
+
+    class CIncludeLoader(  # type:ignore
+        RememberComposer,
+        CParser,
+        Resolver,
+        SourceMappingConstructor,
+        SafeConstructor,
+    ):
+        """Same as IncludeLoader, but the scanning and parsing is done by libyaml
+
+        Only the events come from libyaml - nodes are still composed in Python
+        so that anchors are remembered between documents and so that nodes have
+        the same start/end marks as with IncludeLoader.
+        """
+
+        # RememberComposer only has a stub for this
+        get_event = CParser.get_event  # type:ignore
+
+        def __init__(self, stream):
+            self._root = _get_stream_root(stream)
+
+            CParser.__init__(self, stream)
+            RememberComposer.__init__(self)
+            SafeConstructor.__init__(self)
+            Resolver.__init__(self)
+            SourceMappingConstructor.__init__(self)
+
+        def compose_scalar_node(self, anchor):
+            event = self.peek_event()
+            if _is_empty_scalar(event):
+                # Go through the same hook as the pure Python parser, so that
+                # error_on_empty_scalar also applies to this loader
+                Parser.process_empty_scalar(self, event.start_mark)  # type:ignore
+
+            return super().compose_scalar_node(anchor)
+
+    # Share constructors so anything added to IncludeLoader (including the
+    # YAMLObject subclasses below) is also available when using libyaml
+    CIncludeLoader.yaml_constructors = IncludeLoader.yaml_constructors
+    CIncludeLoader.yaml_multi_constructors = IncludeLoader.yaml_multi_constructors
+
+    FastIncludeLoader: type = CIncludeLoader
+else:
+    logger.debug("libyaml is not available, using pure Python yaml loader")
+    FastIncludeLoader = IncludeLoader
+
+
 class TypeSentinel(yaml.YAMLObject):
     """This is a sentinel for expecting a type in a response. Any value
     associated with these is going to be ignored - these are only used as a
@@ -317,6 +551,10 @@ class AnythingSentinel(TypeSentinel):
         """
         return ANYTHING
 
+    def __reduce__(self):
+        # Same as above, but when loading from the collection cache
+        return "ANYTHING"
+
 
 # One instance of this (see above)
 ANYTHING = AnythingSentinel()
@@ -450,6 +688,59 @@ class ApproxSentinel(yaml.YAMLObject, ApproxScalar):  # type:ignore
 # Apparently this isn't done automatically?
 yaml.dumper.Dumper.add_representer(ApproxScalar, ApproxSentinel.to_yaml)
 
+# Values which format_keys always returns unchanged
+_STATIC_SCALARS = (
+    str,
+    bytes,
+    int,
+    float,
+    type(None),
+    dt.date,
+    TypeSentinel,
+    ApproxScalar,
+)
+
+
+def is_static_value(value) -> bool:
+    """Whether formatting this value would always return it unchanged
+
+    Mappings and sequences loaded from a test file are marked as static when
+    they were loaded if they contain no format placeholders, no type
+    conversion tokens, and no '$ext' blocks. Formatting can then reuse them
+    instead of walking and copying them.
+    """
+    if isinstance(value, dict_node | list_node):
+        return value.is_static
+    if isinstance(value, str):
+        return "{" not in value and "}" not in value
+    return isinstance(value, _STATIC_SCALARS)
+
+
+def update_static_marks(value) -> bool:
+    """Recalculate whether loaded mappings and sequences are static, after they
+    might have been changed in place (eg, by a hook)
+
+    Args:
+        value: value to check
+
+    Returns:
+        whether the value is static
+    """
+    # Every child has to be updated, so don't stop at the first non-static one
+    if isinstance(value, dict):
+        children = [update_static_marks(v) for v in value.values()]
+        static = "$ext" not in value and all(children)
+    elif isinstance(value, list):
+        children = [update_static_marks(v) for v in value]
+        static = all(children)
+    else:
+        return is_static_value(value)
+
+    if isinstance(value, dict_node | list_node):
+        value.is_static = static
+
+    return static
+
 
 def load_single_document_yaml(filename: str | os.PathLike) -> dict:
     """
@@ -467,7 +758,7 @@ def load_single_document_yaml(filename: str | os.PathLike) -> dict:
 
     with open(filename, encoding="utf-8") as fileobj:
         try:
-            contents = yaml.load(fileobj, Loader=IncludeLoader)  # type:ignore # noqa
+            contents = yaml.load(fileobj, Loader=FastIncludeLoader)  # type:ignore # noqa
         except yaml.composer.ComposerError as e:
             msg = "Expected only one document in this file but found multiple"
             raise exceptions.UnexpectedDocumentsError(msg) from e
@@ -14,7 +14,7 @@ import stevedore
 import stevedore.extension
 
 from tavern._core import exceptions
-from tavern._core.dict_util import format_keys
+from tavern._core.dict_util import deep_dict_merge, format_keys
 from tavern._core.pytest.config import TestConfig
 from tavern.request import BaseRequest
 from tavern.response import BaseResponse
@@ -213,6 +213,75 @@ class _PluginCache:
 load_plugins = _PluginCache()
 
 
+@dataclasses.dataclass(frozen=True)
+class StageDispatch:
+    """Which plugins handle the blocks in a stage
+
+    Attributes:
+        request_plugins: plugins which have a request block in the stage. A
+            valid stage has exactly one.
+        response_plugins: plugins which have a response block in the stage
+        multiple_responses: names of the response plugins which can have a
+            list of responses
+    """
+
+    request_plugins: tuple[_Plugin, ...]
+    response_plugins: tuple[_Plugin, ...]
+    multiple_responses: frozenset[str]
+
+
+class _StageDispatchCache:
+    """Dispatch for each set of keys that a stage can have
+
+    Stages with the same keys are handled by the same plugins, so this only
+    has to look through the plugins once for each different kind of stage.
+    """
+
+    def __init__(self) -> None:
+        self._plugins: Optional[list[_Plugin]] = None
+        self._dispatch: dict[frozenset, StageDispatch] = {}
+
+    def __call__(
+        self, stage: Mapping, test_block_config: Optional[TestConfig] = None
+    ) -> StageDispatch:
+        plugins = load_plugins(test_block_config)
+        if plugins is not self._plugins:
+            # Plugins were reloaded
+            self._dispatch = {}
+            self._plugins = plugins
+
+        keys = frozenset(stage)
+
+        try:
+            return self._dispatch[keys]
+        except KeyError:
+            pass
+
+        request_plugins: dict[str, _Plugin] = {}
+        response_plugins: list[_Plugin] = []
+
+        for p in plugins:
+            if p.plugin.request_block_name in keys:
+                request_plugins.setdefault(p.plugin.request_block_name, p)
+            if p.plugin.response_block_name in keys:
+                response_plugins.append(p)
+
+        dispatch = self._dispatch[keys] = StageDispatch(
+            request_plugins=tuple(request_plugins.values()),
+            response_plugins=tuple(response_plugins),
+            multiple_responses=frozenset(
+                p.name
+                for p in response_plugins
+                if getattr(p.plugin, "has_multiple_responses", None)
+            ),
+        )
+
+        return dispatch
+
+
+get_stage_dispatch = _StageDispatchCache()
+
+
 def get_extra_sessions(test_spec: Mapping, test_block_config: TestConfig) -> dict:
     """Get extra 'sessions' for any extra test types
 
@@ -228,15 +297,22 @@ def get_extra_sessions(test_spec: Mapping, test_block_config: TestConfig) -> dic
 
     plugins: list[_Plugin] = load_plugins(test_block_config)
 
+    used: set[str] = set()
+    for stage in test_spec["stages"]:
+        dispatch = get_stage_dispatch(stage, test_block_config)
+        used.update(p.name for p in dispatch.request_plugins)
+        used.update(p.name for p in dispatch.response_plugins)
+
     for p in plugins:
-        if any(
-            (p.plugin.request_block_name in i or p.plugin.response_block_name in i)
-            for i in test_spec["stages"]
-        ):
+        if p.name in used:
             logger.debug(
                 "Initialising session for %s (%s)", p.name, p.plugin.session_type
             )
-            session_spec: dict = test_spec.get(p.name, {})
+            # Plugins can use a different name for the block in the test
+            block_name = getattr(p.plugin, "session_block_name", p.name)
+            session_spec: dict = test_spec.get(block_name, {})
+            if defaults := test_block_config.session_defaults.get(block_name):
+                session_spec = deep_dict_merge(dict(defaults), session_spec)
             formatted: dict = format_keys(session_spec, test_block_config.variables)
             sessions[p.name] = p.plugin.session_type(**formatted)
 
@@ -265,40 +341,23 @@ def get_request_type(
         exceptions.MissingKeysError: No request type specified
     """
 
-    plugins = load_plugins(test_block_config)
+    dispatch = get_stage_dispatch(stage, test_block_config)
 
-    keys = {}
-
-    for p in plugins:
-        keys[p.plugin.request_block_name] = p.plugin.request_type
-
-    if len(set(keys) & set(stage)) > 1:
-        raise exceptions.DuplicateKeysError(
-            f"Can only specify 1 request type but got {set(keys)}"
-        )
-    elif not list(set(keys) & set(stage)):
+    if len(dispatch.request_plugins) != 1:
+        keys = {p.plugin.request_block_name for p in load_plugins(test_block_config)}
+        if dispatch.request_plugins:
+            raise exceptions.DuplicateKeysError(
+                f"Can only specify 1 request type but got {keys}"
+            )
         raise exceptions.MissingKeysError(
-            f"Need to specify one of valid request types: '{set(keys.keys())}'"
+            f"Need to specify one of valid request types: '{keys}'"
         )
 
-    # We've validated that 1 and only 1 is there, so just loop until the first
-    # one is found
-    request_class: type[BaseRequest] | None = None
-    for p in plugins:
-        try:
-            request_args = stage[p.plugin.request_block_name]
-        except KeyError:
-            pass
-        else:
-            session = sessions[p.name]
-            request_class = p.plugin.request_type
-            logger.debug(
-                "Initialising request class for %s (%s)", p.name, request_class
-            )
-            break
-
-    if not request_class:
-        raise exceptions.MissingSettingsError("No request type found")
+    (p,) = dispatch.request_plugins
+    request_args = stage[p.plugin.request_block_name]
+    session = sessions[p.name]
+    request_class: type[BaseRequest] = p.plugin.request_type
+    logger.debug("Initialising request class for %s (%s)", p.name, request_class)
 
     request_maker = request_class(session, request_args, test_block_config)
 
@@ -325,11 +384,9 @@ def _foreach_response(
         mapping of plugin name to list of expected (normally length 1)
     """
 
-    plugins = load_plugins(test_block_config)
-
     retvals = {}
 
-    for p in plugins:
+    for p in get_stage_dispatch(stage, test_block_config).response_plugins:
         response_block = stage.get(p.plugin.response_block_name)
         if response_block is not None:
             retvals[p.name] = action(p, response_block)
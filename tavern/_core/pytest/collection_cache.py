@@ -0,0 +1,156 @@
+import contextlib
+import hashlib
+import logging
+import os
+import pathlib
+import pickle
+import tempfile
+from functools import lru_cache
+from typing import Any, Optional
+
+import pytest
+
+import tavern
+from tavern._core.loader import IncludeLoader, LoadedFiles
+
+from .util import get_option_generic
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+# Bump this if the format of cache entries changes
+_CACHE_FORMAT = 1
+
+
+def file_digest(path: str | os.PathLike) -> str:
+    """sha256 of the contents of a file"""
+    with open(path, "rb") as infile:
+        return hashlib.sha256(infile.read()).hexdigest()
+
+
+class CollectionCache:
+    """On-disk cache of the test specs loaded from each test file
+
+    Entries are keyed on the path and contents of the test file, and store the
+    digest of every file that was transitively included when loading it. If any
+    of those files has changed (or disappeared) then the entry is ignored and
+    the test file is loaded again.
+    """
+
+    def __init__(self, cache_dir: str | os.PathLike) -> None:
+        self._cache_dir = pathlib.Path(cache_dir)
+        self._cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def _entry_path(self, test_path: pathlib.Path) -> pathlib.Path:
+        key = hashlib.sha256()
+        for part in [
+            str(_CACHE_FORMAT),
+            tavern.__version__,
+            os.environ.get(IncludeLoader.env_var_name, ""),
+            str(test_path.resolve()),
+            file_digest(test_path),
+        ]:
+            key.update(part.encode("utf-8"))
+            key.update(b"\0")
+
+        return self._cache_dir / f"{key.hexdigest()}.pickle"
+
+    def load(self, test_path: pathlib.Path) -> Optional[list[dict]]:
+        """Get the cached test specs for this file
+
+        Args:
+            test_path: path to test file
+
+        Returns:
+            cached test specs, or None if there was no valid cache entry
+        """
+        entry_path = self._entry_path(test_path)
+
+        try:
+            with entry_path.open("rb") as entry_file:
+                entry = pickle.load(entry_file)  # noqa: S301
+        except FileNotFoundError:
+            logger.debug("No collection cache entry for %s", test_path)
+            return None
+        except Exception:
+            logger.warning(
+                "Unable to read collection cache entry for %s", test_path, exc_info=True
+            )
+            return None
+
+        for included, digest in entry["includes"]:
+            try:
+                current = file_digest(included)
+            except OSError:
+                current = None
+
+            if current != digest:
+                logger.debug(
+                    "Included file %s changed, not using collection cache for %s",
+                    included,
+                    test_path,
+                )
+                return None
+
+        logger.debug("Using collection cache entry for %s", test_path)
+
+        return entry["specs"]
+
+    def store(
+        self, test_path: pathlib.Path, specs: list[dict], loaded: LoadedFiles
+    ) -> None:
+        """Store test specs for this file
+
+        Args:
+            test_path: path to test file
+            specs: test specs loaded from file
+            loaded: files that were included when loading the specs
+        """
+        if not loaded.deterministic:
+            logger.debug(
+                "Not caching %s, loading it again might not give the same result",
+                test_path,
+            )
+            return
+
+        entry: dict[str, Any] = {
+            "includes": [(i, file_digest(i)) for i in loaded.paths],
+            "specs": specs,
+        }
+
+        entry_path = self._entry_path(test_path)
+        tmp_path: Optional[str] = None
+
+        try:
+            # Write to a temporary file then move it, so that other processes
+            # (eg, pytest-xdist workers) never see a partially written entry
+            with tempfile.NamedTemporaryFile(
+                dir=self._cache_dir, suffix=".tmp", delete=False
+            ) as tmp_file:
+                tmp_path = tmp_file.name
+                pickle.dump(entry, tmp_file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, entry_path)
+        except Exception:
+            logger.warning(
+                "Unable to write collection cache entry for %s",
+                test_path,
+                exc_info=True,
+            )
+            if tmp_path is not None:
+                with contextlib.suppress(OSError):
+                    os.remove(tmp_path)
+
+
+@lru_cache
+def get_collection_cache(pytest_config: pytest.Config) -> Optional[CollectionCache]:
+    """Get the collection cache, if one was configured"""
+    cache_dir = get_option_generic(pytest_config, "tavern-collection-cache", None)
+
+    if not cache_dir:
+        return None
+
+    if isinstance(cache_dir, list):
+        cache_dir = cache_dir[0]
+
+    logger.debug("Using collection cache in %s", cache_dir)
+
+    return CollectionCache(cache_dir)
@@ -1,11 +1,16 @@
 import copy
 import dataclasses
 import logging
+from collections import ChainMap
+from collections.abc import Iterable, Iterator, Mapping, MutableMapping, Sequence
 from importlib.util import find_spec
-from typing import Any
+from typing import TYPE_CHECKING, Any, Optional
 
 from tavern._core.strict_util import StrictLevel
 
+if TYPE_CHECKING:
+    from tavern._core.dict_util import EnvironmentVariables
+
 logger: logging.Logger = logging.getLogger(__name__)
 
 
@@ -15,6 +20,40 @@ class TavernInternalConfig:
 
     pytest_hook_caller: Any
     backends: dict
+    # Snapshot of the environment to use for the whole session, if
+    # tavern-freeze-env-vars is set
+    env_vars: Optional["EnvironmentVariables"] = None
+
+
+class IndexedStages(Sequence[Mapping]):
+    """Stages from the global configuration, which can also be looked up by id
+
+    This is created once when the global configuration is loaded and can't be
+    changed afterwards, so the index is only built once. The stages themselves
+    are shared by every test which uses them, so they must not be modified
+    either (see run._copy_stage).
+    """
+
+    def __init__(self, stages: Iterable[Mapping]) -> None:
+        self._stages = tuple(stages)
+        # If an id is repeated, the last stage with that id is used
+        self._by_id = {s["id"]: s for s in self._stages}
+
+    @property
+    def by_id(self) -> Mapping[str, Mapping]:
+        return self._by_id
+
+    def __getitem__(self, index):
+        return self._stages[index]
+
+    def __len__(self) -> int:
+        return len(self._stages)
+
+    def __iter__(self) -> Iterator[Mapping]:
+        return iter(self._stages)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({list(self._stages)!r})"
 
 
 @dataclasses.dataclass(frozen=True)
@@ -28,30 +67,44 @@ class TestConfig:
         follow_redirects: whether the test should follow redirects
         variables: variables available for use in the stage
         strict: Strictness for test/stage
-        stages: Any extra stages imported from other config files
+        stages: Any extra stages imported from other config files. For the
+            global configuration these are IndexedStages, so they can be
+            looked up by id without building an index for every test.
         test_file_path: Optional path to the test file being run (used for resolving relative paths)
         tavern_internal: Internal config that should be used only by tavern
         tinctures: Global tinctures to apply to all test stages
+        session_defaults: Default options for the session of each plugin, from
+            global config files, keyed on the name of the block in the test
+            (eg. 'http')
     """
 
-    variables: dict
+    variables: MutableMapping
     strict: StrictLevel
     follow_redirects: bool
-    stages: list
+    stages: Sequence[Mapping]
     tavern_internal: TavernInternalConfig
     tinctures: list | dict | None = None
     test_file_path: str | None = None
+    session_defaults: Mapping[str, Mapping] = dataclasses.field(default_factory=dict)
 
     def copy(self) -> "TestConfig":
         """Returns a shallow copy of self"""
         return copy.copy(self)
 
     def with_new_variables(self) -> "TestConfig":
-        """Returns a shallow copy of self but with the variables copied. This stops things being
-        copied between tests. Can't use deepcopy because the variables might contain things that
+        """Returns a shallow copy of self but with a new scope for variables. This stops things
+        being copied between tests.
+
+        Variables are looked up in the new scope first, then in the existing variables. Setting a
+        variable only changes the new scope, so nothing has to be copied and the existing variables
+        are never modified. Can't use deepcopy because the variables might contain things that
         can't be pickled and hence can't be deep copied."""
-        copied = self.copy()
-        return dataclasses.replace(copied, variables=copy.copy(self.variables))
+        if isinstance(self.variables, ChainMap):
+            scoped = self.variables.new_child()
+        else:
+            scoped = ChainMap({}, self.variables)
+
+        return dataclasses.replace(self, variables=scoped)
 
     def with_strictness(self, new_strict: StrictLevel) -> "TestConfig":
         """Create a copy of the config but with a new strictness setting"""
@@ -1,12 +1,12 @@
 import ast
 import copy
 import functools
-import itertools
 import logging
+import pathlib
 import re
 import typing
 from collections.abc import Callable, Iterable, Iterator, Mapping
-from typing import Any, Union
+from typing import Any, Optional, Union
 
 import pytest
 import yaml.parser
@@ -16,11 +16,14 @@ from pytest import Mark
 from tavern._core import exceptions
 from tavern._core.dict_util import deep_dict_merge, format_keys, get_tavern_box
 from tavern._core.extfunctions import get_wrapped_create_function, is_ext_function
-from tavern._core.loader import IncludeLoader
+from tavern._core.loader import FastIncludeLoader, record_loaded_files
 from tavern._core.schema.files import verify_tests
 
+from .collection_cache import CollectionCache, get_collection_cache
 from .item import YamlItem
-from .util import load_global_cfg
+from .lazy import LazyTestSpec, scan_test_file
+from .parametrize import ValuesFactory, combine_values, file_values
+from .util import get_option_generic, load_global_cfg
 
 logger: logging.Logger = logging.getLogger(__name__)
 
@@ -58,6 +61,17 @@ def _ast_node_to_literal(node: ast.AST) -> Any:
         raise ValueError(f"Unsupported AST node type: {type(node)}")
 
 
+@functools.lru_cache(maxsize=1024)
+def _parse_mark_args(args_str: str) -> ast.expr:
+    """Parse the arguments of a function-style mark
+
+    This is cached, because the same marks are usually used on many tests (and
+    on every parametrized version of a test).
+    """
+    # Wrap in a function call for parsing
+    return ast.parse(f"func({args_str})", mode="eval").body
+
+
 def _parse_func_mark(fmt_vars: Mapping, m: str) -> pytest.Mark:
     """Parse a function-style mark string and return a pytest Mark object.
 
@@ -84,9 +98,7 @@ def _parse_func_mark(fmt_vars: Mapping, m: str) -> pytest.Mark:
         # Format the arguments string
         formatted_args_str = _format_without_inner(args_str, fmt_vars)
 
-        # Wrap in a function call for parsing
-        tree = ast.parse(f"func({formatted_args_str})", mode="eval")
-        call = tree.body
+        call = _parse_mark_args(formatted_args_str)
 
         if isinstance(call, ast.Call):
             # Extract positional arguments as literals
@@ -276,11 +288,6 @@ def _get_parametrized_items(
 
     logger.debug("parametrize marks: %s", parametrize_marks)
 
-    # These should be in the same order as specified in the input file
-    vals = [i["parametrize"]["vals"] for i in parametrize_marks]
-
-    logger.debug("(possibly wrapped) values: %s", vals)
-
     def unwrap_map(value):
         if is_ext_function(value):
             ext = value.pop("$ext")
@@ -290,14 +297,27 @@ def _get_parametrized_items(
 
         return value
 
-    vals = list(map(unwrap_map, vals))
+    def get_values(parametrize: dict) -> ValuesFactory:
+        if "file" in parametrize:
+            return file_values(parametrize, parent.path)
 
-    try:
-        combined = itertools.product(*vals)
-    except TypeError as e:
-        raise exceptions.BadSchemaError(
-            "Invalid match between numbers of keys and number of values in parametrize mark"
-        ) from e
+        vals = unwrap_map(parametrize["vals"])
+        logger.debug("(possibly wrapped) values: %s", vals)
+
+        try:
+            iter(vals)
+        except TypeError as e:
+            raise exceptions.BadSchemaError(
+                "Invalid match between numbers of keys and number of values in parametrize mark"
+            ) from e
+
+        return lambda: vals
+
+    # These should be in the same order as specified in the input file
+    factories = [get_values(i["parametrize"]) for i in parametrize_marks]
+    modes = [i["parametrize"].get("mode", "product") for i in parametrize_marks]
+
+    combined = combine_values(factories, modes)
 
     keys: list[str] = [i["parametrize"]["key"] for i in parametrize_marks]
 
@@ -313,29 +333,110 @@ def _get_parametrized_items(
             keys, vals_combination
         )
 
+        # Only copy the top level of the test, everything else (eg, stages) is
+        # shared with the other parametrized tests until it is run
+        spec_new = copy.copy(test_spec)
+
         # Change the name
-        spec_new = copy.deepcopy(test_spec)
         spec_new["test_name"] = test_spec["test_name"] + f"[{inner_formatted}]"
 
         logger.debug("New test name: %s", spec_new["test_name"])
 
         # Make this new thing available for formatting
-        spec_new.setdefault("includes", []).append(
+        spec_new["includes"] = [
+            *test_spec.get("includes", []),
             {
                 "name": f"parametrized[{inner_formatted}]",
                 "description": "autogenerated by Tavern",
                 "variables": variables,
-            }
-        )
+            },
+        ]
         # And create the new item
         item_new = YamlItem.yamlitem_from_parent(
-            spec_new["test_name"], parent, spec_new, parent.path
+            spec_new["test_name"], parent, spec_new, parent.path, shared_spec=True
         )
         item_new.add_markers(pytest_marks)
 
         yield item_new
 
 
+def specs_from_documents(path: pathlib.Path, all_tests: list) -> list:
+    """Get the tests from the documents in a test file, merging in any defaults
+
+    Args:
+        path: test file the documents were loaded from
+        all_tests: documents in the file
+
+    Returns:
+        test specs from the file
+
+    Raises:
+        BadSchemaError: documents in the file are not laid out properly
+    """
+    defaults_doc = None
+    test_specs = []
+
+    for document_idx, test_spec in enumerate(all_tests):
+        if not test_spec:
+            logger.warning("Empty document in input file '%s'", path)
+            continue
+
+        # Check for explicit defaults marker and validate position. Lazily
+        # loaded tests never have this.
+        is_defaults: bool = isinstance(test_spec, dict) and test_spec.pop(
+            "is_defaults", False
+        )
+
+        if is_defaults and document_idx > 0:
+            raise exceptions.BadSchemaError(
+                f"'is_defaults' can only be used in the first YAML document, "
+                f"but found it in document {document_idx + 1} of '{path}'"
+            )
+
+        # Determine if this document is a test or defaults
+        is_test_doc = "test_name" in test_spec and "stages" in test_spec
+
+        if document_idx == 0 and is_defaults:
+            if is_test_doc:
+                raise exceptions.BadSchemaError(
+                    f"First document in '{path}' is marked as defaults but also contains a 'test_name' and 'stages'"
+                )
+
+            # First document is explicitly marked as defaults
+            logger.info(
+                "Using first document as defaults for %s",
+                path,
+            )
+            defaults_doc = test_spec
+            continue
+        elif not is_test_doc:
+            # Document is neither a valid test nor valid defaults
+            if document_idx == 0:
+                raise exceptions.BadSchemaError(
+                    f"First document in '{path}' is missing 'test_name' or 'stages'. "
+                    f"If this is meant to be defaults for the file, add 'is_defaults: true'. "
+                    f"If this is meant to be a test, add both 'test_name' and 'stages'."
+                )
+            else:
+                raise exceptions.BadSchemaError(
+                    f"Document {document_idx + 1} in '{path}' is missing 'test_name' or 'stages'"
+                )
+
+        # Merge defaults into test spec if defaults were defined
+        if defaults_doc:
+            if isinstance(test_spec, LazyTestSpec):
+                test_spec.defaults = defaults_doc
+                if "marks" not in test_spec and "marks" in defaults_doc:
+                    # Marks might need formatting
+                    test_spec = test_spec.load()
+            else:
+                test_spec = deep_dict_merge(defaults_doc, test_spec)
+
+        test_specs.append(test_spec)
+
+    return test_specs
+
+
 class YamlFile(pytest.File):
     """Custom `File` class that loads each test block as a different test"""
 
@@ -376,7 +477,7 @@ class YamlFile(pytest.File):
             tavern_box = Box(default_box=True)
         else:
             # Needed if something in a config file uses tavern.env_vars
-            tavern_box = get_tavern_box()
+            tavern_box = get_tavern_box(global_cfg.tavern_internal.env_vars)
 
         try:
             fmt_vars = _format_without_inner(fmt_vars, tavern_box)
@@ -388,7 +489,9 @@ class YamlFile(pytest.File):
         tavern_box.merge_update(**fmt_vars)
         return tavern_box
 
-    def _generate_items(self, test_spec: dict) -> Iterator[YamlItem]:
+    def _generate_items(
+        self, test_spec: Union[dict, LazyTestSpec]
+    ) -> Iterator[YamlItem]:
         """Modify or generate tests based on test spec
 
         If there are any 'parametrize' marks, this will generate extra tests
@@ -400,6 +503,18 @@ class YamlFile(pytest.File):
         Yields:
             Tavern YAML test
         """
+        if isinstance(test_spec, LazyTestSpec):
+            # Only has simple marks which don't need formatting
+            item = YamlItem.yamlitem_from_parent(
+                test_spec.test_name, self, test_spec, self.path
+            )
+            pytest_marks, _ = _format_test_marks(
+                test_spec.marks, {}, test_spec.test_name
+            )
+            item.add_markers(pytest_marks)
+            yield item
+            return
+
         item = YamlItem.yamlitem_from_parent(
             test_spec["test_name"], self, test_spec, self.path
         )
@@ -431,80 +546,93 @@ class YamlFile(pytest.File):
 
         yield item
 
-    def collect(self) -> Iterator[YamlItem]:
-        """Load each document in the given input file into a different test
+    @property
+    def _collection_cache(self) -> Optional[CollectionCache]:
+        return get_collection_cache(self.config)
 
-        Yields:
-            Pytest 'test objects'
-        """
+    @property
+    def _lazy_load(self) -> bool:
+        return get_option_generic(self.config, "tavern-lazy-load", False)
+
+    def _load_documents(self, lazy: bool) -> list:
+        """Load every document in the file
 
+        Args:
+            lazy: if True, tests which can be loaded lazily are returned as
+                LazyTestSpec objects
+
+        Returns:
+            documents from the file
+        """
         try:
+            if lazy:
+                if (documents := scan_test_file(self.path)) is not None:
+                    return documents
+
             # Convert to a list so we can catch parser exceptions
-            all_tests: Iterable[dict] = list(
+            return list(
                 yaml.load_all(
                     self.path.open(encoding="utf-8"),
-                    Loader=IncludeLoader,  # type:ignore
+                    Loader=FastIncludeLoader,  # type:ignore
                 )
             )
         except yaml.parser.ParserError as e:
             raise exceptions.BadSchemaError from e
 
-        defaults_doc = None
+    def _load_test_specs(self, lazy: bool = False) -> list:
+        """Load all the tests in the file, merging in any defaults
 
-        for document_idx, test_spec in enumerate(all_tests):
-            if not test_spec:
-                logger.warning("Empty document in input file '%s'", self.path)
-                continue
+        Args:
+            lazy: whether to only load tests far enough to collect them
 
-            # Check for explicit defaults marker and validate position
-            is_defaults: bool = test_spec.pop("is_defaults", False)
+        Returns:
+            test specs from the file
+        """
+        return specs_from_documents(self.path, self._load_documents(lazy))
 
-            if is_defaults and document_idx > 0:
-                raise exceptions.BadSchemaError(
-                    f"'is_defaults' can only be used in the first YAML document, "
-                    f"but found it in document {document_idx + 1} of '{self.path}'"
-                )
+    def _load_test_specs_cached(self) -> list:
+        """Load test specs, using the collection cache if it's enabled
 
-            # Determine if this document is a test or defaults
-            is_test_doc = "test_name" in test_spec and "stages" in test_spec
+        If the collection cache is enabled, tests are never loaded lazily.
+        """
+        cache = self._collection_cache
 
-            if document_idx == 0 and is_defaults:
-                if is_test_doc:
-                    raise exceptions.BadSchemaError(
-                        f"First document in '{self.path}' is marked as defaults but also contains a 'test_name' and 'stages'"
-                    )
+        if cache is None:
+            return self._load_test_specs(lazy=self._lazy_load)
 
-                # First document is explicitly marked as defaults
-                logger.info(
-                    "Using first document as defaults for %s",
-                    self.path,
-                )
-                defaults_doc = test_spec
-                continue
-            elif not is_test_doc:
-                # Document is neither a valid test nor valid defaults
-                if document_idx == 0:
-                    raise exceptions.BadSchemaError(
-                        f"First document in '{self.path}' is missing 'test_name' or 'stages'. "
-                        f"If this is meant to be defaults for the file, add 'is_defaults: true'. "
-                        f"If this is meant to be a test, add both 'test_name' and 'stages'."
-                    )
-                else:
-                    raise exceptions.BadSchemaError(
-                        f"Document {document_idx + 1} in '{self.path}' is missing 'test_name' or 'stages'"
-                    )
+        test_specs = cache.load(self.path)
+        if test_specs is None:
+            with record_loaded_files() as loaded:
+                test_specs = self._load_test_specs()
+            cache.store(self.path, test_specs, loaded)
 
-            # Merge defaults into test spec if defaults were defined
-            if defaults_doc:
-                test_spec = deep_dict_merge(defaults_doc, test_spec)
+        return test_specs
+
+    def collect(self) -> Iterator[YamlItem]:
+        """Load each document in the given input file into a different test
+
+        Yields:
+            Pytest 'test objects'
+        """
 
+        # Changes if the file is changed, without reading the whole file again
+        stat = self.path.stat()
+        version = (stat.st_mtime_ns, stat.st_size)
+
+        for spec_idx, test_spec in enumerate(self._load_test_specs_cached()):
             try:
                 for i in self._generate_items(test_spec):
+                    # Parametrized tests from the same document only need to
+                    # be verified once
+                    i.verify_cache_key = (str(self.path), spec_idx, version)
                     i.initialise_fixture_attrs()
                     yield i
             except (TypeError, KeyError) as e:
                 # If there was one of these errors, we can probably figure out
                 # if the error is from a bad test layout by calling verify_tests
+                if isinstance(test_spec, LazyTestSpec):
+                    test_spec = test_spec.load()
+
                 try:
                     verify_tests(test_spec, with_plugins=False)
                 except Exception as e2:
@@ -18,6 +18,8 @@ from tavern._core import exceptions
 
 from .util import add_ini_options, add_parser_options, get_option_generic
 
+logger: logging.Logger = logging.getLogger(__name__)
+
 if pytest.version_tuple >= (9, 0, 0):
 
     def pytest_collect_file(parent, file_path: pathlib.Path) -> Optional["YamlFile"]:  # type:ignore
@@ -102,6 +104,17 @@ def _pytest_collect_file(parent, file_path: pathlib.Path) -> Optional["YamlFile"
     return None
 
 
+def pytest_sessionfinish(session: pytest.Session) -> None:
+    """Log how effective the include cache was over the session"""
+    from tavern._core.loader import load_included_yaml
+
+    logger.debug(
+        "Include cache: %d hits, %d misses",
+        load_included_yaml.hits,
+        load_included_yaml.misses,
+    )
+
+
 def pytest_addhooks(pluginmanager) -> None:
     """Add our custom tavern hooks"""
     from . import newhooks
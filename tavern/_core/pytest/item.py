@@ -1,7 +1,9 @@
+import copy
 import dataclasses
 import logging
 import pathlib
-from collections.abc import Callable, Iterable, MutableMapping
+from collections.abc import Callable, Hashable, Iterable, MutableMapping
+from typing import Optional
 
 import pytest
 import yaml
@@ -18,7 +20,7 @@ from _pytest.scope import Scope
 from pytest import Mark, MarkDecorator
 
 from tavern._core import exceptions
-from tavern._core.loader import error_on_empty_scalar
+from tavern._core.loader import error_on_empty_scalar, update_static_marks
 from tavern._core.plugins import load_plugins
 from tavern._core.pytest import call_hook
 from tavern._core.pytest.error import ReprdError
@@ -28,7 +30,8 @@ from tavern._core.schema.files import verify_tests
 from tavern._core.stage_lines import start_mark
 
 from .config import TestConfig
-from .util import load_global_cfg
+from .lazy import LazyTestSpec
+from .util import load_global_cfg, use_compiled_schema_validator
 
 logger: logging.Logger = logging.getLogger(__name__)
 
@@ -79,6 +82,8 @@ class YamlItem(pytest.Item):
         path: filename that this test came from
         spec: The whole dictionary of the test
         global_cfg: configuration for test
+        verify_cache_key: identifies the document in the source file that this
+            test came from, so it only needs to be verified once
     """
 
     # See https://github.com/taverntesting/tavern/issues/825
@@ -86,15 +91,33 @@ class YamlItem(pytest.Item):
 
     global_cfg: TestConfig
 
+    verify_cache_key: Optional[Hashable] = None
+
     def __init__(
-        self, *, name: str, parent, spec: MutableMapping, path: pathlib.Path, **kwargs
+        self,
+        *,
+        name: str,
+        parent,
+        spec: MutableMapping | LazyTestSpec,
+        path: pathlib.Path,
+        shared_spec: bool = False,
+        **kwargs,
     ) -> None:
         if "grpc" in spec:
             logger.warning("Tavern grpc support is in an experimental stage")
 
         super().__init__(name, parent, **kwargs)
         self.path = path
-        self.spec = spec
+
+        # If True, parts of the spec are shared with other tests and need to be
+        # copied before being modified
+        self._shared_spec = shared_spec
+
+        self._lazy_spec: LazyTestSpec | None = None
+        if isinstance(spec, LazyTestSpec):
+            self._lazy_spec = spec
+        else:
+            self.spec = spec
 
         if not YamlItem._patched_yaml:
             yaml.parser.Parser.process_empty_scalar = (  # type:ignore
@@ -103,9 +126,40 @@ class YamlItem(pytest.Item):
 
             YamlItem._patched_yaml = True
 
+    @property
+    def spec(self) -> MutableMapping:
+        """The whole test, which is loaded the first time it is used if the
+        test was collected lazily"""
+        if self._lazy_spec is not None:
+            self._spec = self._lazy_spec.load()
+            self._lazy_spec = None
+
+        return self._spec
+
+    @spec.setter
+    def spec(self, spec: MutableMapping) -> None:
+        self._lazy_spec = None
+        self._spec = spec
+
     @classmethod
-    def yamlitem_from_parent(cls, name, parent: Node, spec, path: pathlib.Path):
-        return cls.from_parent(parent, name=name, spec=spec, path=path)
+    def yamlitem_from_parent(
+        cls, name, parent: Node, spec, path: pathlib.Path, shared_spec: bool = False
+    ):
+        return cls.from_parent(
+            parent, name=name, spec=spec, path=path, shared_spec=shared_spec
+        )
+
+    def _has_test_run_hooks(self) -> bool:
+        """Whether any hooks which are passed the test spec are implemented"""
+        hook_caller = self.global_cfg.tavern_internal.pytest_hook_caller
+
+        return any(
+            getattr(hook_caller, hookname).get_hookimpls()
+            for hookname in (
+                "pytest_tavern_beta_before_every_test_run",
+                "pytest_tavern_beta_after_every_test_run",
+            )
+        )
 
     def initialise_fixture_attrs(self) -> None:
         # Prevent pytest from inspecting this item to try and find arguments,
@@ -131,7 +185,8 @@ class YamlItem(pytest.Item):
     def location(self):
         """get location in file"""
         location = super().location
-        location = (location[0], start_mark(self.spec).line, location[2])
+        spec = self._lazy_spec if self._lazy_spec is not None else self.spec
+        location = (location[0], start_mark(spec).line, location[2])
         return location
 
     #     Hack to stop issue with pytest-rerunfailures
@@ -143,14 +198,20 @@ class YamlItem(pytest.Item):
 
     @property
     def obj(self):
-        stages = []
-        for i, stage in enumerate(self.spec["stages"]):
-            name = "<unknown>"
-            if "name" in stage:
-                name = stage["name"]
-            elif "id" in stage:
-                name = stage["id"]
-            stages.append(f"{i + 1:d}: {name:s}")
+        if self._lazy_spec is not None:
+            # Don't load the whole test just to get the stage names
+            stage_names = self._lazy_spec.stage_names
+        else:
+            stage_names = []
+            for stage in self.spec["stages"]:
+                name = "<unknown>"
+                if "name" in stage:
+                    name = stage["name"]
+                elif "id" in stage:
+                    name = stage["id"]
+                stage_names.append(name)
+
+        stages = [f"{i + 1:d}: {name:s}" for i, name in enumerate(stage_names)]
 
         # This needs to be a function or skipif breaks
         def fakefun():
@@ -244,6 +305,11 @@ class YamlItem(pytest.Item):
         # INTERNAL
         xfail = self.spec.get("_xfail", False)
 
+        if self._shared_spec and self._has_test_run_hooks():
+            # Hooks are allowed to modify the test in place
+            self.spec = copy.deepcopy(self.spec)
+            self._shared_spec = False
+
         try:
             fixture_values = self._load_fixture_values()
             self.global_cfg.variables.update(fixture_values)
@@ -255,9 +321,22 @@ class YamlItem(pytest.Item):
                 variables=self.global_cfg.variables,
             )
 
-            verify_tests(self.spec)
+            if self._has_test_run_hooks():
+                # Hooks might have added something which needs formatting
+                # to a part of the test which didn't need it before
+                update_static_marks(self.spec)
 
-            for stage in self.spec["stages"]:
+            # Hooks might have changed the test, so it has to be verified again
+            verify_tests(
+                self.spec,
+                cache_key=None if self._has_test_run_hooks() else self.verify_cache_key,
+                compiled=use_compiled_schema_validator(self.config),
+            )
+
+            # Stages might be shared with other tests, so replace them with a
+            # copy instead of modifying them
+            stages = copy.copy(self.spec["stages"])
+            for idx, stage in enumerate(stages):
                 if not stage.get("name"):
                     if not stage.get("id"):
                         # Should never actually reach here, should be caught at schema check time
@@ -265,7 +344,9 @@ class YamlItem(pytest.Item):
                             "One of name or ID must be specified"
                         )
 
-                    stage["name"] = stage["id"]
+                    stages[idx] = copy.copy(stage)
+                    stages[idx]["name"] = stage["id"]
+            self.spec["stages"] = stages
 
             run_test(self.path, self.spec, self.global_cfg)
 
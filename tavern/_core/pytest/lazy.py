@@ -0,0 +1,211 @@
+import dataclasses
+import io
+import logging
+import pathlib
+import re
+from typing import Any, Optional
+
+import yaml
+from yaml.events import AliasEvent
+from yaml.nodes import MappingNode, Node, ScalarNode, SequenceNode
+
+from tavern._core.dict_util import deep_dict_merge
+from tavern._core.loader import FastIncludeLoader
+from tavern._core.stage_lines import YamlMark
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+# Characters other than '\n' that pyyaml treats as a line break. If a file
+# contains any of these then line numbers don't match up with the lines in the
+# file, so it can't be loaded lazily.
+_OTHER_LINE_BREAKS = re.compile("\r(?!\n)|[\x85\u2028\u2029]")
+
+# Marks that can be added to a test without needing any format variables
+_SIMPLE_MARK = re.compile(r"^\w+$")
+
+
+class _ScanningLoader(FastIncludeLoader):  # type:ignore
+    """Loader which tracks whether a document used any anchors that were
+    defined in a previous document"""
+
+    def __init__(self, stream) -> None:
+        super().__init__(stream)
+
+        self._document_anchors: set[str] = set()
+        self.uses_earlier_anchors = False
+
+    def compose_document(self) -> Optional[Node]:
+        self._document_anchors = set()
+        self.uses_earlier_anchors = False
+
+        return super().compose_document()
+
+    def compose_node(self, parent, index) -> Optional[Node]:
+        event = self.peek_event()
+
+        if isinstance(event, AliasEvent):
+            if event.anchor not in self._document_anchors:
+                self.uses_earlier_anchors = True
+        elif event.anchor is not None:
+            self._document_anchors.add(event.anchor)
+
+        return super().compose_node(parent, index)
+
+
+@dataclasses.dataclass
+class LazyTestSpec:
+    """A test which has only been loaded far enough to collect it
+
+    The whole test is only loaded when `load` is called, by reading the
+    document from the test file again.
+
+    Attributes:
+        path: test file the test is in
+        test_name: name of the test
+        marks: names of marks on the test. These never need formatting.
+        stage_names: name (or id) of each stage
+        keys: top level keys in the test
+        start_mark: where the test starts in the file
+        byte_range: start and end of the document in the file, in bytes
+        defaults: defaults from the first document in the file, if any
+    """
+
+    path: pathlib.Path
+    test_name: str
+    marks: list[str]
+    stage_names: list[str]
+    keys: frozenset[str]
+    start_mark: YamlMark
+    byte_range: tuple[int, int]
+    defaults: Optional[dict] = None
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.keys
+
+    def load(self) -> dict:
+        """Load the whole test from the file
+
+        Returns:
+            test spec, the same as if it had been loaded at collection time
+        """
+        start, end = self.byte_range
+
+        with self.path.open("rb") as infile:
+            infile.seek(start)
+            content = infile.read(end - start).decode("utf-8")
+
+        # Pad it out so that line numbers are the same as in the actual file
+        stream = io.StringIO("\n" * self.start_mark.line + content)
+        stream.name = str(self.path)  # type:ignore
+
+        test_spec = yaml.load(stream, Loader=FastIncludeLoader)  # type:ignore # noqa
+
+        if self.defaults:
+            test_spec = deep_dict_merge(self.defaults, test_spec)
+
+        return test_spec
+
+
+def scan_test_file(path: pathlib.Path) -> Optional[list[Any]]:
+    """Load the documents in a test file, only partially loading tests where
+    possible
+
+    Tests are only partially loaded if all the information needed to collect
+    them can be read without loading the rest of the test. Anything else (eg,
+    tests with parametrize marks, or which refer to anchors in previous
+    documents) is loaded as normal.
+
+    Args:
+        path: path to test file
+
+    Returns:
+        each document in the file, either loaded or as a LazyTestSpec. If the
+            file can't be loaded lazily at all, returns None.
+    """
+    raw = path.read_bytes()
+    text = raw.decode("utf-8")
+
+    if _OTHER_LINE_BREAKS.search(text):
+        logger.debug("Unusual line breaks in %s, not loading lazily", path)
+        return None
+
+    line_offsets = [0]
+    line_offsets.extend(m.end() for m in re.finditer(b"\n", raw))
+    line_offsets.append(len(raw))
+
+    stream = io.StringIO(text)
+    stream.name = str(path)  # type:ignore
+
+    loader = _ScanningLoader(stream)
+    documents = []
+
+    try:
+        while loader.check_node():
+            node = loader.get_node()
+            documents.append(_scan_document(loader, path, node, line_offsets))
+    finally:
+        loader.dispose()
+
+    return documents
+
+
+def _scan_document(
+    loader: _ScanningLoader, path: pathlib.Path, node: Node, line_offsets: list[int]
+) -> Any:
+    """Get a LazyTestSpec for the document, or load the whole document if that
+    isn't possible"""
+    if not isinstance(node, MappingNode) or loader.uses_earlier_anchors:
+        return loader.construct_document(node)
+
+    values: dict[str, Node] = {
+        key.value: value for key, value in node.value if isinstance(key, ScalarNode)
+    }
+
+    if (
+        len(values) != len(node.value)
+        or "<<" in values
+        or "is_defaults" in values
+        or "test_name" not in values
+        or not isinstance(values.get("stages"), SequenceNode)
+    ):
+        return loader.construct_document(node)
+
+    test_name = loader.construct_document(values["test_name"])
+    marks = loader.construct_document(values["marks"]) if "marks" in values else []
+
+    if not isinstance(test_name, str) or not (
+        isinstance(marks, list)
+        and all(isinstance(m, str) and _SIMPLE_MARK.match(m) for m in marks)
+    ):
+        return loader.construct_document(node)
+
+    first_line = node.start_mark.line
+    last_line = node.end_mark.line + (1 if node.end_mark.column else 0)
+
+    return LazyTestSpec(
+        path=path,
+        test_name=test_name,
+        marks=marks,
+        stage_names=[_stage_name(s) for s in values["stages"].value],
+        keys=frozenset(values),
+        start_mark=YamlMark(line=first_line, name=node.start_mark.name),
+        byte_range=(
+            line_offsets[first_line],
+            line_offsets[min(last_line, len(line_offsets) - 1)],
+        ),
+    )
+
+
+def _stage_name(stage: Node) -> str:
+    if isinstance(stage, MappingNode):
+        stage_keys = {
+            key.value: value.value
+            for key, value in stage.value
+            if isinstance(key, ScalarNode) and isinstance(value, ScalarNode)
+        }
+
+        for key in ("name", "id"):
+            if key in stage_keys:
+                return stage_keys[key]
+
+    return "<unknown>"
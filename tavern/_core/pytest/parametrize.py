@@ -0,0 +1,180 @@
+import csv
+import functools
+import itertools
+import json
+import logging
+import pathlib
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from typing import Any, Union
+
+from tavern._core import exceptions
+from tavern._core.files import _find_file_in_include_path
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+# Returns a new iterator over the values for one parametrize mark each time it
+# is called, so that values can be read again instead of being kept in memory
+ValuesFactory = Callable[[], Iterable]
+
+_FORMATS_BY_SUFFIX = {
+    ".csv": "csv",
+    ".json": "json",
+    ".jsonl": "jsonl",
+    ".ndjson": "jsonl",
+}
+
+
+def _read_csv(filename: str) -> Iterator[dict[str, str]]:
+    with open(filename, encoding="utf-8", newline="") as csvfile:
+        yield from csv.DictReader(csvfile)
+
+
+def _read_jsonl(filename: str) -> Iterator[Any]:
+    with open(filename, encoding="utf-8") as jsonlfile:
+        for line_number, line in enumerate(jsonlfile, start=1):
+            if not line.strip():
+                continue
+
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError as e:
+                raise exceptions.BadSchemaError(
+                    f"Invalid JSON on line {line_number} of parametrize file '{filename}'"
+                ) from e
+
+
+def _read_json(filename: str) -> Iterator[Any]:
+    with open(filename, encoding="utf-8") as jsonfile:
+        try:
+            contents = json.load(jsonfile)
+        except json.JSONDecodeError as e:
+            raise exceptions.BadSchemaError(
+                f"Invalid JSON in parametrize file '{filename}'"
+            ) from e
+
+    if not isinstance(contents, list):
+        raise exceptions.BadSchemaError(
+            f"Parametrize file '{filename}' should contain a JSON array, but it contained a {type(contents)}"
+        )
+
+    yield from contents
+
+
+_READERS: dict[str, Callable[[str], Iterator[Any]]] = {
+    "csv": _read_csv,
+    "json": _read_json,
+    "jsonl": _read_jsonl,
+}
+
+
+def _row_to_value(row: Any, key: Union[str, list[str]], filename: str) -> Any:
+    """Get the value(s) for the given key(s) from one row of a file
+
+    Rows which are mappings (every row in a CSV file, or objects in a JSON file)
+    have the values taken from them by name. Anything else is used as-is, in
+    the same way as values in 'vals'.
+    """
+    if not isinstance(row, Mapping):
+        return row
+
+    try:
+        if isinstance(key, str):
+            return row[key]
+        else:
+            return [row[k] for k in key]
+    except KeyError as e:
+        raise exceptions.BadSchemaError(
+            f"Parametrize key {e} was not found in row of '{filename}': {row}"
+        ) from e
+
+
+def file_values(parametrize: Mapping, test_path: pathlib.Path) -> ValuesFactory:
+    """Get values for a parametrize mark which reads them from a file
+
+    Args:
+        parametrize: arguments to parametrize mark
+        test_path: path to test file, for finding the file
+
+    Returns:
+        function which reads the values from the file each time it is called
+    """
+    filename = _find_file_in_include_path(parametrize["file"], str(test_path))
+
+    file_format = parametrize.get("format")
+    if file_format is None:
+        file_format = _FORMATS_BY_SUFFIX.get(pathlib.Path(filename).suffix.lower())
+
+    try:
+        reader = _READERS[file_format]  # type:ignore
+    except KeyError as e:
+        raise exceptions.BadSchemaError(
+            f"Unable to read parametrize values from '{filename}' - 'format' should be one of {sorted(_READERS)}"
+        ) from e
+
+    key = parametrize["key"]
+
+    def read_values() -> Iterator[Any]:
+        logger.debug("Reading parametrize values from %s", filename)
+
+        for row in reader(filename):
+            yield _row_to_value(row, key, filename)
+
+    return read_values
+
+
+def _zip_values(factories: list[ValuesFactory]) -> Iterator[tuple]:
+    try:
+        yield from zip(*(factory() for factory in factories), strict=True)
+    except ValueError as e:
+        raise exceptions.BadSchemaError(
+            "parametrize marks using 'mode: zip' must all have the same number of values"
+        ) from e
+
+
+def _product(factories: list[Callable[[], Iterator[tuple]]]) -> Iterator[tuple]:
+    """Get the product of the values from each factory
+
+    Only the values of the first factory are read lazily. The others are each
+    read once and kept in memory, rather than being read again for every value
+    before them.
+    """
+    if not factories:
+        yield ()
+        return
+
+    first, *rest = factories
+    inner: list[list[tuple]] | None = None
+
+    for values in first():
+        if inner is None:
+            inner = [list(factory()) for factory in rest]
+
+        for other_values in itertools.product(*inner):
+            yield values + tuple(itertools.chain.from_iterable(other_values))
+
+
+def combine_values(factories: list[ValuesFactory], modes: list[str]) -> Iterator[tuple]:
+    """Get every combination of values for a list of parametrize marks
+
+    By default this is the product of the values for every mark, but a mark
+    with 'mode: zip' has its values paired up with the values of the mark
+    before it instead. Values for the first mark (and any marks zipped with
+    it) are read lazily, and values for the other marks are read once and kept
+    in memory.
+
+    Args:
+        factories: functions returning the values for each mark
+        modes: 'mode' of each mark
+
+    Yields:
+        one value for each parametrize mark, in the same order as the marks
+    """
+    groups: list[list[ValuesFactory]] = []
+
+    for factory, mode in zip(factories, modes):
+        if mode == "zip" and groups:
+            groups[-1].append(factory)
+        else:
+            groups.append([factory])
+
+    yield from _product([functools.partial(_zip_values, group) for group in groups])
@@ -6,9 +6,17 @@ from typing import Any, Optional, TypeVar, Union
 import pytest
 
 from tavern._core import exceptions
-from tavern._core.dict_util import format_keys, get_tavern_box
+from tavern._core.dict_util import (
+    EnvironmentVariables,
+    format_keys,
+    get_tavern_box,
+)
 from tavern._core.general import load_global_config
-from tavern._core.pytest.config import TavernInternalConfig, TestConfig
+from tavern._core.pytest.config import (
+    IndexedStages,
+    TavernInternalConfig,
+    TestConfig,
+)
 from tavern._core.strict_util import StrictLevel
 
 logger: logging.Logger = logging.getLogger(__name__)
@@ -84,6 +92,31 @@ def add_parser_options(parser_addoption, with_defaults: bool = True) -> None:
         type=str,
         action="store",
     )
+    parser_addoption(
+        "--tavern-collection-cache",
+        help="Directory to cache loaded test files in, to speed up collection",
+        default=None,
+        action="store",
+    )
+    parser_addoption(
+        "--tavern-lazy-load",
+        help="Only fully load each test when it is run, to speed up collection",
+        default=False,
+        action="store_true",
+    )
+    parser_addoption(
+        "--tavern-freeze-env-vars",
+        help="Read environment variables for tavern.env_vars once at the start of the session",
+        default=False,
+        action="store_true",
+    )
+    parser_addoption(
+        "--tavern-schema-validator",
+        help="Which validator to check tests against the schema with",
+        choices=["jsonschema", "compiled"],
+        default=None,
+        action="store",
+    )
 
 
 def add_ini_options(parser: pytest.Parser) -> None:
@@ -153,12 +186,40 @@ def add_ini_options(parser: pytest.Parser) -> None:
         type="args",
         default=[],
     )
+    parser.addini(
+        "tavern-collection-cache",
+        help="Directory to cache loaded test files in, to speed up collection",
+        default=None,
+    )
+    parser.addini(
+        "tavern-lazy-load",
+        help="Only fully load each test when it is run, to speed up collection",
+        type="bool",
+        default=False,
+    )
+    parser.addini(
+        "tavern-freeze-env-vars",
+        help="Read environment variables for tavern.env_vars once at the start of the session",
+        type="bool",
+        default=False,
+    )
+    parser.addini(
+        "tavern-schema-validator",
+        help="Which validator to check tests against the schema with",
+        default="jsonschema",
+    )
 
 
 def load_global_cfg(pytest_config: pytest.Config) -> TestConfig:
     return _load_global_cfg(pytest_config).with_new_variables()
 
 
+# Keys in global config files which are not session options for a plugin
+_GLOBAL_CFG_KEYS = frozenset(
+    {"name", "description", "variables", "stages", "tinctures", "includes"}
+)
+
+
 @lru_cache
 def _load_global_cfg(pytest_config: pytest.Config) -> TestConfig:
     """Load globally included config files from cmdline/cfg file arguments
@@ -172,6 +233,8 @@ def _load_global_cfg(pytest_config: pytest.Config) -> TestConfig:
     Raises:
         exceptions.UnexpectedKeysError: Invalid settings in one or more config
             files detected
+        exceptions.BadSchemaError: Invalid session options in one or more
+            config files
     """
 
     # Load ini first
@@ -182,13 +245,17 @@ def _load_global_cfg(pytest_config: pytest.Config) -> TestConfig:
     all_paths = ini_global_cfg_paths + cmdline_global_cfg_paths
     global_cfg_dict = load_global_config(all_paths)
 
+    env_vars: Optional[EnvironmentVariables] = None
+    if get_option_generic(pytest_config, "tavern-freeze-env-vars", False):
+        env_vars = EnvironmentVariables.snapshot()
+
     variables: dict = {}
     try:
         loaded_variables = global_cfg_dict["variables"]
     except KeyError:
         logger.debug("Nothing to format in global config files")
     else:
-        tavern_box = get_tavern_box()
+        tavern_box = get_tavern_box(env_vars)
         variables = format_keys(loaded_variables, tavern_box)
 
     global_cfg = TestConfig(
@@ -198,11 +265,26 @@ def _load_global_cfg(pytest_config: pytest.Config) -> TestConfig:
         tavern_internal=TavernInternalConfig(
             pytest_hook_caller=pytest_config.hook,
             backends=_load_global_backends(pytest_config),
+            env_vars=env_vars,
         ),
-        stages=global_cfg_dict.get("stages", []),
+        stages=IndexedStages(global_cfg_dict.get("stages", [])),
         tinctures=global_cfg_dict.get("tinctures"),
+        session_defaults={
+            k: v
+            for k, v in global_cfg_dict.items()
+            if k not in _GLOBAL_CFG_KEYS and isinstance(v, dict)
+        },
     )
 
+    if global_cfg.session_defaults:
+        # Imported here because the plugins import this module
+        from tavern._core.plugins import load_plugins
+        from tavern._core.schema.files import verify_session_defaults
+
+        # Checked here, instead of failing in the middle of the first test
+        load_plugins(global_cfg)
+        verify_session_defaults(global_cfg.session_defaults)
+
     return global_cfg
 
 
@@ -254,6 +336,20 @@ def _load_global_follow_redirects(pytest_config: pytest.Config) -> bool:
     return get_option_generic(pytest_config, "tavern-always-follow-redirects", False)
 
 
+def use_compiled_schema_validator(pytest_config: pytest.Config) -> bool:
+    """Whether tests should be checked with the compiled schema validator"""
+    validator = get_option_generic(
+        pytest_config, "tavern-schema-validator", "jsonschema"
+    )
+
+    if validator not in ("jsonschema", "compiled"):
+        raise exceptions.BadSchemaError(
+            f"tavern-schema-validator should be one of 'jsonschema' or 'compiled', not '{validator}'"
+        )
+
+    return validator == "compiled"
+
+
 T = TypeVar("T", bound=Optional[Union[str, list, list[Path], list[str], bool]])
 
 
@@ -3,9 +3,9 @@ import dataclasses
 import functools
 import logging
 import pathlib
-from collections.abc import Mapping, MutableMapping
+from collections import ChainMap
+from collections.abc import Mapping, MutableMapping, Sequence
 from contextlib import ExitStack
-from copy import deepcopy
 from typing import Any
 
 import box
@@ -16,14 +16,14 @@ from tavern._core.plugins import (
     get_expected,
     get_extra_sessions,
     get_request_type,
+    get_stage_dispatch,
     get_verifiers,
-    load_plugins,
 )
 from tavern._core.strict_util import StrictLevel
 
 from .dict_util import format_keys, get_tavern_box
 from .pytest import call_hook
-from .pytest.config import TestConfig
+from .pytest.config import IndexedStages, TestConfig
 from .report import attach_stage_content, wrap_step
 from .skip import eval_skip
 from .strtobool import strtobool
@@ -57,9 +57,10 @@ def _resolve_test_stages(
             if "id" in stage:
                 ref_id = stage["id"]
                 if ref_id in available_stages:
-                    # Make sure nothing downstream can change the globally
-                    # defined stage. Just give the test a local copy.
-                    stage = deepcopy(available_stages[ref_id])
+                    # Shared with every other test which uses it. It is
+                    # copied before it is run (see _copy_stage), so nothing
+                    # downstream can change the globally defined stage.
+                    stage = available_stages[ref_id]
                     logger.debug("found stage reference: %s", ref_id)
                 else:
                     logger.error("Bad stage: unknown stage referenced: %s", ref_id)
@@ -74,12 +75,24 @@ def _resolve_test_stages(
     return test_stages
 
 
+def _stages_by_id(stages: Sequence[Mapping]) -> Mapping[str, Mapping]:
+    """Stages from the global configuration, by id
+
+    The index for the global configuration is built when it is loaded, so this
+    only has to build one for configs created some other way.
+    """
+    if isinstance(stages, IndexedStages):
+        return stages.by_id
+
+    return {s["id"]: s for s in stages}
+
+
 def _get_included_stages(
     tavern_box: box.Box,
     test_block_config: TestConfig,
     test_spec: Mapping,
-    available_stages: list[dict],
-) -> list[dict]:
+    available_stages: Mapping[str, Mapping],
+) -> dict[str, Mapping]:
     """
     Get any stages which were included via config files which will be available
     for use in this test
@@ -88,47 +101,64 @@ def _get_included_stages(
         tavern_box: Available parameters for formatting at this point
         test_block_config: Current test config dictionary
         test_spec: Specification for current test
-        available_stages: List of stages which already exist
+        available_stages: Stages which already exist, by id
 
     Returns:
-        Fully resolved stages
+        Fully resolved stages, by id
     """
 
-    def stage_ids(s):
-        return [i["id"] for i in s]
+    included_stages: dict[str, Mapping] = {}
 
     if test_spec.get("includes"):
         # Need to do this separately here so there is no confusion between global and included stages
         for included in test_spec["includes"]:
             for stage in included.get("stages", {}):
-                if stage["id"] in stage_ids(available_stages):
+                if stage["id"] in available_stages:
                     raise exceptions.DuplicateStageDefinitionError(
                         "Stage id '{}' defined in stage-included test which was already defined in global configuration".format(
                             stage["id"]
                         )
                     )
 
-        included_stages = []  # type: ignore
-
         for included in test_spec["includes"]:
             if "variables" in included:
                 formatted_include = format_keys(included["variables"], tavern_box)
                 test_block_config.variables.update(formatted_include)
 
             for stage in included.get("stages", []):
-                if stage["id"] in stage_ids(included_stages):
+                if stage["id"] in included_stages:
                     raise exceptions.DuplicateStageDefinitionError(
                         "Stage with specified id already defined: {}".format(
                             stage["id"]
                         )
                     )
-                included_stages.append(stage)
-    else:
-        included_stages = []
+                included_stages[stage["id"]] = stage
 
     return included_stages
 
 
+def _copy_stage(stage: dict) -> dict:
+    """Copy the parts of a stage which can be changed while it is being run
+
+    Plugins add and remove keys at the top level of request and response
+    blocks (eg, setting a default 'method' or popping 'follow_redirects').
+
+    Anything below that is shared with every other test using the same stage,
+    so plugins must not change it in place. This includes the result of
+    format_keys, which returns any part without format variables in it as it
+    is instead of copying it - copy a block before changing it.
+    """
+    copied = copy.copy(stage)
+
+    for key, value in stage.items():
+        if isinstance(value, dict):
+            copied[key] = copy.copy(value)
+        elif isinstance(value, list):
+            copied[key] = [copy.copy(v) if isinstance(v, dict) else v for v in value]
+
+    return copied
+
+
 def run_test(
     in_file: pathlib.Path,
     test_spec: MutableMapping,
@@ -162,18 +192,19 @@ def run_test(
         test_block_config, test_file_path=str(in_file)
     )
 
-    tavern_box = get_tavern_box()
+    tavern_box = get_tavern_box(global_cfg.tavern_internal.env_vars)
 
     if not test_spec:
         logger.warning("Empty test block in %s", in_file)
         return
 
     # Get included stages and resolve any into the test spec dictionary
-    available_stages = test_block_config.stages
+    available_stages = _stages_by_id(test_block_config.stages)
     included_stages = _get_included_stages(
         tavern_box, test_block_config, test_spec, available_stages
     )
-    all_stages = {s["id"]: s for s in available_stages + included_stages}
+    # Only the first mapping in a ChainMap is ever changed, so the index isn't
+    all_stages = ChainMap(included_stages, available_stages)  # type: ignore[arg-type]
     test_spec["stages"] = _resolve_test_stages(test_spec["stages"], all_stages)
     finally_stages = _resolve_test_stages(test_spec.get("finally", []), all_stages)
 
@@ -288,15 +319,14 @@ def _calculate_stage_strictness(
         logger.debug("Setting stage level strict setting: %s", new_option)
         return new_option
 
-    # Load plugins to get response block names and multiple response support
-    plugins = load_plugins(test_block_config)
+    dispatch = get_stage_dispatch(stage, test_block_config)
 
-    for p in plugins:
+    for p in dispatch.response_plugins:
         response_block_name = p.plugin.response_block_name
         response_block = stage.get(response_block_name)
 
         if response_block is not None:
-            if getattr(p.plugin, "has_multiple_responses", None) and isinstance(
+            if p.name in dispatch.multiple_responses and isinstance(
                 response_block, list
             ):
                 strict_values = [
@@ -380,7 +410,7 @@ class _TestRunner:
             stage_config: available variables for test
             tinctures: tinctures for this stage/test
         """
-        stage = copy.deepcopy(stage)
+        stage = _copy_stage(stage)
         name = stage["name"]
 
         attach_stage_content(stage)
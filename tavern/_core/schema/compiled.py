@@ -0,0 +1,320 @@
+"""Compiles a jsonschema into Python code which checks whether an instance is
+valid against it.
+
+Only a subset of Draft 7 is compiled - enough to cover the schemas used by
+Tavern and its plugins. Any part of a schema which uses other keywords is
+checked by the normal jsonschema validator instead.
+
+The generated code only says whether an instance is valid or not. If it isn't,
+the normal validator should be used to find out why, so that error messages
+are the same whichever validator is being used.
+"""
+
+import itertools
+import logging
+import re
+from collections.abc import Callable, Mapping
+from typing import Any
+
+from jsonschema import Draft7Validator
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+# Keywords which only describe the schema and have no effect on validation.
+# 'format' is also here because Tavern does not use a format checker.
+_ANNOTATIONS = frozenset(
+    {
+        "$comment",
+        "$id",
+        "$schema",
+        "default",
+        "definitions",
+        "description",
+        "examples",
+        "format",
+        "title",
+    }
+)
+
+_SUPPORTED = _ANNOTATIONS | {
+    "$ref",
+    "additionalProperties",
+    "allOf",
+    "anyOf",
+    "enum",
+    "items",
+    "maxItems",
+    "maximum",
+    "minItems",
+    "minimum",
+    "oneOf",
+    "pattern",
+    "properties",
+    "required",
+    "type",
+}
+
+# Types where a cheap isinstance check covers the common case before having to
+# call the type checker, which also knows about Tavern's tokens and sentinels
+_FAST_TYPE_CHECKS = {
+    "array": "isinstance(x, list)",
+    "object": "isinstance(x, dict) or _is_type(x, 'object')",
+    "string": "isinstance(x, str) or _is_type(x, 'string')",
+}
+
+_IDENTIFIER = re.compile(r"[^0-9a-zA-Z_]")
+
+
+class _SchemaCompiler:
+    """Generates the source code for a function for each (sub)schema"""
+
+    def __init__(self, validator: Draft7Validator) -> None:
+        self._validator = validator
+        self._root = validator.schema
+
+        self._lines: list[str] = []
+        self._namespace: dict[str, Any] = {"_is_type": validator.is_type}
+
+        # Subschemas which have been compiled and the name of the function for
+        # each one, keyed on id. The subschema is kept so the id isn't reused.
+        self._functions: dict[int, tuple[Any, str]] = {}
+        # Function names for each '$ref', so recursive schemas work
+        self._refs: dict[str, str] = {}
+        self._counter = itertools.count()
+
+    def _new_name(self, hint: str) -> str:
+        return f"_v{next(self._counter)}_{_IDENTIFIER.sub('_', hint)[-30:]}"
+
+    def _constant(self, value: Any) -> str:
+        """Add a constant to the namespace of the generated code"""
+        name = f"_c{len(self._namespace)}"
+        self._namespace[name] = value
+        return name
+
+    def compile(self) -> Callable[[Any], bool]:
+        root = self.function_for(self._root, "root")
+
+        source = "\n".join(self._lines)
+        code = compile(source, "<tavern compiled schema>", "exec")
+        exec(code, self._namespace)  # noqa: S102
+
+        logger.debug("Compiled schema into %d functions", len(self._functions))
+
+        return self._namespace[root]
+
+    def function_for(self, schema: Any, hint: str) -> str:
+        """Get the name of a function which checks the given schema, generating
+        it if needed"""
+        try:
+            return self._functions[id(schema)][1]
+        except KeyError:
+            pass
+
+        name = self._new_name(hint)
+        self._functions[id(schema)] = (schema, name)
+
+        body = self._body(schema, hint)
+        self._lines.append(f"def {name}(x):")
+        self._lines.extend(f"    {line}" for line in body)
+        self._lines.append("")
+
+        return name
+
+    def _delegate(self, schema: Any) -> list[str]:
+        """Check this schema with jsonschema instead"""
+        is_valid = self._validator.evolve(schema=schema).is_valid
+        return [f"return {self._constant(is_valid)}(x)"]
+
+    def _ref(self, ref: str) -> list[str]:
+        if not ref.startswith("#"):
+            logger.debug("Not compiling reference to external schema %s", ref)
+            return self._delegate({"$ref": ref})
+
+        try:
+            name = self._refs[ref]
+        except KeyError:
+            target: Any = self._root
+            for part in ref[1:].split("/")[1:]:
+                part = part.replace("~1", "/").replace("~0", "~")
+                if isinstance(target, list):
+                    target = target[int(part)]
+                else:
+                    target = target[part]
+
+            name = self.function_for(target, ref.rsplit("/", 1)[-1])
+            self._refs[ref] = name
+
+        return [f"return {name}(x)"]
+
+    def _body(self, schema: Any, hint: str) -> list[str]:
+        if schema is True or schema == {}:
+            return ["return True"]
+        if schema is False:
+            return ["return False"]
+        if not isinstance(schema, Mapping):
+            return self._delegate(schema)
+
+        # Draft 7 ignores anything next to a '$ref'
+        if "$ref" in schema:
+            return self._ref(schema["$ref"])
+
+        if not set(schema).issubset(_SUPPORTED) or not self._can_compile(schema):
+            logger.debug("Not compiling schema with keys %s", sorted(schema))
+            return self._delegate(schema)
+
+        lines: list[str] = []
+
+        if "type" in schema:
+            types = schema["type"]
+            if isinstance(types, str):
+                types = [types]
+
+            checks = " or ".join(self._type_check(t) for t in types)
+            lines += [f"if not ({checks}):", "    return False"]
+
+        for keyword in ("allOf", "anyOf", "oneOf"):
+            if keyword not in schema:
+                continue
+
+            branches = [
+                self.function_for(s, f"{hint}_{keyword}{i}")
+                for i, s in enumerate(schema[keyword])
+            ]
+            # Tavern's 'oneOf' allows matching multiple branches, so it's the
+            # same as 'anyOf'
+            combine = " and " if keyword == "allOf" else " or "
+            calls = combine.join(f"{b}(x)" for b in branches)
+            lines += [f"if not ({calls}):", "    return False"]
+
+        if "enum" in schema:
+            lines += [
+                f"if x not in {self._constant(tuple(schema['enum']))}:",
+                "    return False",
+            ]
+
+        lines += self._object_checks(schema, hint)
+        lines += self._array_checks(schema, hint)
+
+        if "minimum" in schema or "maximum" in schema:
+            lines.append("if _is_type(x, 'number'):")
+            if "minimum" in schema:
+                lines += [f"    if x < {schema['minimum']!r}:", "        return False"]
+            if "maximum" in schema:
+                lines += [f"    if x > {schema['maximum']!r}:", "        return False"]
+
+        if "pattern" in schema:
+            pattern = self._constant(re.compile(schema["pattern"]))
+            lines += [
+                "if _is_type(x, 'string'):",
+                f"    if not {pattern}.search(x):",
+                "        return False",
+            ]
+
+        lines.append("return True")
+
+        return lines
+
+    @staticmethod
+    def _can_compile(schema: Mapping) -> bool:
+        """Whether the values for all keywords are ones which can be compiled"""
+        enum = schema.get("enum", [])
+        if not all(isinstance(v, str) for v in enum):
+            # jsonschema compares these differently, eg. True is not equal to 1
+            return False
+
+        for keyword in ("minimum", "maximum"):
+            if not isinstance(schema.get(keyword, 0), int | float):
+                return False
+
+        return isinstance(schema.get("items", {}), Mapping | bool) and isinstance(
+            schema.get("additionalProperties", {}), Mapping | bool
+        )
+
+    @staticmethod
+    def _type_check(t: str) -> str:
+        return _FAST_TYPE_CHECKS.get(t, f"_is_type(x, {t!r})")
+
+    def _object_checks(self, schema: Mapping, hint: str) -> list[str]:
+        properties = schema.get("properties", {})
+        required = schema.get("required", [])
+        additional = schema.get("additionalProperties", True)
+
+        if not (properties or required or additional is not True):
+            return []
+
+        lines = [f"if {_FAST_TYPE_CHECKS['object']}:"]
+
+        for key in required:
+            lines += [f"    if {key!r} not in x:", "        return False"]
+
+        for key, subschema in properties.items():
+            func = self.function_for(subschema, f"{hint}_{key}")
+            lines += [
+                f"    if {key!r} in x and not {func}(x[{key!r}]):",
+                "        return False",
+            ]
+
+        if additional is False:
+            known = self._constant(frozenset(properties))
+            lines += [
+                "    for k in x:",
+                f"        if k not in {known}:",
+                "            return False",
+            ]
+        elif additional is not True:
+            known = self._constant(frozenset(properties))
+            func = self.function_for(additional, f"{hint}_additional")
+            lines += [
+                "    for k in x:",
+                f"        if k not in {known} and not {func}(x[k]):",
+                "            return False",
+            ]
+
+        return lines
+
+    def _array_checks(self, schema: Mapping, hint: str) -> list[str]:
+        checks = []
+
+        if "minItems" in schema:
+            checks += [f"if len(x) < {schema['minItems']!r}:", "    return False"]
+        if "maxItems" in schema:
+            checks += [f"if len(x) > {schema['maxItems']!r}:", "    return False"]
+        if "items" in schema:
+            func = self.function_for(schema["items"], f"{hint}_items")
+            checks += [
+                "for item in x:",
+                f"    if not {func}(item):",
+                "        return False",
+            ]
+
+        if not checks:
+            return []
+
+        return ["if isinstance(x, list):"] + [f"    {c}" for c in checks]
+
+
+def compile_validator(validator: Draft7Validator) -> Callable[[Any], bool]:
+    """Compile the schema of a validator into a function which checks whether
+    an instance is valid
+
+    Args:
+        validator: validator to compile. Its type checker is used in the
+            generated code, and anything that can't be compiled is checked
+            with it instead.
+
+    Returns:
+        function which returns True if the instance is valid. If this returns
+            False, the validator should be used to get the actual errors.
+    """
+    is_valid = _SchemaCompiler(validator).compile()
+
+    def check(instance: Any) -> bool:
+        try:
+            return is_valid(instance)
+        except Exception:
+            # Something like 'properties' on a sentinel which is allowed as
+            # an object. Let the normal validator deal with it.
+            logger.debug("Error in compiled validator", exc_info=True)
+            return False
+
+    return check
@@ -187,6 +187,13 @@ def verify_oneof_id_name(value: Mapping, rule_obj, path) -> bool:
 
 def check_parametrize_marks(value, rule_obj, path) -> bool:
     key_or_keys = value["key"]
+
+    if "file" in value:
+        # Values are read from the file when generating tests
+        if not isinstance(key_or_keys, str | list):
+            raise BadSchemaError("'key' must be a string or a list")
+        return True
+
     vals = value["vals"]
 
     # At this point we can assume vals is a list - check anyway
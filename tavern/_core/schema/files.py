@@ -3,7 +3,8 @@ import copy
 import logging
 import os
 import tempfile
-from collections.abc import Mapping
+from collections.abc import Hashable, Mapping
+from typing import Optional
 
 import box
 import pykwalify
@@ -139,22 +140,77 @@ def wrapfile(to_wrap):
             os.remove(wrapped_tmp.name)
 
 
-def verify_tests(test_spec: Mapping, with_plugins: bool = True) -> None:
-    """Verify that a specific test block is correct
+# Cache keys of tests which have already been verified
+_verified_tests: set[Hashable] = set()
+
 
-    Todo:
-        Load schema file once. Requires some caching of the file
+def verify_tests(
+    test_spec: Mapping,
+    with_plugins: bool = True,
+    cache_key: Optional[Hashable] = None,
+    compiled: bool = False,
+) -> None:
+    """Verify that a specific test block is correct
 
     Args:
         test_spec: Test in dictionary form
         with_plugins: Whether to load plugin schema into this schema as well
+        cache_key: If passed, identifies where the test came from. If a test
+            with the same key has already been verified successfully, it is
+            not verified again.
+        compiled: Whether to use the compiled version of the schema
 
     Raises:
         BadSchemaError: Schema did not match
     """
+    if cache_key is not None:
+        cache_key = (cache_key, with_plugins)
+        if cache_key in _verified_tests:
+            logger.debug("Test from %s was already verified", cache_key)
+            return
+
     here = os.path.dirname(os.path.abspath(__file__))
 
     schema_filename = os.path.join(here, "tests.jsonschema.yaml")
     schema = load_schema_file(schema_filename, with_plugins)
 
-    verify_jsonschema(test_spec, schema)
+    verify_jsonschema(test_spec, schema, compiled=compiled)
+
+    if cache_key is not None:
+        _verified_tests.add(cache_key)
+
+
+def verify_session_defaults(session_defaults: Mapping[str, Mapping]) -> None:
+    """Verify the session options from global config files (eg. an 'http'
+    block) against the schema for the same block in a test
+
+    Plugins must already have been loaded.
+
+    Args:
+        session_defaults: session options for each plugin, keyed on the name
+            of the block
+
+    Raises:
+        BadSchemaError: Schema did not match
+    """
+    here = os.path.dirname(os.path.abspath(__file__))
+
+    schema_filename = os.path.join(here, "tests.jsonschema.yaml")
+    schema = load_schema_file(schema_filename, True)
+
+    # Only the blocks which are also allowed in a test are checked
+    properties = {
+        k: schema["properties"][k]
+        for k in session_defaults
+        if k in schema["properties"]
+    }
+    if not properties:
+        return
+
+    session_schema = {
+        "type": "object",
+        "properties": properties,
+        "definitions": schema.get("definitions", {}),
+    }
+
+    verify_jsonschema(session_defaults, session_schema)
@@ -1,13 +1,13 @@
 import logging
 import re
-from collections.abc import Mapping
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from typing import Any
 
 import jsonschema
 from jsonschema import Draft7Validator, ValidationError
 from jsonschema.validators import extend
 
 from tavern._core import exceptions
-from tavern._core.dict_util import recurse_access_key
 from tavern._core.exceptions import BadSchemaError
 from tavern._core.loader import (
     AnythingSentinel,
@@ -19,6 +19,7 @@ from tavern._core.loader import (
     TypeSentinel,
 )
 from tavern._core.pytest.config import has_module
+from tavern._core.schema.compiled import compile_validator
 from tavern._core.schema.extensions import (
     check_parametrize_marks,
     check_strict_key,
@@ -108,18 +109,162 @@ CustomValidator = extend(
 )
 
 
-def verify_jsonschema(to_verify: Mapping, schema: Mapping) -> None:
+# Validators for each schema that has been used, keyed on the id of the schema
+_validators: dict[int, tuple[Mapping, Draft7Validator]] = {}
+
+
+def _get_validator(schema: Mapping) -> Draft7Validator:
+    """Get a validator for the schema, reusing it if it was created before"""
+    try:
+        cached_schema, validator = _validators[id(schema)]
+    except KeyError:
+        pass
+    else:
+        # Make sure it's not a different schema which happens to have the same id
+        if cached_schema is schema:
+            return validator
+
+    validator = CustomValidator(schema)
+    _validators[id(schema)] = (schema, validator)
+
+    return validator
+
+
+# Compiled versions of each schema, keyed on the id of the schema
+_compiled_validators: dict[int, tuple[Mapping, Callable[[Any], bool]]] = {}
+
+
+def _get_compiled_validator(schema: Mapping) -> Callable[[Any], bool]:
+    """Get a compiled validator for the schema, compiling it the first time"""
+    try:
+        cached_schema, is_valid = _compiled_validators[id(schema)]
+    except KeyError:
+        pass
+    else:
+        if cached_schema is schema:
+            return is_valid
+
+    is_valid = compile_validator(_get_validator(schema))
+    _compiled_validators[id(schema)] = (schema, is_valid)
+
+    return is_valid
+
+
+# Checks which can't be done with jsonschema, keyed on a JMES query for the
+# values to check. These are only ever run against the values, not queried
+# with jmespath.
+_EXTRA_CHECKS: dict[str, Callable] = {
+    "stages[*].mqtt_publish.json[]": validate_request_json,
+    "stages[*].mqtt_response.payload[]": validate_request_json,
+    "stages[*].request.json[]": validate_request_json,
+    "stages[*].request.data[]": validate_request_json,
+    "stages[*].request.params[]": validate_request_json,
+    "stages[*].request.headers[]": validate_request_json,
+    "stages[*].grpc_response.status[]": validate_grpc_status_is_valid_or_list_of_names,
+    "stages[*].request.method[]": validate_http_method,
+    "stages[*].request.save[]": validate_json_with_ext,
+    "stages[*].request.files[]": validate_file_spec,
+    "stages[*].graphql_request.files[]": validate_file_spec,
+    "marks[*].parametrize[]": check_parametrize_marks,
+    "stages[*].response.strict[]": validate_json_with_ext,
+    "stages[*].max_retries[]": retry_variable,
+    "strict": check_strict_key,
+}
+
+# Query for each value in a list, eg 'stages[*].request.json[]'
+_LIST_QUERY = re.compile(r"^(\w+)\[\*\]\.(\w+(?:\.\w+)*)\[\]$")
+# Query for a single value, eg 'strict'
+_VALUE_QUERY = re.compile(r"^\w+(?:\.\w+)*$")
+
+
+def _compile_extra_checks(
+    queries: Iterable[str],
+) -> tuple[dict[str, list[tuple[tuple[str, ...], str]]], list[tuple[str, ...]]]:
+    """Split the queries for the extra checks into keys to look up
+
+    Returns:
+        keys to look up in each item of a list for each check, keyed on the
+            name of the list, and keys to look up for checks on single values.
+            Each one is paired with its original query.
+    """
+    list_checks: dict[str, list[tuple[tuple[str, ...], str]]] = {}
+    value_checks: list[tuple[str, ...]] = []
+
+    for query in queries:
+        if match := _LIST_QUERY.match(query):
+            list_key, keys = match.groups()
+            list_checks.setdefault(list_key, []).append((tuple(keys.split(".")), query))
+        elif _VALUE_QUERY.match(query):
+            value_checks.append((query, *query.split(".")))
+        else:
+            raise ValueError(f"Unsupported query for extra check: {query}")
+
+    return list_checks, value_checks
+
+
+_LIST_CHECKS, _VALUE_CHECKS = _compile_extra_checks(_EXTRA_CHECKS)
+
+
+def _get_keys(data: Any, keys: Iterable[str]) -> Any:
+    """Look up keys in nested mappings in the same way as jmespath, returning
+    None if any of them are missing"""
+    for key in keys:
+        try:
+            data = data.get(key)
+        except AttributeError:
+            return None
+
+    return data
+
+
+def iter_extra_check_values(to_verify: Mapping) -> Iterator[tuple[str, Any]]:
+    """Get every value in a test which needs an extra check
+
+    This gives the same values as running each query with recurse_access_key,
+    but goes through each list (eg, the stages) once for all of the checks.
+
+    Args:
+        to_verify: Test in dictionary form
+
+    Yields:
+        the query for the check that should be run, and the value to check
+    """
+    for list_key, checks in _LIST_CHECKS.items():
+        items = to_verify.get(list_key)
+        if not isinstance(items, list):
+            continue
+
+        for item in items:
+            for keys, query in checks:
+                value = _get_keys(item, keys)
+                if isinstance(value, list):
+                    for element in value:
+                        yield query, element
+                elif value is not None:
+                    yield query, value
+
+    for query, *value_keys in _VALUE_CHECKS:
+        if value := _get_keys(to_verify, value_keys):
+            yield query, value
+
+
+def verify_jsonschema(
+    to_verify: Mapping, schema: Mapping, compiled: bool = False
+) -> None:
     """Verify a generic file against a given jsonschema
 
     Args:
         to_verify: Test in dictionary form
         schema: Schema to verify against
+        compiled: Check the test with a version of the schema compiled into
+            Python code first. If that fails, the test is checked again with
+            jsonschema to get the errors.
 
     Raises:
         BadSchemaError: Schema did not match
     """
 
-    validator = CustomValidator(schema)
+    validator = _get_validator(schema)
 
     if "grpc" in to_verify and not has_module("grpc"):
         raise exceptions.BadSchemaError(
@@ -131,7 +276,8 @@ def verify_jsonschema(to_verify: Mapping, schema: Mapping) -> None:
         )
 
     try:
-        validator.validate(to_verify)
+        if not (compiled and _get_compiled_validator(schema)(to_verify)):
+            validator.validate(to_verify)
     except jsonschema.ValidationError as e:
         real_context = []
 
@@ -183,32 +329,5 @@ def verify_jsonschema(to_verify: Mapping, schema: Mapping) -> None:
         msg = "\n---\n" + "\n---\n".join([str(i) for i in real_context])
         raise BadSchemaError(msg) from None
 
-    extra_checks = {
-        "stages[*].mqtt_publish.json[]": validate_request_json,
-        "stages[*].mqtt_response.payload[]": validate_request_json,
-        "stages[*].request.json[]": validate_request_json,
-        "stages[*].request.data[]": validate_request_json,
-        "stages[*].request.params[]": validate_request_json,
-        "stages[*].request.headers[]": validate_request_json,
-        "stages[*].grpc_response.status[]": validate_grpc_status_is_valid_or_list_of_names,
-        "stages[*].request.method[]": validate_http_method,
-        "stages[*].request.save[]": validate_json_with_ext,
-        "stages[*].request.files[]": validate_file_spec,
-        "stages[*].graphql_request.files[]": validate_file_spec,
-        "marks[*].parametrize[]": check_parametrize_marks,
-        "stages[*].response.strict[]": validate_json_with_ext,
-        "stages[*].max_retries[]": retry_variable,
-        "strict": check_strict_key,
-    }
-
-    for path, func in extra_checks.items():
-        data = recurse_access_key(to_verify, path)
-        if data:
-            if path.endswith("[]"):
-                if not isinstance(data, list):
-                    raise BadSchemaError
-
-                for element in data:
-                    func(element, None, path)
-            else:
-                func(data, None, path)
+    for path, element in iter_extra_check_values(to_verify):
+        _EXTRA_CHECKS[path](element, None, path)
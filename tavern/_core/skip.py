@@ -1,9 +1,21 @@
+import ast
+import dataclasses
+import functools
 import logging
+import math
+from collections import ChainMap
+from collections.abc import Mapping, MutableMapping
+from typing import Any, Optional
 
 import simpleeval
 
 from tavern._core import exceptions
-from tavern._core.dict_util import format_keys
+from tavern._core.dict_util import (
+    FormatField,
+    VariablesView,
+    compile_format_string,
+    format_keys,
+)
 from tavern._core.pytest.config import TestConfig
 
 logger: logging.Logger = logging.getLogger(__name__)
@@ -11,10 +23,150 @@ logger: logging.Logger = logging.getLogger(__name__)
 functions = simpleeval.DEFAULT_FUNCTIONS.copy()
 functions["len"] = len
 
+# Characters which would change the meaning of a value formatted into a quoted
+# string, so it can't be bound as a name instead
+_UNSAFE_IN_STRING = frozenset("\\'\"\n\r")
+
+_parse = functools.lru_cache(maxsize=1024)(simpleeval.SimpleEval.parse)
+
+
+@dataclasses.dataclass(frozen=True)
+class _Binding:
+    """A format placeholder which has been replaced by a name in a program
+
+    Attributes:
+        name: name the value is bound to
+        field: placeholder that was replaced
+        quoted: whether the placeholder was the whole of a string literal, in
+            which case the value is bound as a string
+    """
+
+    name: str
+    field: FormatField
+    quoted: bool
+
+    def value(self, variables: VariablesView) -> Any:
+        """Get the value to bind, or raise ValueError if binding it would not
+        give the same result as formatting it into the program"""
+        value = self.field.resolve(variables)
+
+        if self.quoted:
+            value = format(value, "")
+            if _UNSAFE_IN_STRING.intersection(value):
+                raise ValueError(value)
+        elif value is not None and not (
+            type(value) in (bool, int, float) and value >= 0 and math.isfinite(value)
+        ):
+            # Anything else might not be parsed back into the same value, eg.
+            # strings would be parsed as code.
+            raise ValueError(value)
+
+        return value
+
+
+@dataclasses.dataclass(frozen=True)
+class _SkipProgram:
+    """A skip expression with its format placeholders bound as names
+
+    Attributes:
+        node: parsed expression
+        bindings: placeholders to bind before evaluating it
+    """
+
+    node: ast.AST
+    bindings: tuple[_Binding, ...]
+
+    def names(self, variables: MutableMapping) -> Mapping:
+        view = VariablesView(variables)
+        bound = {b.name: b.value(view) for b in self.bindings}
+        return ChainMap(bound, variables) if bound else variables
+
+
+@functools.lru_cache(maxsize=1024)
+def _compile_skip(content: str) -> Optional[_SkipProgram]:
+    """Parse a skip expression, replacing format placeholders with names so
+    the same parsed expression can be used whatever the values of the variables
+
+    Returns:
+        parsed program, or None if the placeholders are used in a way where
+            the expression has to be formatted first
+    """
+    if "__tavern_skip_" in content:
+        return None
+
+    try:
+        template = compile_format_string(content)
+    except exceptions.BadSchemaError:
+        return None
+
+    if template.use_str_format:
+        return None
+
+    fields: dict[str, FormatField] = {}
+    source: list[str] = []
+
+    for part in template.parts:
+        if isinstance(part, str):
+            source.append(part)
+        elif part.conversion is not None or part.format_spec:
+            return None
+        else:
+            name = f"__tavern_skip_{len(fields)}__"
+            name = next((n for n, f in fields.items() if f == part), name)
+            fields[name] = part
+            source.append(name)
+
+    if not fields:
+        return None
+
+    program = "".join(source)
+
+    try:
+        # Not using the cached version, because the tree is modified below
+        node = simpleeval.SimpleEval.parse(program)
+    except SyntaxError:
+        return None
+
+    bindings: dict[str, _Binding] = {}
+    found = 0
+
+    class _Replace(ast.NodeTransformer):
+        def visit_JoinedStr(self, node: ast.JoinedStr) -> ast.AST:
+            # Placeholders in f-strings can't be replaced, so don't count them
+            return node
+
+        def visit_Name(self, node: ast.Name) -> ast.AST:
+            nonlocal found
+            if node.id in fields:
+                found += 1
+                bindings[node.id] = _Binding(node.id, fields[node.id], False)
+            return node
+
+        def visit_Constant(self, node: ast.Constant) -> ast.AST:
+            nonlocal found
+            if isinstance(node.value, str) and node.value in fields:
+                found += 1
+                name = f"{node.value}str"
+                bindings[name] = _Binding(name, fields[node.value], True)
+                return ast.copy_location(ast.Name(id=name, ctx=ast.Load()), node)
+            return node
+
+    node = _Replace().visit(node)
+
+    if found != sum(program.count(name) for name in fields):
+        # Used as part of a string or somewhere else that can't be replaced
+        return None
+
+    return _SkipProgram(node=node, bindings=tuple(bindings.values()))
+
 
 def eval_skip(content: str, test_block_config: TestConfig) -> bool:
     """Run a simpleeval expression to determine if a test should be skipped.
 
+    Expressions are only parsed once. If the format variables in the expression
+    can be bound as names, the same parsed expression is used for every test,
+    otherwise it is parsed once for each formatted version of it.
+
     Args:
         content: The unformatted simpleeval string to evaluate
         test_block_config: Configuration containing variables to use in simpleeval evaluation
@@ -27,13 +179,30 @@ def eval_skip(content: str, test_block_config: TestConfig) -> bool:
 
     """
 
-    formatted = format_keys(content, test_block_config.variables)
+    variables = test_block_config.variables
+    expression = content
+    names: Mapping = variables
+    node: Optional[ast.AST] = None
+
+    if (program := _compile_skip(content)) is not None:
+        try:
+            names = program.names(variables)
+        except (KeyError, AttributeError, IndexError, ValueError, TypeError):
+            logger.debug("Formatting skip expression '%s' instead", content)
+        else:
+            node = program.node
+
+    if node is None:
+        # Let format_keys raise the usual errors for missing variables
+        expression = format_keys(content, variables)
 
-    logger.debug("simpleeval expression to evaluate: %s", formatted)
+    logger.debug("simpleeval expression to evaluate: %s", expression)
 
     try:
-        result = simpleeval.simple_eval(
-            formatted, names=test_block_config.variables, functions=functions
+        if node is None:
+            node = _parse(expression)
+        result = simpleeval.SimpleEval(names=names, functions=functions).eval(
+            expression, previously_parsed=node
         )
     except simpleeval.NameNotDefined as e:
         raise exceptions.EvalError("Undefined variable used in program") from e
@@ -1,5 +1,6 @@
 import dataclasses
 import enum
+import functools
 import logging
 import re
 from typing import Union
@@ -57,6 +58,18 @@ class StrictOption:
             return self.setting in [StrictSetting.ON]
 
 
+_OPTION_REGEX = re.compile(
+    r"""
+    (?P<section>{sections})      # The section name (json/headers/redirect_query_params)
+    (?:                          # Optional non-capturing group for setting
+        :                        # Literal colon separator
+        (?P<setting>{switches})  # The setting value (on/off/list_any_order)
+    )?                          # End optional group
+    """.format(sections="|".join(valid_keys), switches="|".join(valid_switches)),
+    re.X,
+)
+
+
 def validate_and_parse_option(key: str) -> StrictOption:
     """Parse and validate a strict option configuration string.
 
@@ -71,18 +84,7 @@ def validate_and_parse_option(key: str) -> StrictOption:
     Raises:
         InvalidConfigurationException: If the key format is invalid
     """
-    regex = re.compile(
-        r"""
-        (?P<section>{sections})      # The section name (json/headers/redirect_query_params)
-        (?:                          # Optional non-capturing group for setting
-            :                        # Literal colon separator
-            (?P<setting>{switches})  # The setting value (on/off/list_any_order)
-        )?                          # End optional group
-        """.format(sections="|".join(valid_keys), switches="|".join(valid_switches)),
-        re.X,
-    )
-
-    match = regex.fullmatch(key)
+    match = _OPTION_REGEX.fullmatch(key)
 
     if not match:
         raise exceptions.InvalidConfigurationException(
@@ -129,11 +131,7 @@ class StrictLevel:
                 "'strict' setting should be a list of strings"
             )
 
-        logger.debug("Parsing options to strict level: %s", options)
-
-        parsed = [validate_and_parse_option(key) for key in options]
-
-        return cls(**{i.section: i for i in parsed})
+        return _parse_strict_level(tuple(options))
 
     def option_for(self, section: str) -> StrictOption:
         """Provides a string-based way of getting strict settings for a section"""
@@ -153,6 +151,21 @@ class StrictLevel:
         return cls.from_options([i + ":off" for i in valid_keys])
 
 
+@functools.lru_cache(maxsize=256)
+def _parse_strict_level(options: tuple[str, ...]) -> StrictLevel:
+    """Parse strict options into a StrictLevel
+
+    StrictLevels can't be changed, so this is cached and the same object is
+    returned every time the same options are used (eg, by every retry of a
+    stage, or by every test using the global setting).
+    """
+    logger.debug("Parsing options to strict level: %s", options)
+
+    parsed = [validate_and_parse_option(key) for key in options]
+
+    return StrictLevel(**{i.section: i for i in parsed})
+
+
 StrictSettingKinds = Union[None, bool, StrictSetting, StrictOption]
 
 
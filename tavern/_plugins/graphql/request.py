@@ -1,4 +1,5 @@
 import logging
+from collections.abc import Mapping
 from contextlib import ExitStack
 from functools import cached_property
 
@@ -55,7 +56,7 @@ def get_file_arguments(file_args: dict, test_block_config: TestConfig) -> dict:
     return gql_file_vars
 
 
-def _format_graphql_request(rspec: dict, variables: dict) -> dict:
+def _format_graphql_request(rspec: dict, variables: Mapping) -> dict:
     """Format a GraphQL request spec, excluding the query field from formatting.
 
     GraphQL queries contain curly braces which are mistakenly interpreted as format
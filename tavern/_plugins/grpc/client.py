@@ -50,7 +50,7 @@ class GRPCClient:
         # check main block first
         check_expected_keys(expected_blocks.keys(), kwargs)
 
-        _connect_args = kwargs.pop("connect", {})
+        _connect_args = dict(kwargs.pop("connect", {}))
         check_expected_keys(expected_blocks["connect"], _connect_args)
 
         metadata = kwargs.pop("metadata", {})
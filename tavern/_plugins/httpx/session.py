@@ -0,0 +1,420 @@
+import atexit
+import contextlib
+import logging
+import os
+import ssl
+import threading
+import time
+from collections.abc import Hashable, Mapping
+from typing import Any, Optional
+
+import certifi
+import requests
+from requests.cookies import RequestsCookieJar
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from tavern._core import exceptions
+from tavern._core.asyncio import ThreadedAsyncLoop, shared_loop
+from tavern._plugins.rest.apps import route_app_url
+from tavern._plugins.rest.session import AdapterSettings, RestSession
+from tavern._plugins.rest.unix import route_unix_url
+
+try:
+    import httpx
+except ImportError:
+    httpx = None  # type: ignore[assignment]
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+# Same as requests
+_MAX_REDIRECTS = 30
+
+
+def _ssl_context(verify: bool | str, cert: Optional[tuple[str, ...]]) -> ssl.SSLContext:
+    """Create an SSL context from the 'verify' and 'cert' keys of a request, in
+    the same way as requests would use them"""
+    if verify is True:
+        verify = (
+            os.environ.get("REQUESTS_CA_BUNDLE")
+            or os.environ.get("CURL_CA_BUNDLE")
+            or certifi.where()
+        )
+
+    if verify is False:
+        context = ssl.create_default_context()
+        context.check_hostname = False
+        context.verify_mode = ssl.CERT_NONE
+    elif os.path.isdir(verify):
+        context = ssl.create_default_context(capath=verify)
+    else:
+        context = ssl.create_default_context(cafile=verify)
+
+    if cert:
+        context.load_cert_chain(*cert)
+
+    return context
+
+
+def _create_transport(
+    settings: AdapterSettings,
+    http2: bool,
+    verify: bool | str,
+    cert: Optional[tuple[str, ...]],
+) -> "httpx.AsyncHTTPTransport":
+    # httpx limits are for all hosts rather than for each host
+    max_connections = settings.pool_connections * settings.pool_maxsize
+
+    return httpx.AsyncHTTPTransport(
+        verify=_ssl_context(verify, cert),
+        http2=http2,
+        limits=httpx.Limits(
+            max_connections=max_connections if settings.pool_block else None,
+            max_keepalive_connections=max_connections,
+        ),
+        retries=settings.max_retries,
+        socket_options=settings.socket_options(),
+    )
+
+
+class _TransportPool:
+    """Transports shared by every test run in this process, keyed on the
+    settings used to create them. This is the same as the adapter pool for the
+    requests backend.
+
+    Also holds the cookie jar for tests which share cookies.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._transports: dict[Hashable, tuple[Any, float]] = {}
+        self._loop: Optional[ThreadedAsyncLoop] = None
+        self.cookies = RequestsCookieJar()
+
+    def get(
+        self,
+        settings: AdapterSettings,
+        http2: bool,
+        verify: bool | str,
+        cert: Optional[tuple[str, ...]],
+    ) -> "httpx.AsyncHTTPTransport":
+        key = (settings, http2, verify, cert)
+        now = time.monotonic()
+
+        with self._lock:
+            if self._loop is None:
+                self._loop = shared_loop()
+                # Registered after the loop is started, so this is called
+                # before the loop is stopped
+                atexit.register(self.close)
+
+            try:
+                transport, created = self._transports[key]
+            except KeyError:
+                pass
+            else:
+                if (
+                    settings.max_connection_age is None
+                    or now - created < settings.max_connection_age
+                ):
+                    return transport
+
+                logger.debug("Closing connections older than %s", settings)
+                self._loop.run_coroutine(transport.aclose())
+
+            logger.debug("Creating new HTTP transport for %s", key)
+            transport = _create_transport(settings, http2, verify, cert)
+            self._transports[key] = (transport, now)
+            return transport
+
+    def close(self) -> None:
+        with self._lock:
+            if self._loop is not None and self._loop.is_alive():
+                for transport, _ in self._transports.values():
+                    self._loop.run_coroutine(transport.aclose())
+            self._transports.clear()
+            self.cookies.clear()
+
+
+transport_pool = _TransportPool()
+
+
+def _timeout(timeout: Any) -> "Optional[httpx.Timeout]":
+    """Convert a requests timeout (None, a number, or a (connect, read) pair)
+    to a httpx one"""
+    if timeout is None:
+        return None
+    if isinstance(timeout, list | tuple):
+        connect, read = timeout
+        return httpx.Timeout(read, connect=connect)
+    return httpx.Timeout(timeout)
+
+
+def _auth(auth: Any) -> Any:
+    """Convert a requests auth (a (username, password) pair or an AuthBase from
+    an ext function) to a httpx one
+
+    AuthBase objects are called with a prepared request which only has the
+    method, url and headers set, and any headers it sets are copied into the
+    request. Auth which needs more than that, such as digest auth, will not
+    work.
+    """
+    if isinstance(auth, list | tuple):
+        return tuple(auth)
+
+    def apply(request: "httpx.Request") -> "httpx.Request":
+        prepared = requests.PreparedRequest()
+        prepared.prepare(
+            method=request.method, url=str(request.url), headers=dict(request.headers)
+        )
+        prepared = auth(prepared)
+        request.headers.update(prepared.headers)
+        return request
+
+    return apply
+
+
+def _files(files: Any) -> Any:
+    """Convert files in the form requests takes them to the form httpx does
+
+    Files are sent by Tavern as (filename, fileobj, content type, headers)
+    tuples, where the content type and headers can be None. httpx needs the
+    headers to be a mapping.
+    """
+    if files is None:
+        return None
+
+    items = files.items() if isinstance(files, Mapping) else files
+
+    converted = []
+    for name, value in items:
+        if isinstance(value, tuple) and len(value) == 4:
+            filename, fileobj, content_type, headers = value
+            value = (filename, fileobj, content_type, headers or {})
+        converted.append((name, value))
+
+    return converted
+
+
+def _to_prepared_request(request: "httpx.Request") -> requests.PreparedRequest:
+    prepared = requests.PreparedRequest()
+    prepared.method = request.method
+    prepared.url = str(request.url)
+    prepared.headers = CaseInsensitiveDict(request.headers.items())
+
+    try:
+        prepared.body = request.content
+    except httpx.RequestNotRead:
+        prepared.body = None
+
+    return prepared
+
+
+def _to_requests_response(response: "httpx.Response") -> requests.Response:
+    """Convert a httpx response to a requests one, so it can be checked (and
+    passed to ext functions) in exactly the same way as with the requests
+    backend"""
+    converted = requests.Response()
+    converted.status_code = response.status_code
+    converted.reason = response.reason_phrase
+    converted.url = str(response.url)
+    # Multiple headers with the same name are joined, like requests does
+    converted.headers = CaseInsensitiveDict(response.headers.items())
+    converted.encoding = get_encoding_from_headers(converted.headers)
+    # No public way of setting the content of a requests response
+    converted._content = response.content
+    converted.history = [_to_requests_response(r) for r in response.history]
+    converted.request = _to_prepared_request(response.request)
+
+    with contextlib.suppress(RuntimeError):
+        converted.elapsed = response.elapsed
+
+    cookies = RequestsCookieJar()
+    httpx.Cookies(cookies).extract_cookies(response)
+    converted.cookies = cookies
+
+    return converted
+
+
+class HttpxSession:
+    """Session for one test which sends requests with httpx
+
+    This has the same interface as requests.Session, as far as RestRequest
+    uses it, and returns requests Responses. Requests are run on an event loop
+    shared by every test, and HTTP/2 is used if the server supports it unless
+    http2 is False.
+
+    Requests to an application in-process (if app is set, or for 'wsgi://' and
+    'asgi://' URLs) and requests to a Unix socket (if unix_socket is set, or
+    for 'http+unix://' URLs) are sent in the same way as with the requests
+    backend, with the same cookies as this session.
+
+    Other arguments are the same as for the requests backend.
+    """
+
+    def __init__(
+        self,
+        reuse_connections: bool = True,
+        share_cookies: bool = False,
+        http2: bool = True,
+        app: Optional[str] = None,
+        **adapter_settings,
+    ) -> None:
+        if httpx is None:
+            raise exceptions.PluginLoadError(
+                "httpx must be installed to use the httpx backend - install tavern[httpx]"
+            )
+
+        self._settings = AdapterSettings(**adapter_settings)
+        self._http2 = http2
+        self._pooled = reuse_connections
+        self._loop = shared_loop()
+
+        # One client for each combination of 'verify' and 'cert', because
+        # httpx can only set those on the transport
+        self._clients: dict[Hashable, httpx.AsyncClient] = {}
+        self._own_transports: list[httpx.AsyncHTTPTransport] = []
+
+        self.cookies = transport_pool.cookies if share_cookies else RequestsCookieJar()
+
+        self._app = app
+        self._rest_session = RestSession(
+            reuse_connections=reuse_connections, app=app, **adapter_settings
+        )
+        self._rest_session.cookies = self.cookies
+
+    def __enter__(self) -> "HttpxSession":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def close(self) -> None:
+        # Clients are not closed, because that would close pooled transports
+        self._clients.clear()
+        self._rest_session.close()
+
+        for transport in self._own_transports:
+            self._loop.run_coroutine(transport.aclose())
+        self._own_transports.clear()
+
+    def _client(self, verify: bool | str, cert: Any) -> "httpx.AsyncClient":
+        if isinstance(cert, str):
+            cert = (cert,)
+        elif cert is not None:
+            cert = tuple(cert)
+
+        key = (verify, cert)
+
+        try:
+            return self._clients[key]
+        except KeyError:
+            pass
+
+        if self._pooled:
+            transport = transport_pool.get(self._settings, self._http2, verify, cert)
+        else:
+            transport = _create_transport(self._settings, self._http2, verify, cert)
+            self._own_transports.append(transport)
+
+        client = self._clients[key] = httpx.AsyncClient(
+            transport=transport,
+            # Uses this jar directly, so cookies are shared between clients and
+            # RestRequest can change them in the same way as for requests
+            cookies=self.cookies,
+            max_redirects=_MAX_REDIRECTS,
+            # requests has no timeout by default
+            timeout=None,
+        )
+        return client
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        headers: Optional[Mapping] = None,
+        params: Optional[Mapping] = None,
+        data: Any = None,
+        json: Any = None,
+        files: Any = None,
+        cookies: Optional[Mapping] = None,
+        auth: Any = None,
+        verify: bool | str = True,
+        cert: Any = None,
+        timeout: Any = None,
+        allow_redirects: bool = True,
+        stream: Optional[bool] = None,
+        unix_socket: Optional[str] = None,
+    ) -> requests.Response:
+        """Send a request, taking the same arguments as requests.Session.request"""
+        if (
+            self._app is not None
+            or self._settings.unix_socket is not None
+            or unix_socket is not None
+            or route_app_url(url) is not None
+            or route_unix_url(url) is not None
+        ):
+            return self._rest_session.request(
+                method,
+                url,
+                unix_socket=unix_socket,
+                headers=headers,
+                params=params,
+                data=data,
+                json=json,
+                files=files,
+                cookies=cookies,
+                auth=auth,
+                verify=verify,
+                cert=cert,
+                timeout=timeout,
+                allow_redirects=allow_redirects,
+                stream=stream,
+            )
+
+        client = self._client(verify, cert)
+
+        if cookies:
+            # RestRequest clears the cookies before doing a request with
+            # cookies, and puts them back afterwards
+            self.cookies.update(cookies)
+
+        content: Any = None
+        if isinstance(data, Mapping):
+            # Form data
+            pass
+        elif hasattr(data, "read"):
+            # file_body
+            content, data = data.read(), None
+        elif data is not None:
+            content, data = data, None
+
+        request = client.build_request(
+            method,
+            url,
+            headers=headers,
+            params=params,
+            data=data,
+            content=content,
+            json=json,
+            files=_files(files),
+            timeout=_timeout(timeout),
+        )
+
+        send_kwargs: dict[str, Any] = {"follow_redirects": allow_redirects}
+        if auth is not None:
+            send_kwargs["auth"] = _auth(auth)
+
+        try:
+            response = self._loop.run_coroutine(client.send(request, **send_kwargs))
+        except httpx.TimeoutException as e:
+            raise requests.exceptions.Timeout(str(e)) from e
+        except httpx.TooManyRedirects as e:
+            raise requests.exceptions.TooManyRedirects(str(e)) from e
+        except httpx.ConnectError as e:
+            raise requests.exceptions.ConnectionError(str(e)) from e
+        except (httpx.HTTPError, httpx.InvalidURL) as e:
+            raise requests.exceptions.RequestException(str(e)) from e
+
+        return _to_requests_response(response)
@@ -0,0 +1,13 @@
+from tavern._plugins.rest.tavernhook import TavernRestPlugin
+
+from .session import HttpxSession
+
+
+class TavernHttpxPlugin(TavernRestPlugin):
+    """HTTP plugin which sends requests with httpx instead of requests
+
+    Requests and responses are handled in exactly the same way as in the
+    requests plugin, only the session is different.
+    """
+
+    session_type = HttpxSession
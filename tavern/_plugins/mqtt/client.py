@@ -164,10 +164,10 @@ class MQTTClient:
         check_expected_keys(expected_blocks.keys(), kwargs)
 
         # then check constructor/connect/tls_set args
-        self._client_args = kwargs.pop("client", {})
+        self._client_args = dict(kwargs.pop("client", {}))
         check_expected_keys(expected_blocks["client"], self._client_args)
 
-        self._connect_args = kwargs.pop("connect", {})
+        self._connect_args = dict(kwargs.pop("connect", {}))
         check_expected_keys(expected_blocks["connect"], self._connect_args)
 
         self._auth_args = kwargs.pop("auth", {})
@@ -180,8 +180,8 @@ class MQTTClient:
         self._connect_timeout = self._connect_args.pop("timeout", 3)
 
         # If there is any tls or ssl_context kwarg, configure tls encryption
-        file_tls_args = kwargs.pop("tls", {})
-        file_ssl_context_args = kwargs.pop("ssl_context", {})
+        file_tls_args = dict(kwargs.pop("tls", {}))
+        file_ssl_context_args = dict(kwargs.pop("ssl_context", {}))
 
         if file_tls_args and file_ssl_context_args:
             msg = (
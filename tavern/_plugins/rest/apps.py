@@ -0,0 +1,414 @@
+import abc
+import asyncio
+import atexit
+import dataclasses
+import functools
+import http
+import http.client
+import io
+import logging
+import re
+import sys
+from collections.abc import Awaitable, Callable
+from typing import Any, Optional
+from urllib.parse import unquote_to_bytes, urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3 import HTTPHeaderDict, HTTPResponse
+
+from tavern._core import exceptions
+from tavern._core.asyncio import shared_loop
+from tavern._core.extfunctions import import_ext_function
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+_APP_URL = re.compile(
+    r"^(?P<interface>wsgi|asgi)://(?P<entrypoint>[\w.]+:\w+)(?P<rest>[/?#].*)?$"
+)
+
+# Headers which only describe how the body was sent over the network. The body
+# is complete by the time it is passed to requests, so these are left out.
+_HOP_BY_HOP = frozenset(["transfer-encoding", "connection", "keep-alive"])
+
+# (status code, reason, headers, body)
+_AppResponse = tuple[int, str, list[tuple[str, str]], bytes]
+
+
+@dataclasses.dataclass(frozen=True)
+class AppTarget:
+    """A Python application to send requests to in-process, instead of over
+    the network
+
+    Attributes:
+        interface: 'wsgi' or 'asgi'
+        entrypoint: the application, in the form module.submodule:app
+    """
+
+    interface: str
+    entrypoint: str
+
+    @property
+    def host(self) -> str:
+        """Host name used in the URLs of requests sent to this application"""
+        module, _, name = self.entrypoint.partition(":")
+        return f"{name}.{module}.{self.interface}".replace("_", "-").lower()
+
+    @classmethod
+    def parse(cls, app: str) -> "AppTarget":
+        """Parse an application in the form 'wsgi://module.submodule:app'
+
+        Raises:
+            BadSchemaError: if it is not in that form
+        """
+        match = _APP_URL.match(app)
+        if match is None or match.group("rest"):
+            raise exceptions.BadSchemaError(
+                f"Expected application in the form 'wsgi://module.submodule:app' or 'asgi://module.submodule:app', got '{app}'"
+            )
+
+        return cls(match.group("interface"), match.group("entrypoint"))
+
+
+def route_app_url(url: str) -> Optional[tuple[AppTarget, str]]:
+    """If url is a 'wsgi://' or 'asgi://' URL, return the application it is
+    for and the http:// URL to use instead
+
+    For example 'wsgi://server:app/users?id=1' is turned into
+    'http://app.server.wsgi/users?id=1'.
+    """
+    match = _APP_URL.match(url)
+    if match is None:
+        return None
+
+    target = AppTarget(match.group("interface"), match.group("entrypoint"))
+    rest = match.group("rest") or "/"
+    if not rest.startswith("/"):
+        rest = "/" + rest
+
+    return target, f"http://{target.host}{rest}"
+
+
+class _OriginalResponse:
+    """Stands in for the http.client response urllib3 normally wraps, which is
+    where requests reads the cookies set by a response from"""
+
+    def __init__(self, headers: list[tuple[str, str]]) -> None:
+        self.msg = http.client.HTTPMessage()
+        for name, value in headers:
+            self.msg[name] = value
+
+    def isclosed(self) -> bool:
+        return True
+
+    def close(self) -> None:
+        pass
+
+
+def _request_body(request: requests.PreparedRequest) -> bytes:
+    body = request.body
+    if body is None:
+        return b""
+    if isinstance(body, str):
+        return body.encode("utf8")
+    if hasattr(body, "read"):
+        # file_body
+        return body.read()
+    return bytes(body)
+
+
+def _server_error() -> _AppResponse:
+    """Response for an application raising an exception, which is the same as
+    most servers return"""
+    body = b"Internal Server Error"
+    headers = [
+        ("Content-Type", "text/plain; charset=utf-8"),
+        ("Content-Length", str(len(body))),
+    ]
+    return 500, "Internal Server Error", headers, body
+
+
+class _InProcessAdapter(HTTPAdapter, metaclass=abc.ABCMeta):
+    """Adapter which calls an application with each request instead of sending
+    it over the network
+
+    The response is converted in the same way as responses from the network,
+    so cookies, redirects and everything else are handled by requests as
+    normal.
+    """
+
+    def __init__(self, target: AppTarget, app: Any) -> None:
+        super().__init__()
+        self.target = target
+        self.app = app
+
+    def send(  # noqa: PLR0917 - same signature as HTTPAdapter
+        self,
+        request: requests.PreparedRequest,
+        stream: bool = False,
+        timeout: Any = None,
+        verify: bool | str = True,
+        cert: Any = None,
+        proxies: Any = None,
+    ) -> requests.Response:
+        logger.debug("Calling %s with %s %s", self.target, request.method, request.url)
+
+        status, reason, headers, body = self._call(request, _request_body(request))
+        headers = [(k, v) for k, v in headers if k.lower() not in _HOP_BY_HOP]
+
+        raw = HTTPResponse(
+            body=io.BytesIO(body),
+            headers=HTTPHeaderDict(headers),
+            status=status,
+            reason=reason,
+            preload_content=False,
+            decode_content=False,
+            original_response=_OriginalResponse(headers),  # type: ignore
+            request_method=request.method,
+            request_url=request.url,
+        )
+        return self.build_response(request, raw)
+
+    @abc.abstractmethod
+    def _call(self, request: requests.PreparedRequest, body: bytes) -> _AppResponse:
+        """Call the application with a request
+
+        Returns:
+            status code, reason, headers and body of the response
+        """
+
+
+class WSGIAdapter(_InProcessAdapter):
+    """Calls a WSGI application with each request"""
+
+    def _environ(self, request: requests.PreparedRequest, body: bytes) -> dict:
+        url = urlsplit(str(request.url))
+
+        environ = {
+            "REQUEST_METHOD": request.method,
+            "SCRIPT_NAME": "",
+            # Decoded like servers do, as required by PEP 3333
+            "PATH_INFO": unquote_to_bytes(url.path or "/").decode("latin-1"),
+            "QUERY_STRING": url.query,
+            "SERVER_NAME": url.hostname,
+            "SERVER_PORT": str(url.port or (443 if url.scheme == "https" else 80)),
+            "SERVER_PROTOCOL": "HTTP/1.1",
+            "REMOTE_ADDR": "127.0.0.1",
+            "HTTP_HOST": url.netloc,
+            "wsgi.version": (1, 0),
+            "wsgi.url_scheme": url.scheme,
+            "wsgi.input": io.BytesIO(body),
+            "wsgi.errors": sys.stderr,
+            "wsgi.multithread": False,
+            "wsgi.multiprocess": False,
+            "wsgi.run_once": False,
+        }
+
+        for name, value in request.headers.items():
+            key = name.upper().replace("-", "_")
+            if key not in ("CONTENT_TYPE", "CONTENT_LENGTH"):
+                key = f"HTTP_{key}"
+            environ[key] = value
+
+        environ["CONTENT_LENGTH"] = str(len(body))
+
+        return environ
+
+    def _call(self, request: requests.PreparedRequest, body: bytes) -> _AppResponse:
+        started: list = []
+        chunks: list[bytes] = []
+
+        def start_response(status: str, headers: list, exc_info: Any = None):
+            if exc_info and started:
+                raise exc_info[1].with_traceback(exc_info[2])
+            started[:] = [status, headers]
+            return chunks.append
+
+        try:
+            result = self.app(self._environ(request, body), start_response)
+            try:
+                chunks.extend(result)
+            finally:
+                if hasattr(result, "close"):
+                    result.close()
+        except Exception as e:
+            if not started:
+                logger.exception("Error in application %s", self.target.entrypoint)
+                return _server_error()
+            raise requests.exceptions.ConnectionError(
+                f"Error in application {self.target.entrypoint} after starting response"
+            ) from e
+
+        code, _, reason = started[0].partition(" ")
+        return int(code), reason, list(started[1]), b"".join(chunks)
+
+
+class ASGIAdapter(_InProcessAdapter):
+    """Calls an ASGI application with each request, on the event loop shared by
+    everything in Tavern
+
+    The application's lifespan is started before the first request, and shut
+    down when the process exits. Applications which don't support lifespan
+    events are still called.
+    """
+
+    def __init__(self, target: AppTarget, app: Any) -> None:
+        super().__init__(target, app)
+        self._loop = shared_loop()
+        self._state: dict = {}
+        self._started = False
+
+    def _start(self) -> None:
+        if self._started:
+            return
+
+        shutdown = self._loop.run_coroutine(self._lifespan())
+        self._started = True
+
+        if shutdown is not None:
+            # Registered after the loop is started, so this is called before
+            # the loop is stopped
+            atexit.register(lambda: self._loop.run_coroutine(shutdown(), timeout=5))
+
+    async def _lifespan(self) -> Optional[Callable[[], Awaitable[None]]]:
+        """Send the startup event to the application
+
+        Returns:
+            function to shut it down, or None if it doesn't support lifespan
+                events
+        """
+        events: asyncio.Queue = asyncio.Queue()
+        replies: asyncio.Queue = asyncio.Queue()
+
+        async def run() -> None:
+            scope = {
+                "type": "lifespan",
+                "asgi": {"version": "3.0", "spec_version": "2.0"},
+                "state": self._state,
+            }
+            try:
+                await self.app(scope, events.get, replies.put)
+            except Exception:
+                logger.debug("%s does not support lifespan", self.target, exc_info=True)
+            finally:
+                await replies.put(None)
+
+        task = asyncio.ensure_future(run())
+
+        await events.put({"type": "lifespan.startup"})
+        reply = await replies.get()
+
+        if reply is None:
+            return None
+        if reply["type"] == "lifespan.startup.failed":
+            raise requests.exceptions.ConnectionError(
+                f"Application {self.target.entrypoint} failed to start: {reply.get('message', '')}"
+            )
+
+        async def shutdown() -> None:
+            await events.put({"type": "lifespan.shutdown"})
+            await replies.get()
+            await task
+
+        return shutdown
+
+    def _scope(self, request: requests.PreparedRequest) -> dict:
+        url = urlsplit(str(request.url))
+        path = url.path or "/"
+
+        headers = [(b"host", url.netloc.encode("latin-1"))]
+        headers.extend(
+            (name.lower().encode("latin-1"), value.encode("latin-1"))
+            for name, value in request.headers.items()
+        )
+
+        return {
+            "type": "http",
+            "asgi": {"version": "3.0", "spec_version": "2.3"},
+            "http_version": "1.1",
+            "method": request.method,
+            "scheme": url.scheme,
+            "path": unquote_to_bytes(path).decode("utf8"),
+            "raw_path": path.encode("latin-1"),
+            "query_string": url.query.encode("latin-1"),
+            "root_path": "",
+            "headers": headers,
+            "client": ("127.0.0.1", 0),
+            "server": (
+                url.hostname,
+                url.port or (443 if url.scheme == "https" else 80),
+            ),
+            "state": self._state.copy(),
+        }
+
+    async def _run(self, scope: dict, body: bytes) -> _AppResponse:
+        started: dict = {}
+        chunks: list[bytes] = []
+        body_sent = False
+        complete = asyncio.Event()
+
+        async def receive() -> dict:
+            nonlocal body_sent
+            if not body_sent:
+                body_sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+
+            await complete.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message: dict) -> None:
+            if message["type"] == "http.response.start":
+                started.update(message)
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+                if not message.get("more_body", False):
+                    complete.set()
+
+        try:
+            await self.app(scope, receive, send)
+        except Exception as e:
+            if not started:
+                logger.exception("Error in application %s", self.target.entrypoint)
+                return _server_error()
+            raise requests.exceptions.ConnectionError(
+                f"Error in application {self.target.entrypoint} after starting response"
+            ) from e
+        finally:
+            complete.set()
+
+        if not started:
+            logger.error("%s returned without sending a response", self.target)
+            return _server_error()
+
+        status = started["status"]
+        headers = [
+            (name.decode("latin-1"), value.decode("latin-1"))
+            for name, value in started.get("headers", [])
+        ]
+        try:
+            reason = http.HTTPStatus(status).phrase
+        except ValueError:
+            reason = ""
+
+        return status, reason, headers, b"".join(chunks)
+
+    def _call(self, request: requests.PreparedRequest, body: bytes) -> _AppResponse:
+        self._start()
+        return self._loop.run_coroutine(self._run(self._scope(request), body))
+
+
+@functools.cache
+def app_adapter(target: AppTarget) -> HTTPAdapter:
+    """Import an application and create an adapter which sends requests to it
+
+    Adapters are shared by every test, so the application is only imported
+    (and, for ASGI, started) once.
+
+    Raises:
+        InvalidExtFunctionError: if the application couldn't be imported
+    """
+    app = import_ext_function(target.entrypoint)
+
+    if target.interface == "asgi":
+        return ASGIAdapter(target, app)
+    return WSGIAdapter(target, app)
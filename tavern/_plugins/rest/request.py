@@ -148,6 +148,9 @@ def get_request_args(rspec: dict, test_block_config: TestConfig) -> dict:
                 )
 
             fspec["file_body"] = resolved_filename
+            # Parts of the request which did not need formatting are shared
+            # with the test spec, so copy before adding to them
+            fspec["headers"] = dict(fspec["headers"])
 
             if file_spec.content_type:
                 inferred_content_type = file_spec.content_type
@@ -225,7 +228,10 @@ def get_request_args(rspec: dict, test_block_config: TestConfig) -> dict:
     # eg https://openid.net/specs/openid-connect-core-1_0.html#ClaimsParameter
     # > ...represented in an OAuth 2.0 request as UTF-8 encoded JSON (which ends
     # > up being form-urlencoded when passed as an OAuth parameter)
-    for key, value in request_args.get("params", {}).items():
+    if "params" in request_args:
+        request_args["params"] = dict(request_args["params"])
+
+    for key, value in list(request_args.get("params", {}).items()):
         if not isinstance(value, str):
             if key == "$ext":
                 logger.debug("Skipping converting of ext function (%s)", value)
@@ -234,7 +240,7 @@ def get_request_args(rspec: dict, test_block_config: TestConfig) -> dict:
         if isinstance(value, dict):
             request_args["params"][key] = quote_plus(json.dumps(value))
 
-    optional = {"verify", "stream"}
+    optional = {"verify", "stream", "unix_socket"}
 
     for key in optional:
         if key in fspec:
@@ -438,6 +444,7 @@ class RestRequest(BaseRequest):
             "timeout",
             "cookies",
             "cert",
+            "unix_socket",
             # "hooks",
             "follow_redirects",
         }
@@ -0,0 +1,267 @@
+import atexit
+import contextlib
+import dataclasses
+import logging
+import socket
+import threading
+import time
+from collections.abc import Iterator
+from typing import Any, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import (
+    DEFAULT_POOLBLOCK,
+    DEFAULT_POOLSIZE,
+    DEFAULT_RETRIES,
+    HTTPAdapter,
+)
+from requests.cookies import RequestsCookieJar
+
+from tavern._plugins.rest.apps import AppTarget, app_adapter, route_app_url
+from tavern._plugins.rest.unix import (
+    UnixSocketAdapter,
+    route_unix_url,
+    unix_socket_host,
+)
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+
+class _TunedHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter which sets socket options on every connection it opens"""
+
+    def __init__(self, socket_options: list[tuple[int, int, int]], **kwargs) -> None:
+        self._socket_options = socket_options
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **pool_kwargs) -> None:
+        pool_kwargs["socket_options"] = self._socket_options
+        super().init_poolmanager(*args, **pool_kwargs)
+
+    def proxy_manager_for(self, proxy, **proxy_kwargs):
+        proxy_kwargs["socket_options"] = self._socket_options
+        return super().proxy_manager_for(proxy, **proxy_kwargs)
+
+
+@dataclasses.dataclass(frozen=True)
+class AdapterSettings:
+    """Settings for the adapter used to make HTTP requests, from the 'http'
+    block of a test
+
+    Attributes:
+        pool_connections: number of hosts to keep connections open to
+        pool_maxsize: maximum number of connections to keep open to each host
+        pool_block: whether to wait for a connection to be free instead of
+            opening a new one when pool_maxsize connections are in use
+        max_retries: number of times to retry failed connections
+        tcp_nodelay: whether to disable Nagle's algorithm
+        tcp_keepalive: whether to enable TCP keepalive
+        max_connection_age: number of seconds after which connections are
+            closed and new ones opened, if any
+        unix_socket: path to a Unix socket to send requests to instead of
+            connecting to the host, if any
+    """
+
+    pool_connections: int = DEFAULT_POOLSIZE
+    pool_maxsize: int = DEFAULT_POOLSIZE
+    pool_block: bool = DEFAULT_POOLBLOCK
+    max_retries: int = DEFAULT_RETRIES
+    tcp_nodelay: bool = True
+    tcp_keepalive: bool = False
+    max_connection_age: Optional[float] = None
+    unix_socket: Optional[str] = None
+
+    def socket_options(self) -> list[tuple[int, int, int]]:
+        return [
+            (socket.IPPROTO_TCP, socket.TCP_NODELAY, int(self.tcp_nodelay)),
+            (socket.SOL_SOCKET, socket.SO_KEEPALIVE, int(self.tcp_keepalive)),
+        ]
+
+    def create_adapter(self) -> HTTPAdapter:
+        if self.unix_socket is not None:
+            # TCP socket options can't be set on Unix sockets
+            return UnixSocketAdapter(
+                self.unix_socket,
+                pool_connections=self.pool_connections,
+                pool_maxsize=self.pool_maxsize,
+                pool_block=self.pool_block,
+                max_retries=self.max_retries,
+            )
+
+        return _TunedHTTPAdapter(
+            socket_options=self.socket_options(),
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_maxsize,
+            pool_block=self.pool_block,
+            max_retries=self.max_retries,
+        )
+
+
+class _AdapterPool:
+    """Adapters shared by every test run in this process, keyed on the settings
+    used to create them
+
+    Connections (including TLS sessions) are kept open by the adapter, so tests
+    which use the same adapter reuse connections opened by earlier tests
+    instead of connecting to the same host again.
+
+    Also holds the cookie jar for tests which share cookies.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._adapters: dict[AdapterSettings, tuple[HTTPAdapter, float]] = {}
+        self.cookies = RequestsCookieJar()
+
+    def get(self, settings: Optional[AdapterSettings] = None) -> HTTPAdapter:
+        if settings is None:
+            settings = AdapterSettings()
+
+        now = time.monotonic()
+
+        with self._lock:
+            try:
+                adapter, created = self._adapters[settings]
+            except KeyError:
+                pass
+            else:
+                if (
+                    settings.max_connection_age is None
+                    or now - created < settings.max_connection_age
+                ):
+                    return adapter
+
+                logger.debug("Closing connections older than %s", settings)
+                adapter.close()
+
+            logger.debug("Creating new HTTP adapter for %s", settings)
+            adapter = settings.create_adapter()
+            self._adapters[settings] = (adapter, now)
+            return adapter
+
+    def close(self) -> None:
+        with self._lock:
+            for adapter, _ in self._adapters.values():
+                adapter.close()
+            self._adapters.clear()
+            self.cookies.clear()
+
+
+adapter_pool = _AdapterPool()
+atexit.register(adapter_pool.close)
+
+
+class RestSession(requests.Session):
+    """Session for one test, created from the 'http' block of the test
+
+    Connections are reused between tests unless reuse_connections is False.
+    Each test has its own cookies unless share_cookies is True, in which case
+    it uses the same cookies as every other test with share_cookies set.
+
+    If app is set (eg. 'wsgi://server:app'), every request is sent to that
+    application in-process instead of over the network. Requests to 'wsgi://'
+    or 'asgi://' URLs are always sent to the application in the URL.
+
+    Requests to 'http+unix://' URLs are sent to the (percent-encoded) socket
+    in the URL. Setting unix_socket sends every request to that socket, and it
+    can also be passed to request() to only send one request to a socket.
+
+    requests only supports HTTP/1.1, so http2 is ignored. Any other arguments
+    are passed to AdapterSettings.
+    """
+
+    def __init__(
+        self,
+        reuse_connections: bool = True,
+        share_cookies: bool = False,
+        http2: bool = False,
+        app: Optional[str] = None,
+        **adapter_settings,
+    ) -> None:
+        super().__init__()
+
+        if http2:
+            logger.warning(
+                "HTTP/2 is not supported by the requests backend - use '--tavern-http-backend=httpx' to use HTTP/2"
+            )
+
+        settings = AdapterSettings(**adapter_settings)
+
+        self._settings = settings
+        self._pooled = reuse_connections
+        self._unix_adapters: dict[str, HTTPAdapter] = {}
+
+        adapter: HTTPAdapter
+        if app is not None:
+            adapter = app_adapter(AppTarget.parse(app))
+        elif reuse_connections:
+            adapter = adapter_pool.get(settings)
+        else:
+            adapter = settings.create_adapter()
+
+        self.mount("https://", adapter)
+        self.mount("http://", adapter)
+
+        if share_cookies:
+            self.cookies = adapter_pool.cookies
+
+    def _unix_adapter(self, socket_path: str) -> HTTPAdapter:
+        settings = dataclasses.replace(self._settings, unix_socket=socket_path)
+
+        if self._pooled:
+            return adapter_pool.get(settings)
+
+        try:
+            return self._unix_adapters[socket_path]
+        except KeyError:
+            adapter = self._unix_adapters[socket_path] = settings.create_adapter()
+            return adapter
+
+    @contextlib.contextmanager
+    def _mounted(self, prefix: str, adapter: HTTPAdapter) -> Iterator[None]:
+        """Use adapter for prefix until the context exits"""
+        previous = self.adapters.get(prefix)
+        self.mount(prefix, adapter)
+
+        try:
+            yield
+        finally:
+            if previous is None:
+                del self.adapters[prefix]
+            else:
+                self.mount(prefix, previous)
+
+    def request(  # type: ignore[override]
+        self,
+        method: str,
+        url: str,
+        unix_socket: Optional[str] = None,
+        **kwargs: Any,
+    ) -> requests.Response:
+        if (routed := route_app_url(url)) is not None:
+            target, url = routed
+            prefix = f"http://{target.host}/"
+            if prefix not in self.adapters:
+                self.mount(prefix, app_adapter(target))
+        elif (routed_unix := route_unix_url(url)) is not None:
+            socket_path, url = routed_unix
+            prefix = f"http://{unix_socket_host(socket_path)}/"
+            if prefix not in self.adapters:
+                self.mount(prefix, self._unix_adapter(socket_path))
+
+        if unix_socket is None:
+            return super().request(method=method, url=url, **kwargs)
+
+        # Also used for any redirects to the same host
+        parsed = urlsplit(url)
+        prefix = f"{parsed.scheme}://{parsed.netloc}/"
+        with self._mounted(prefix, self._unix_adapter(unix_socket)):
+            return super().request(method=method, url=url, **kwargs)
+
+    def close(self) -> None:
+        # Pooled adapters stay open for the next test
+        if not self._pooled:
+            super().close()
+            for adapter in self._unix_adapters.values():
+                adapter.close()
@@ -1,6 +1,6 @@
 from os.path import abspath, dirname, join
+from typing import Any
 
-import requests
 import yaml
 
 from tavern._core import exceptions
@@ -10,10 +10,13 @@ from tavern._core.pytest.config import TestConfig
 
 from .request import RestRequest
 from .response import RestResponse
+from .session import RestSession
 
 
 class TavernRestPlugin(PluginHelperBase):
-    session_type = requests.Session
+    session_type: type[Any] = RestSession
+    # Same for any HTTP backend, rather than the name of this one
+    session_block_name = "http"
 
     request_type = RestRequest
     request_block_name = "request"
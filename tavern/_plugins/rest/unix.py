@@ -0,0 +1,158 @@
+import hashlib
+import logging
+import re
+import socket
+from typing import Any, Optional
+from urllib.parse import unquote, urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3 import HTTPConnectionPool, PoolManager
+from urllib3.connection import HTTPConnection
+from urllib3.exceptions import ConnectTimeoutError, NewConnectionError
+from urllib3.poolmanager import SSL_KEYWORDS
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+_UNIX_URL = re.compile(r"^http\+unix://(?P<socket>[^/?#]+)(?P<rest>[/?#].*)?$", re.I)
+
+
+def unix_socket_host(socket_path: str) -> str:
+    """Host name used in the URLs of requests sent to a socket, eg.
+    'run-app-sock-1a5f35e6cb91a4f3.unix' for '/run/app.sock'
+
+    This is different for every socket path. The readable part can be the same
+    for different paths (eg. '/run/app.sock' and '/run/App-sock'), so it is
+    followed by part of a hash of the path.
+    """
+    slug = re.sub(r"[^a-z0-9]+", "-", socket_path.lower()).strip("-")[:40]
+    digest = hashlib.sha256(socket_path.encode("utf8")).hexdigest()[:16]
+    return f"{slug}-{digest}.unix"
+
+
+def route_unix_url(url: str) -> Optional[tuple[str, str]]:
+    """If url is a 'http+unix://' URL, return the path to the socket and the
+    http:// URL to use instead
+
+    The socket path is percent-encoded, so for example
+    'http+unix://%2Frun%2Fapp.sock/users?id=1' is turned into
+    'http://run-app-sock-1a5f35e6cb91a4f3.unix/users?id=1'.
+    """
+    match = _UNIX_URL.match(url)
+    if match is None:
+        return None
+
+    socket_path = unquote(match.group("socket"))
+    rest = match.group("rest") or "/"
+    if not rest.startswith("/"):
+        rest = "/" + rest
+
+    return socket_path, f"http://{unix_socket_host(socket_path)}{rest}"
+
+
+class _UnixHTTPConnection(HTTPConnection):
+    """Connection which connects to a Unix socket instead of to the host"""
+
+    def __init__(self, *args: Any, socket_path: str, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.socket_path = socket_path
+
+    def _new_conn(self) -> socket.socket:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        if isinstance(self.timeout, int | float):
+            sock.settimeout(self.timeout)
+
+        try:
+            sock.connect(self.socket_path)
+        except TimeoutError as e:
+            sock.close()
+            raise ConnectTimeoutError(
+                self, f"Connection to {self.socket_path} timed out"
+            ) from e
+        except OSError as e:
+            sock.close()
+            raise NewConnectionError(
+                self, f"Failed to connect to {self.socket_path}: {e}"
+            ) from e
+
+        return sock
+
+
+class _UnixHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _UnixHTTPConnection
+
+
+class _UnixPoolManager(PoolManager):
+    """Pool manager which connects to a Unix socket for every host
+
+    Pools are still kept for each host, so the Host header is the same as it
+    would be for a TCP connection.
+    """
+
+    def __init__(self, socket_path: str, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.socket_path = socket_path
+
+    def _new_pool(
+        self,
+        scheme: str,
+        host: str,
+        port: int,
+        request_context: Optional[dict[str, Any]] = None,
+    ) -> HTTPConnectionPool:
+        if request_context is None:
+            request_context = self.connection_pool_kw.copy()
+
+        # Only plain HTTP is sent to the socket, so TLS settings aren't used
+        for key in ("scheme", "host", "port", "socket_options", *SSL_KEYWORDS):
+            request_context.pop(key, None)
+
+        return _UnixHTTPConnectionPool(
+            host, port, socket_path=self.socket_path, **request_context
+        )
+
+
+class UnixSocketAdapter(HTTPAdapter):
+    """Adapter which sends plain HTTP requests to a Unix socket, keeping
+    connections open in the same way as for TCP"""
+
+    def __init__(self, socket_path: str, **kwargs: Any) -> None:
+        self.socket_path = socket_path
+        super().__init__(**kwargs)
+
+    def init_poolmanager(
+        self, connections: int, maxsize: int, block: bool = False, **pool_kwargs: Any
+    ) -> None:
+        self._pool_connections = connections
+        self._pool_maxsize = maxsize
+        self._pool_block = block
+
+        self.poolmanager = _UnixPoolManager(
+            self.socket_path,
+            num_pools=connections,
+            maxsize=maxsize,
+            block=block,
+            **pool_kwargs,
+        )
+
+    def send(  # noqa: PLR0917 - same signature as HTTPAdapter
+        self,
+        request: requests.PreparedRequest,
+        stream: bool = False,
+        timeout: Any = None,
+        verify: bool | str = True,
+        cert: Any = None,
+        proxies: Any = None,
+    ) -> requests.Response:
+        scheme = urlsplit(str(request.url)).scheme
+        if scheme != "http":
+            raise requests.exceptions.InvalidSchema(
+                f"Only http:// requests can be sent to a Unix socket, not {scheme}://"
+            )
+
+        logger.debug(
+            "Sending %s %s to %s", request.method, request.url, self.socket_path
+        )
+
+        # Never sent through a proxy
+        return super().send(request, stream, timeout, verify, cert, proxies=None)
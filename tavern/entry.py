@@ -1,8 +1,12 @@
 import argparse
+import dataclasses
+import json
 import logging.config
+import sys
 from argparse import ArgumentParser
 from textwrap import dedent
 
+from ._core.pytest.config import TestConfig
 from .core import run
 
 
@@ -94,3 +98,103 @@ def main() -> None:
     global_cfg = vargs.pop("tavern_global_cfg", {})
 
     raise SystemExit(run(in_file, global_cfg, pytest_args=remaining, **vargs))
+
+
+class TavernLintArgParser(ArgumentParser):
+    def __init__(self) -> None:
+        description = """Check Tavern test files for errors without running them
+
+        Every test in each file is loaded and checked against the schema, including
+        the schemas for any plugins. Files are checked in parallel, and files which
+        have not changed since they were last checked are not checked again."""
+
+        super().__init__(
+            description=dedent(description),
+            formatter_class=argparse.RawDescriptionHelpFormatter,
+        )
+
+        self.add_argument(
+            "paths",
+            help="Test files, or directories to search for test files in",
+            nargs="+",
+        )
+
+        self.add_argument(
+            "--jobs",
+            "-j",
+            help="Number of processes to use (defaults to the number of CPUs)",
+            type=int,
+            default=None,
+        )
+
+        self.add_argument(
+            "--output-format",
+            help="Format to print problems in",
+            choices=["text", "json"],
+            default="text",
+        )
+
+        self.add_argument(
+            "--cache-file",
+            help="File to store results in, so unchanged files are not checked again",
+            default=".tavern_lint_cache.json",
+        )
+
+        self.add_argument(
+            "--no-cache",
+            help="Check every file, and do not store the results",
+            action="store_true",
+            default=False,
+        )
+
+        self.add_argument(
+            "--tavern-file-path-regex",
+            help="Regex for test files to check when searching directories",
+            default=r".+\.tavern\.ya?ml$",
+        )
+
+        for backend in TestConfig.backends():
+            self.add_argument(
+                f"--tavern-{backend}-backend",
+                help=f"Which {backend} backend to use",
+                default=None,
+            )
+
+
+def lint() -> None:
+    # Not needed to run tests, so only imported when checking them
+    from ._core.lint import LintCache, find_test_files, lint_files
+
+    args = TavernLintArgParser().parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+
+    backends = {b: getattr(args, f"tavern_{b}_backend") for b in TestConfig.backends()}
+
+    cache = None
+    if not args.no_cache:
+        cache = LintCache(args.cache_file, backends)
+
+    paths = list(find_test_files(args.paths, args.tavern_file_path_regex))
+    results = lint_files(paths, backends, jobs=args.jobs, cache=cache)
+
+    diagnostics = [d for r in results for d in r.diagnostics]
+
+    if args.output_format == "json":
+        json.dump(
+            {
+                "files": len(results),
+                "diagnostics": [dataclasses.asdict(d) for d in diagnostics],
+            },
+            sys.stdout,
+            indent=2,
+        )
+        sys.stdout.write("\n")
+    else:
+        for diagnostic in diagnostics:
+            sys.stdout.write(f"{diagnostic.format()}\n")
+        sys.stdout.write(
+            f"Checked {len(results)} files, found {len(diagnostics)} problems\n"
+        )
+
+    raise SystemExit(1 if diagnostics else 0)
@@ -6,6 +6,7 @@ import stevedore
 import yaml
 
 import tavern
+from tavern._core.pytest.util import get_option_generic
 from tavern._plugins.rest.tavernhook import TavernRestPlugin as rest_plugin
 
 
@@ -18,7 +19,14 @@ def run_all():
 
 
 @pytest.fixture(scope="session", autouse=True)
-def set_plugins():
+def set_plugins(pytestconfig):
+    if get_option_generic(pytestconfig, "tavern-http-backend", None) not in (
+        None,
+        "requests",
+    ):
+        # Load whichever HTTP backend was chosen, like a normal test run
+        return
+
     def extension(name, point):
         return stevedore.extension.Extension(name, point, point, point)
 
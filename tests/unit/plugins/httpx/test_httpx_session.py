@@ -0,0 +1,106 @@
+import io
+from unittest.mock import patch
+
+import pytest
+import requests
+
+from tavern._core import exceptions
+from tavern._plugins.httpx.session import HttpxSession
+
+
+def test_httpx_not_installed():
+    with patch("tavern._plugins.httpx.session.httpx", None):
+        with pytest.raises(exceptions.PluginLoadError):
+            HttpxSession()
+
+
+class TestHttpxSession:
+    @pytest.fixture(autouse=True)
+    def httpx(self):
+        return pytest.importorskip("httpx")
+
+    @pytest.fixture(name="requests_seen")
+    def fix_requests_seen(self):
+        return []
+
+    @pytest.fixture(name="session")
+    def fix_session(self, httpx, requests_seen):
+        def handler(request):
+            requests_seen.append(request)
+
+            if request.url.path == "/redirect":
+                return httpx.Response(302, headers={"location": "/echo"})
+            if request.url.path == "/login":
+                return httpx.Response(
+                    200, headers={"set-cookie": "session=abc; Path=/"}
+                )
+
+            return httpx.Response(
+                200,
+                json={"method": request.method, "body": request.content.decode()},
+                headers=[("x-multi", "a"), ("x-multi", "b")],
+            )
+
+        with patch(
+            "tavern._plugins.httpx.session._create_transport",
+            return_value=httpx.MockTransport(handler),
+        ):
+            with HttpxSession(reuse_connections=False) as session:
+                yield session
+
+    def test_response_converted(self, session):
+        response = session.request("POST", "http://a.com/echo", json={"a": 1})
+
+        assert isinstance(response, requests.Response)
+        assert response.status_code == 200
+        assert response.json() == {"method": "POST", "body": '{"a":1}'}
+        assert response.headers["X-Multi"] == "a, b"
+        assert response.request.method == "POST"
+
+    def test_cookies(self, session, requests_seen):
+        response = session.request("GET", "http://a.com/login")
+
+        assert "session" in response.cookies
+        assert session.cookies.get_dict() == {"session": "abc"}
+
+        session.request("GET", "http://a.com/echo")
+
+        assert requests_seen[-1].headers["cookie"] == "session=abc"
+
+    def test_redirects(self, session):
+        response = session.request(
+            "GET", "http://a.com/redirect", allow_redirects=False
+        )
+        assert response.status_code == 302
+
+        response = session.request("GET", "http://a.com/redirect")
+        assert response.status_code == 200
+        assert [r.status_code for r in response.history] == [302]
+
+    def test_data(self, session, tmp_path):
+        response = session.request("POST", "http://a.com/echo", data={"a": "b"})
+        assert response.json()["body"] == "a=b"
+
+        body = tmp_path / "body.txt"
+        body.write_text("from a file")
+
+        with body.open("rb") as file_body:
+            response = session.request("POST", "http://a.com/echo", data=file_body)
+        assert response.json()["body"] == "from a file"
+
+    def test_files(self, session):
+        # The form Tavern sends files in, with no content type or headers
+        files = {"file_body": ("OK.txt", io.BytesIO(b"uploaded"), None, None)}
+
+        response = session.request("POST", "http://a.com/echo", files=files)
+
+        body = response.json()["body"]
+        assert 'name="file_body"; filename="OK.txt"' in body
+        assert "uploaded" in body
+
+    def test_error(self, httpx, session):
+        with patch.object(
+            httpx.AsyncClient, "send", side_effect=httpx.ConnectError("refused")
+        ):
+            with pytest.raises(requests.exceptions.ConnectionError):
+                session.request("GET", "http://a.com/echo")
@@ -11,6 +11,9 @@ import pytest
 import requests
 
 from tavern._core import exceptions
+from tavern._core.dict_util import EnvironmentVariables
+from tavern._core.plugins import get_extra_sessions, get_stage_dispatch
+from tavern._core.pytest.config import IndexedStages
 from tavern._core.pytest.util import load_global_cfg
 from tavern._core.run import run_test
 from tavern._plugins.mqtt.client import MQTTClient
@@ -201,6 +204,31 @@ class TestIncludeStages:
 
         self.check_mocks_called(pmock)
 
+    def test_global_stage_not_changed(self, fulltest, mockargs, includes, fake_stages):
+        """Stages are shared between tests, so running them must not change them"""
+        mock_response = Mock(**mockargs)
+
+        del fake_stages[0]["request"]["method"]
+        fake_stages[0]["request"]["follow_redirects"] = True
+        original = deepcopy(fake_stages)
+
+        includes = dataclasses.replace(includes, stages=fake_stages)
+
+        for _ in range(2):
+            newtest = deepcopy(fulltest)
+            newtest["stages"].insert(0, {"type": "ref", "id": "my_external_stage"})
+
+            with patch(
+                "tavern._plugins.rest.request.requests.Session.request",
+                return_value=mock_response,
+            ) as pmock:
+                run_test("heif", newtest, includes)
+
+            self.check_mocks_called(pmock)
+            assert pmock.call_args_list[0][1]["allow_redirects"] is True
+
+        assert fake_stages == original
+
     def test_both_stages(self, fulltest, mockargs, includes, fake_stages):
         """Load stage defined in both - raise a warning for now"""
         mock_response = Mock(**mockargs)
@@ -352,6 +380,36 @@ class TestTavernMetaFormat:
         with pytest.raises(exceptions.MissingFormatError):
             run_test("heif", fulltest, includes)
 
+    def test_format_env_keys_frozen(self, fulltest, mockargs, includes):
+        """Uses the environment from when the snapshot was taken"""
+
+        env_key = "SPECIAL_CI_MAGIC_COMMIT_TAG"
+
+        fulltest["stages"][0]["request"]["params"] = {
+            "a_format_key": f"{{tavern.env_vars.{env_key}}}"
+        }
+
+        with patch.dict(os.environ, {env_key: "bleuihg"}):
+            env_vars = EnvironmentVariables.snapshot()
+
+        includes = dataclasses.replace(
+            includes,
+            tavern_internal=dataclasses.replace(
+                includes.tavern_internal, env_vars=env_vars
+            ),
+        )
+
+        mock_response = Mock(**mockargs)
+
+        with patch(
+            "tavern._plugins.rest.request.requests.Session.request",
+            return_value=mock_response,
+        ) as pmock:
+            with patch.dict(os.environ, {env_key: "changed"}):
+                run_test("heif", fulltest, includes)
+
+        assert pmock.call_args.kwargs["params"] == {"a_format_key": "bleuihg"}
+
 
 class TestFormatRequestVars:
     @pytest.mark.parametrize("request_key", ("params", "json", "headers"))
@@ -658,6 +716,90 @@ class TestTinctures:
         assert tincture_func_mock.call_count == len(tinctures)
 
 
+class TestStageDispatch:
+    def test_same_keys_cached(self, fulltest, includes):
+        stage = fulltest["stages"][0]
+
+        dispatch = get_stage_dispatch(stage, includes)
+
+        assert [p.name for p in dispatch.request_plugins] == ["requests"]
+        assert [p.name for p in dispatch.response_plugins] == ["requests"]
+        assert get_stage_dispatch(deepcopy(stage), includes) is dispatch
+
+    def test_no_request(self, fulltest, includes):
+        fulltest["stages"][0].pop("request")
+
+        with pytest.raises(exceptions.MissingKeysError):
+            run_test("heif", fulltest, includes)
+
+    def test_multiple_requests(self, fulltest, includes):
+        fulltest["stages"][0]["mqtt_publish"] = {"topic": "/a"}
+
+        with patch("tavern._core.run.get_extra_sessions", return_value={}):
+            with pytest.raises(exceptions.DuplicateKeysError):
+                run_test("heif", fulltest, includes)
+
+
+class TestSessionOptions:
+    def test_from_test(self, fulltest, includes):
+        fulltest["http"] = {"pool_maxsize": 3}
+
+        sessions = get_extra_sessions(fulltest, includes)
+
+        adapter = sessions["requests"].get_adapter("http://a.com")
+        assert adapter.poolmanager.connection_pool_kw["maxsize"] == 3
+
+    def test_global_defaults(self, fulltest, includes):
+        includes = dataclasses.replace(
+            includes,
+            session_defaults={"http": {"pool_maxsize": 4, "pool_block": True}},
+        )
+        fulltest["http"] = {"pool_maxsize": 3}
+
+        sessions = get_extra_sessions(fulltest, includes)
+
+        adapter = sessions["requests"].get_adapter("http://a.com")
+        assert adapter.poolmanager.connection_pool_kw["maxsize"] == 3
+        assert adapter.poolmanager.connection_pool_kw["block"] is True
+
+    @staticmethod
+    def _pytest_config(tmp_path, contents):
+        global_cfg_path = tmp_path / "global_cfg.yaml"
+        global_cfg_path.write_text(contents)
+
+        pytest_config = Mock()
+        pytest_config.getini.side_effect = lambda name: (
+            [str(global_cfg_path)] if name == "tavern-global-cfg" else None
+        )
+        pytest_config.getoption.return_value = None
+        return pytest_config
+
+    def test_global_defaults_from_file(self, tmp_path):
+        pytest_config = self._pytest_config(
+            tmp_path, "http:\n  pool_maxsize: 4\n  pool_block: true\n"
+        )
+
+        global_cfg = load_global_cfg(pytest_config)
+
+        assert global_cfg.session_defaults == {
+            "http": {"pool_maxsize": 4, "pool_block": True}
+        }
+
+    @pytest.mark.parametrize(
+        "http_block",
+        (
+            "{pool_maxsize: lots}",
+            "{bogus: 1}",
+            "{pool_maxsize: 4, unix_socket: [a, b]}",
+        ),
+    )
+    def test_global_defaults_invalid(self, tmp_path, http_block):
+        pytest_config = self._pytest_config(tmp_path, f"http: {http_block}\n")
+
+        with pytest.raises(exceptions.BadSchemaError):
+            load_global_cfg(pytest_config)
+
+
 def test_copy_config(pytestconfig):
     cfg_1 = load_global_cfg(pytestconfig)
 
@@ -668,6 +810,24 @@ def test_copy_config(pytestconfig):
     assert cfg_2.variables.get("test1") is None
 
 
+def test_new_variables_scope(includes):
+    includes = dataclasses.replace(includes, variables={"a": {"b": "c"}, "d": "e"})
+
+    scoped = includes.with_new_variables()
+    scoped.variables["d"] = "changed"
+
+    assert scoped.variables["d"] == "changed"
+    assert includes.variables["d"] == "e"
+    # Not copied
+    assert scoped.variables["a"] is includes.variables["a"]
+
+    inner = scoped.with_new_variables()
+    inner.variables["f"] = "g"
+
+    assert inner.variables["d"] == "changed"
+    assert "f" not in scoped.variables
+
+
 class TestHooks:
     def test_before_every_request_hook_called(self, fulltest, mockargs, includes):
         """Verify that the before_every_request hook is called"""
@@ -697,3 +857,40 @@ class TestHooks:
         assert "http://www.google.com" in request_args["url"]
 
         assert request_args["headers"] == {"foo": "myzclqkptpk"}
+
+
+class TestIndexedStages:
+    def test_by_id(self):
+        stages = IndexedStages([{"id": "a", "n": 1}, {"id": "a", "n": 2}, {"id": "b"}])
+
+        assert len(stages) == 3
+        assert stages.by_id["a"] == {"id": "a", "n": 2}
+        assert set(stages.by_id) == {"a", "b"}
+
+    def test_not_changed_by_source(self):
+        source = [{"id": "a"}]
+        stages = IndexedStages(source)
+
+        source[0] = {"id": "b"}
+
+        assert list(stages) == [{"id": "a"}]
+        assert set(stages.by_id) == {"a"}
+
+    def test_built_once_per_global_config(self, tmp_path):
+        global_cfg_path = tmp_path / "global_cfg.yaml"
+        global_cfg_path.write_text(
+            "stages:\n  - id: a\n    name: a\n    request:\n      url: http://a/\n"
+        )
+
+        pytest_config = Mock()
+        pytest_config.getini.side_effect = lambda name: (
+            [str(global_cfg_path)] if name == "tavern-global-cfg" else None
+        )
+        pytest_config.getoption.return_value = None
+
+        first = load_global_cfg(pytest_config)
+        second = load_global_cfg(pytest_config)
+
+        assert isinstance(first.stages, IndexedStages)
+        assert first.stages is second.stages
+        assert set(first.stages.by_id) == {"a"}
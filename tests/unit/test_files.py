@@ -4,16 +4,20 @@ import os
 import pathlib
 import tempfile
 from collections.abc import Callable, Generator
+from textwrap import dedent
 from typing import Any
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
 
 import pytest
 import yaml
 
 from tavern._core import exceptions
 from tavern._core.files import _find_file_in_include_path, _get_include_dirs
-from tavern._core.pytest.file import YamlFile
+from tavern._core.loader import ANYTHING
+from tavern._core.pytest.collection_cache import CollectionCache
+from tavern._core.pytest.file import YamlFile, _get_parametrized_items
 from tavern._core.pytest.item import YamlItem
+from tavern._core.pytest.lazy import LazyTestSpec
 
 
 @pytest.fixture(scope="function")
@@ -52,6 +56,12 @@ class Opener:
 
     path: pathlib.Path
     _generate_items: Callable[[dict], Any]
+    _collection_cache: CollectionCache | None = None
+    _lazy_load: bool = False
+
+    _load_documents = YamlFile._load_documents
+    _load_test_specs = YamlFile._load_test_specs
+    _load_test_specs_cached = YamlFile._load_test_specs_cached
 
 
 class TestGenerateFiles:
@@ -85,6 +95,37 @@ class TestGenerateFiles:
         for test, expected_name in zip(tests, expected_names):
             assert test.name == expected_name
 
+    def test_verify_cache_key(self, tavern_test_content):
+        """Each document gets a different key, which changes with the file"""
+
+        def generate_yamlitem(test_spec):
+            yield Mock(spec=YamlItem)
+
+        with tavern_test_file(tavern_test_content) as filename:
+            opener = Opener(path=filename, _generate_items=generate_yamlitem)
+            keys = [i.verify_cache_key for i in YamlFile.collect(opener)]
+
+            with filename.open("a", encoding="utf-8") as f:
+                f.write("# changed\n")
+
+            changed = [i.verify_cache_key for i in YamlFile.collect(opener)]
+
+        assert len(set(keys)) == 3
+        assert set(keys).isdisjoint(changed)
+
+    def test_no_digest_without_cache(self, tavern_test_content):
+        """Files aren't hashed unless the collection cache is enabled"""
+
+        def generate_yamlitem(test_spec):
+            yield Mock(spec=YamlItem)
+
+        with tavern_test_file(tavern_test_content) as filename:
+            opener = Opener(path=filename, _generate_items=generate_yamlitem)
+            with patch("tavern._core.pytest.collection_cache.file_digest") as pdigest:
+                list(YamlFile.collect(opener))
+
+        assert not pdigest.called
+
     @pytest.mark.parametrize(
         "content, exception",
         (
@@ -117,6 +158,286 @@ class TestGenerateFiles:
                 )
 
 
+class TestParametrizedItems:
+    @pytest.fixture(name="test_spec")
+    def fix_test_spec(self):
+        return {
+            "test_name": "parametrized",
+            "includes": [{"name": "common", "variables": {"a": "b"}}],
+            "stages": [{"id": "stage_1", "request": {"url": "{value}"}}],
+        }
+
+    @pytest.fixture(name="items")
+    def fix_items(self, request, test_spec):
+        marks = [{"parametrize": {"key": "value", "vals": ["x", "y", "z"]}}]
+        return list(_get_parametrized_items(request.node, test_spec, marks, []))
+
+    @pytest.fixture(autouse=True, scope="session")
+    def add_opts(self, pytestconfig):
+        from tavern._core.pytest.hooks import pytest_addoption  # noqa: PLC0415
+
+        with contextlib.suppress(ValueError):
+            pytest_addoption(pytestconfig._parser)
+
+    def test_stages_shared(self, items, test_spec):
+        assert [i.spec["test_name"] for i in items] == [
+            "parametrized[x]",
+            "parametrized[y]",
+            "parametrized[z]",
+        ]
+
+        for item in items:
+            assert item.spec["stages"] is test_spec["stages"]
+            assert item.spec["includes"][0] is test_spec["includes"][0]
+            assert item.spec["includes"][1]["variables"] == {
+                "value": item.spec["test_name"][-2]
+            }
+
+        # Original test is unchanged
+        assert len(test_spec["includes"]) == 1
+        assert test_spec["test_name"] == "parametrized"
+
+    def test_shared_stages_not_modified(self, items, test_spec):
+        item = items[0]
+        item.initialise_fixture_attrs()
+
+        with (
+            patch("tavern._core.pytest.item.run_test") as prun,
+            patch("tavern._core.pytest.item.verify_tests"),
+            patch("tavern._core.pytest.item.load_plugins"),
+            patch.object(YamlItem, "_load_fixture_values", return_value={}),
+        ):
+            item.runtest()
+
+        assert prun.called
+        assert item.spec["stages"][0]["name"] == "stage_1"
+        assert "name" not in test_spec["stages"][0]
+        assert "name" not in items[1].spec["stages"][0]
+
+    def test_copied_if_hooks_used(self, items, test_spec):
+        item = items[0]
+        item.initialise_fixture_attrs()
+
+        with (
+            patch("tavern._core.pytest.item.run_test"),
+            patch("tavern._core.pytest.item.verify_tests"),
+            patch("tavern._core.pytest.item.load_plugins"),
+            patch.object(YamlItem, "_load_fixture_values", return_value={}),
+            patch.object(YamlItem, "_has_test_run_hooks", return_value=True),
+        ):
+            item.runtest()
+
+        assert item.spec["includes"][0] is not test_spec["includes"][0]
+        assert (
+            item.spec["stages"][0]["request"] is not (test_spec["stages"][0]["request"])
+        )
+
+
+class TestCollectionCache:
+    @pytest.fixture(name="test_dir")
+    def fix_test_dir(self, tmp_path):
+        (tmp_path / "common.yaml").write_text("variables:\n  a: b\n")
+        (tmp_path / "test_cached.tavern.yaml").write_text(
+            dedent(
+                """
+            ---
+            test_name: cached test
+            includes:
+              - !include common.yaml
+            stages:
+              - name: stage 1
+                request: {}
+                response:
+                  json: !anything
+            """
+            )
+        )
+        return tmp_path
+
+    def _collect(self, path, cache):
+        def generate_yamlitem(test_spec):
+            yield Mock(spec=YamlItem, test_spec=test_spec)
+
+        collected = YamlFile.collect(
+            Opener(
+                path=path,
+                _generate_items=generate_yamlitem,
+                _collection_cache=cache,
+            )
+        )
+
+        return [i.test_spec for i in collected]
+
+    def test_cache_used(self, test_dir, tmp_path):
+        cache = CollectionCache(tmp_path / "cache")
+        test_path = test_dir / "test_cached.tavern.yaml"
+
+        first = self._collect(test_path, cache)
+        assert cache.load(test_path) is not None
+
+        with patch.object(YamlFile, "_load_test_specs") as pload:
+            second = self._collect(test_path, cache)
+
+        assert not pload.called
+        assert first == second
+        assert second[0]["includes"][0]["variables"] == {"a": "b"}
+        assert second[0]["stages"][0]["response"]["json"] is ANYTHING
+        assert second[0]["stages"][0].start_mark.line == 6
+
+    def test_include_changed(self, test_dir, tmp_path):
+        cache = CollectionCache(tmp_path / "cache")
+        test_path = test_dir / "test_cached.tavern.yaml"
+
+        self._collect(test_path, cache)
+        (test_dir / "common.yaml").write_text("variables:\n  a: c\n")
+
+        assert cache.load(test_path) is None
+
+        reloaded = self._collect(test_path, cache)
+        assert reloaded[0]["includes"][0]["variables"] == {"a": "c"}
+
+    def test_nondeterministic_not_cached(self, test_dir, tmp_path):
+        cache = CollectionCache(tmp_path / "cache")
+        test_path = test_dir / "test_uuid.tavern.yaml"
+        test_path.write_text(
+            dedent(
+                """
+            test_name: uuid test
+            stages:
+              - name: stage 1
+                request:
+                  json:
+                    id: !uuid
+            """
+            )
+        )
+
+        self._collect(test_path, cache)
+        assert cache.load(test_path) is None
+
+
+class TestLazyLoad:
+    @pytest.fixture(name="test_path")
+    def fix_test_path(self, tmp_path):
+        test_path = tmp_path / "test_lazy.tavern.yaml"
+        test_path.write_text(
+            dedent(
+                """
+            ---
+            test_name: simple marks
+            marks:
+              - slow
+            stages:
+              - &shared
+                name: stage 1
+                request:
+                  url: "{host}"
+                response:
+                  json: !anything
+            ---
+
+            # comment between documents
+            test_name: uses earlier anchor
+            stages:
+              - *shared
+            ---
+            test_name: parametrized
+            marks:
+              - parametrize:
+                  key: value
+                  vals: [a, b]
+            stages:
+              - id: stage_id
+                request: {}
+            ---
+            test_name: last
+            stages:
+              - id: last_stage
+                request:
+                  url: "{host}"
+            """
+            )
+        )
+        return test_path
+
+    def _collect(self, path, lazy):
+        def generate_yamlitem(test_spec):
+            yield Mock(spec=YamlItem, test_spec=test_spec)
+
+        collected = YamlFile.collect(
+            Opener(path=path, _generate_items=generate_yamlitem, _lazy_load=lazy)
+        )
+
+        return [i.test_spec for i in collected]
+
+    def test_only_simple_tests_lazy(self, test_path):
+        lazy = self._collect(test_path, True)
+
+        assert [isinstance(t, LazyTestSpec) for t in lazy] == [True, False, False, True]
+
+        assert lazy[0].test_name == "simple marks"
+        assert lazy[0].marks == ["slow"]
+        assert lazy[0].stage_names == ["stage 1"]
+        assert lazy[3].stage_names == ["last_stage"]
+
+    def test_same_as_eager(self, test_path):
+        lazy = self._collect(test_path, True)
+        eager = self._collect(test_path, False)
+
+        for lazy_spec, eager_spec in zip(lazy, eager):
+            if isinstance(lazy_spec, LazyTestSpec):
+                assert lazy_spec.start_mark.line == eager_spec.start_mark.line
+                lazy_spec = lazy_spec.load()
+
+            assert lazy_spec == eager_spec
+            assert lazy_spec.start_mark.line == eager_spec.start_mark.line
+            assert lazy_spec.start_mark.name == eager_spec.start_mark.name
+            assert (
+                lazy_spec["stages"][0].end_mark.line
+                == eager_spec["stages"][0].end_mark.line
+            )
+
+    def test_defaults_merged(self, tmp_path):
+        test_path = tmp_path / "test_lazy_defaults.tavern.yaml"
+        test_path.write_text(
+            dedent(
+                """
+            is_defaults: true
+            includes:
+              - variables:
+                  a: b
+            ---
+            test_name: uses defaults
+            stages:
+              - name: stage 1
+                request: {}
+            """
+            )
+        )
+
+        (lazy,) = self._collect(test_path, True)
+        (eager,) = self._collect(test_path, False)
+
+        assert isinstance(lazy, LazyTestSpec)
+        assert lazy.load() == eager
+
+    def test_item_loaded_on_use(self, test_path, request):
+        lazy = self._collect(test_path, True)[0]
+
+        item = YamlItem.from_parent(
+            name=lazy.test_name, parent=request.node, spec=lazy, path=test_path
+        )
+
+        with patch.object(LazyTestSpec, "load") as pload:
+            assert item.location[1] == lazy.start_mark.line
+            assert "1: stage 1" in item.obj.__doc__
+
+        assert not pload.called
+
+        assert item.spec["stages"][0]["name"] == "stage 1"
+        assert item.spec is item.spec
+
+
 class TestGetIncludeDirs:
     def test_default_dirs_no_test_file(self, monkeypatch):
         monkeypatch.delenv("TAVERN_INCLUDE", raising=False)
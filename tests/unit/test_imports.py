@@ -0,0 +1,29 @@
+import subprocess
+import sys
+
+import pytest
+
+
+@pytest.mark.parametrize(
+    "module",
+    ("tavern.core", "tavern.entry", "tavern._core.plugins", "tavern._core.lint"),
+)
+def test_import_first(module):
+    """Each module can be imported before anything else in Tavern
+
+    This is run in a new interpreter, because pytest has already imported
+    the rest of Tavern in this one.
+    """
+    subprocess.run([sys.executable, "-c", f"import {module}"], check=True)
+
+
+def test_entry_does_not_import_lint():
+    """The linter is only imported when it's used, not every time tavern-ci runs"""
+    subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import sys, tavern.entry; assert 'tavern._core.lint' not in sys.modules",
+        ],
+        check=True,
+    )
@@ -0,0 +1,253 @@
+import json
+from textwrap import dedent
+from unittest.mock import patch
+
+import pytest
+
+from tavern._core import lint
+from tavern._core.lint import LintCache, find_test_files, lint_file, lint_files
+
+_backends = {"http": "requests", "mqtt": "paho-mqtt", "grpc": "grpc"}
+
+_VALID = """\
+---
+test_name: A valid test
+
+stages:
+  - name: Get something
+    request:
+      url: http://localhost:5000/
+    response:
+      status_code: 200
+"""
+
+_INVALID = """\
+---
+test_name: A valid test
+
+stages:
+  - name: Get something
+    request:
+      url: http://localhost:5000/
+    response:
+      status_code: 200
+
+---
+test_name: An invalid test
+
+stages:
+  - name: Get something
+    request:
+      url: http://localhost:5000/
+      timeout: abc
+"""
+
+
+@pytest.fixture(name="test_dir")
+def fix_test_dir(tmp_path):
+    (tmp_path / "test_valid.tavern.yaml").write_text(_VALID)
+    (tmp_path / "test_invalid.tavern.yaml").write_text(_INVALID)
+    (tmp_path / "not_a_test.yaml").write_text("a: b\n")
+    return tmp_path
+
+
+class TestLintFile:
+    def test_valid(self, test_dir):
+        result = lint_file(str(test_dir / "test_valid.tavern.yaml"))
+
+        assert result.diagnostics == []
+        assert result.includes == []
+
+    def test_invalid_test(self, test_dir):
+        path = str(test_dir / "test_invalid.tavern.yaml")
+
+        result = lint_file(path)
+
+        assert len(result.diagnostics) == 1
+        diagnostic = result.diagnostics[0]
+        assert diagnostic.path == path
+        assert diagnostic.test_name == "An invalid test"
+        assert diagnostic.kind == "BadSchemaError"
+        assert diagnostic.line == 12
+
+    def test_invalid_yaml(self, tmp_path):
+        path = tmp_path / "test_bad.tavern.yaml"
+        path.write_text("test_name: [abc\n")
+
+        result = lint_file(str(path))
+
+        assert len(result.diagnostics) == 1
+        assert result.diagnostics[0].line == 2
+        assert result.diagnostics[0].test_name is None
+
+    def test_missing_include(self, tmp_path):
+        path = tmp_path / "test_include.tavern.yaml"
+        path.write_text(
+            dedent(
+                """
+                ---
+                test_name: A test
+                includes:
+                  - !include missing.yaml
+                stages: []
+                """
+            )
+        )
+
+        result = lint_file(str(path))
+
+        assert len(result.diagnostics) == 1
+        assert "missing.yaml" in result.diagnostics[0].message
+
+    def test_missing_file(self, tmp_path):
+        path = str(tmp_path / "test_missing.tavern.yaml")
+
+        result = lint_file(path)
+
+        assert len(result.diagnostics) == 1
+        assert result.diagnostics[0].kind == "FileNotFoundError"
+        assert not result.cacheable
+
+    def test_records_includes(self, tmp_path):
+        (tmp_path / "common.yaml").write_text(
+            dedent(
+                """
+                ---
+                name: Common
+                description: Common
+                variables:
+                  a: b
+                """
+            )
+        )
+        path = tmp_path / "test_include.tavern.yaml"
+        path.write_text(
+            dedent(
+                """
+                ---
+                test_name: A test
+                includes:
+                  - !include common.yaml
+                stages:
+                  - name: Get something
+                    request:
+                      url: http://localhost:5000/
+                """
+            )
+        )
+
+        result = lint_file(str(path))
+
+        assert result.diagnostics == []
+        assert [i for i, _ in result.includes] == [str(tmp_path / "common.yaml")]
+
+
+def test_find_test_files(test_dir):
+    found = list(find_test_files([str(test_dir)], r".+\.tavern\.ya?ml$"))
+
+    assert found == [
+        str(test_dir / "test_invalid.tavern.yaml"),
+        str(test_dir / "test_valid.tavern.yaml"),
+    ]
+
+
+class TestLintFiles:
+    @pytest.fixture(name="paths")
+    def fix_paths(self, test_dir):
+        return list(find_test_files([str(test_dir)], r".+\.tavern\.ya?ml$"))
+
+    def test_in_order(self, paths):
+        results = lint_files(paths, _backends, jobs=1)
+
+        assert [r.path for r in results] == paths
+        assert [len(r.diagnostics) for r in results] == [1, 0]
+
+    def test_process_pool(self, paths):
+        results = lint_files(paths, _backends, jobs=2)
+
+        assert [len(r.diagnostics) for r in results] == [1, 0]
+
+    def test_cache(self, paths, tmp_path):
+        cache_file = tmp_path / "cache.json"
+
+        first = lint_files(paths, _backends, jobs=1, cache=LintCache(cache_file, {}))
+
+        with patch.object(lint, "lint_file", wraps=lint_file) as plint:
+            second = lint_files(
+                paths, _backends, jobs=1, cache=LintCache(cache_file, {})
+            )
+
+        assert plint.call_count == 0
+        assert [r.diagnostics for r in first] == [r.diagnostics for r in second]
+
+        # Changing a file means it gets checked again
+        with open(paths[1], "a") as outfile:
+            outfile.write("\n")
+
+        with patch.object(lint, "lint_file", wraps=lint_file) as plint:
+            lint_files(paths, _backends, jobs=1, cache=LintCache(cache_file, {}))
+
+        assert plint.call_count == 1
+
+    def test_cache_different_settings(self, paths, tmp_path):
+        cache_file = tmp_path / "cache.json"
+
+        lint_files(paths, _backends, jobs=1, cache=LintCache(cache_file, {"a": 1}))
+
+        with patch.object(lint, "lint_file", wraps=lint_file) as plint:
+            lint_files(paths, _backends, jobs=1, cache=LintCache(cache_file, {"a": 2}))
+
+        assert plint.call_count == 2
+
+    def test_cache_is_json(self, paths, tmp_path):
+        cache_file = tmp_path / "cache.json"
+
+        lint_files(paths, _backends, jobs=1, cache=LintCache(cache_file, {}))
+
+        with cache_file.open() as infile:
+            assert set(json.load(infile)["entries"]) == set(paths)
+
+    def test_missing_file_not_cached(self, paths, tmp_path):
+        cache_file = tmp_path / "cache.json"
+        missing = str(tmp_path / "test_missing.tavern.yaml")
+
+        results = lint_files(
+            [*paths, missing], _backends, jobs=1, cache=LintCache(cache_file, {})
+        )
+
+        assert results[-1].diagnostics[0].kind == "FileNotFoundError"
+        with cache_file.open() as infile:
+            assert set(json.load(infile)["entries"]) == set(paths)
+
+    def test_cache_deleted_include(self, tmp_path):
+        (tmp_path / "common.yaml").write_text(
+            "---\nname: Common\ndescription: Common\n"
+        )
+        path = tmp_path / "test_include.tavern.yaml"
+        path.write_text(
+            dedent(
+                """
+                ---
+                test_name: A test
+                includes:
+                  - !include common.yaml
+                stages:
+                  - name: Get something
+                    request:
+                      url: http://localhost:5000/
+                """
+            )
+        )
+        cache_file = tmp_path / "cache.json"
+
+        (first,) = lint_files(
+            [str(path)], _backends, jobs=1, cache=LintCache(cache_file, {})
+        )
+        assert first.diagnostics == []
+
+        (tmp_path / "common.yaml").unlink()
+
+        (second,) = lint_files(
+            [str(path)], _backends, jobs=1, cache=LintCache(cache_file, {})
+        )
+        assert "common.yaml" in second.diagnostics[0].message
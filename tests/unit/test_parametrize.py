@@ -0,0 +1,159 @@
+import itertools
+import json
+from textwrap import dedent
+
+import pytest
+
+from tavern._core import exceptions
+from tavern._core.pytest.parametrize import combine_values, file_values
+from tavern._core.schema.extensions import check_parametrize_marks
+
+
+@pytest.fixture(name="csv_file")
+def fix_csv_file(tmp_path):
+    csv_file = tmp_path / "users.csv"
+    csv_file.write_text(
+        dedent(
+            """\
+        name,fruit
+        alice,apple
+        bob,orange
+        """
+        )
+    )
+    return csv_file
+
+
+class TestFileValues:
+    def test_csv_by_column(self, csv_file, tmp_path):
+        values = file_values(
+            {"key": ["fruit", "name"], "file": str(csv_file)}, tmp_path
+        )
+
+        assert list(values()) == [["apple", "alice"], ["orange", "bob"]]
+        # Can be read again
+        assert list(values()) == [["apple", "alice"], ["orange", "bob"]]
+
+    def test_csv_single_key(self, csv_file, tmp_path):
+        values = file_values({"key": "name", "file": str(csv_file)}, tmp_path)
+
+        assert list(values()) == ["alice", "bob"]
+
+    def test_missing_column(self, csv_file, tmp_path):
+        values = file_values({"key": "colour", "file": str(csv_file)}, tmp_path)
+
+        with pytest.raises(exceptions.BadSchemaError):
+            list(values())
+
+    def test_jsonl(self, tmp_path):
+        jsonl_file = tmp_path / "values.jsonl"
+        jsonl_file.write_text('"a"\n\n[1, 2]\n{"value": {"nested": true}}\n')
+
+        values = file_values({"key": "value", "file": str(jsonl_file)}, tmp_path)
+
+        assert list(values()) == ["a", [1, 2], {"nested": True}]
+
+    def test_json_array(self, tmp_path):
+        json_file = tmp_path / "values.data"
+        json_file.write_text(json.dumps([["a", 1], ["b", 2]]))
+
+        values = file_values(
+            {"key": ["x", "y"], "file": str(json_file), "format": "json"}, tmp_path
+        )
+
+        assert list(values()) == [["a", 1], ["b", 2]]
+
+    def test_json_not_array(self, tmp_path):
+        json_file = tmp_path / "values.json"
+        json_file.write_text(json.dumps({"a": "b"}))
+
+        values = file_values({"key": "a", "file": str(json_file)}, tmp_path)
+
+        with pytest.raises(exceptions.BadSchemaError):
+            list(values())
+
+    def test_unknown_format(self, tmp_path):
+        txt_file = tmp_path / "values.txt"
+        txt_file.write_text("a\n")
+
+        with pytest.raises(exceptions.BadSchemaError):
+            file_values({"key": "a", "file": str(txt_file)}, tmp_path)
+
+    def test_relative_to_test_file(self, csv_file, tmp_path):
+        values = file_values(
+            {"key": "name", "file": "users.csv"}, tmp_path / "test_x.tavern.yaml"
+        )
+
+        assert list(values()) == ["alice", "bob"]
+
+    def test_file_not_found(self, tmp_path):
+        with pytest.raises(exceptions.IncludedFileNotFoundError):
+            file_values({"key": "name", "file": "missing.csv"}, tmp_path / "test.yaml")
+
+
+class TestCombineValues:
+    def test_product_same_as_itertools(self):
+        vals = [[1, 2], ["a", "b", "c"], [True]]
+
+        combined = combine_values([lambda v=v: v for v in vals], ["product"] * 3)
+
+        assert list(combined) == list(itertools.product(*vals))
+
+    def test_zip(self):
+        vals = [[1, 2], ["a", "b"], ["x", "y", "z"]]
+
+        combined = combine_values(
+            [lambda v=v: v for v in vals], ["product", "zip", "product"]
+        )
+
+        assert list(combined) == [
+            (1, "a", "x"),
+            (1, "a", "y"),
+            (1, "a", "z"),
+            (2, "b", "x"),
+            (2, "b", "y"),
+            (2, "b", "z"),
+        ]
+
+    def test_zip_mismatched_lengths(self):
+        vals = [[1, 2], ["a"]]
+
+        combined = combine_values([lambda v=v: v for v in vals], ["product", "zip"])
+
+        with pytest.raises(exceptions.BadSchemaError):
+            list(combined)
+
+    def test_lazy(self):
+        def infinite():
+            return itertools.count()
+
+        combined = combine_values([infinite, lambda: ["a"]], ["product", "product"])
+
+        assert list(itertools.islice(combined, 3)) == [(0, "a"), (1, "a"), (2, "a")]
+
+    def test_inner_values_read_once(self):
+        calls = []
+
+        def factory(values):
+            def read():
+                calls.append(values)
+                return iter(values)
+
+            return read
+
+        vals = [[1, 2, 3], ["a", "b"], ["x", "y"]]
+
+        combined = combine_values([factory(v) for v in vals], ["product"] * 3)
+
+        assert list(combined) == list(itertools.product(*vals))
+        assert calls == vals
+
+
+class TestCheckFileMark:
+    @pytest.mark.parametrize("key", ("name", ["name", "fruit"]))
+    def test_file_mark_valid(self, key):
+        assert check_parametrize_marks({"key": key, "file": "users.csv"}, None, "")
+
+    def test_file_mark_bad_key(self):
+        with pytest.raises(exceptions.BadSchemaError):
+            check_parametrize_marks({"key": 1, "file": "users.csv"}, None, "")
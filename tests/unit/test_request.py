@@ -1,9 +1,18 @@
 import dataclasses
+import json
 import os
+import socket
+import socketserver
+import sys
 import tempfile
+import threading
+import time
+import types
 from contextlib import ExitStack
+from http.server import BaseHTTPRequestHandler
 from textwrap import dedent
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
+from urllib.parse import quote
 
 import pytest
 import requests
@@ -13,6 +22,8 @@ from requests.cookies import RequestsCookieJar
 from tavern._core import exceptions
 from tavern._core.extfunctions import update_from_ext
 from tavern._core.files import FileSendSpec
+from tavern._core.loader import ANYTHING
+from tavern._plugins.rest.apps import AppTarget, app_adapter, route_app_url
 from tavern._plugins.rest.request import (
     RestRequest,
     _check_allow_redirects,
@@ -21,6 +32,9 @@ from tavern._plugins.rest.request import (
     get_file_arguments,
     get_request_args,
 )
+from tavern._plugins.rest.response import RestResponse
+from tavern._plugins.rest.session import AdapterSettings, RestSession, adapter_pool
+from tavern._plugins.rest.unix import UnixSocketAdapter, route_unix_url
 
 
 @pytest.fixture(name="req")
@@ -623,3 +637,339 @@ class TestPreparedRequest:
             assert isinstance(v, str), (
                 f"Header value {v!r} for key {k!r} is not a string"
             )
+
+
+class TestRestSession:
+    def test_connections_shared(self):
+        with RestSession() as first, RestSession() as second:
+            pass
+
+        assert first.get_adapter("https://a.com") is second.get_adapter("http://b.com")
+        assert first.get_adapter("https://a.com") is adapter_pool.get()
+
+    def test_adapter_not_closed(self):
+        with RestSession() as session:
+            adapter = session.get_adapter("https://a.com")
+
+        with patch.object(adapter, "close") as pclose:
+            with RestSession():
+                pass
+
+        assert not pclose.called
+
+    def test_not_reused(self):
+        with RestSession(reuse_connections=False) as session:
+            assert session.get_adapter("https://a.com") is not adapter_pool.get()
+
+    def test_cookies_not_shared(self):
+        first = RestSession()
+        first.cookies.set("a", "b")
+
+        assert RestSession().cookies.get_dict() == {}
+
+    def test_share_cookies(self):
+        first = RestSession(share_cookies=True)
+        first.cookies.set("shared", "b")
+
+        try:
+            assert RestSession(share_cookies=True).cookies.get_dict() == {"shared": "b"}
+            assert RestSession().cookies.get_dict() == {}
+        finally:
+            adapter_pool.cookies.clear()
+
+    def test_adapter_settings(self):
+        with RestSession(pool_maxsize=3, pool_block=True, tcp_keepalive=True) as s:
+            adapter = s.get_adapter("https://a.com")
+
+        assert adapter is not adapter_pool.get()
+        assert adapter is RestSession(
+            pool_block=True, pool_maxsize=3, tcp_keepalive=True
+        ).get_adapter("https://a.com")
+        assert adapter.poolmanager.connection_pool_kw["maxsize"] == 3
+        assert adapter.poolmanager.connection_pool_kw["block"] is True
+        assert (
+            socket.SOL_SOCKET,
+            socket.SO_KEEPALIVE,
+            1,
+        ) in adapter.poolmanager.connection_pool_kw["socket_options"]
+
+    def test_max_connection_age(self):
+        settings = AdapterSettings(max_connection_age=10)
+        adapter = adapter_pool.get(settings)
+
+        with patch(
+            "tavern._plugins.rest.session.time.monotonic",
+            return_value=time.monotonic() + 20,
+        ):
+            assert adapter_pool.get(settings) is not adapter
+
+
+def _wsgi_app(environ, start_response):
+    if environ["PATH_INFO"] == "/login":
+        start_response(
+            "302 Found", [("Location", "/users?id=1"), ("Set-Cookie", "token=abc")]
+        )
+        return [b""]
+
+    if environ["PATH_INFO"] == "/error":
+        raise RuntimeError("Something went wrong")
+
+    body = {
+        "path": environ["PATH_INFO"],
+        "query": environ["QUERY_STRING"],
+        "cookie": environ.get("HTTP_COOKIE"),
+        "data": environ["wsgi.input"].read().decode(),
+    }
+    start_response("200 OK", [("Content-Type", "application/json")])
+    return [json.dumps(body).encode()]
+
+
+async def _asgi_app(scope, receive, send):
+    if scope["type"] == "lifespan":
+        while (await receive())["type"] != "lifespan.shutdown":
+            scope["state"]["started"] = True
+            await send({"type": "lifespan.startup.complete"})
+        await send({"type": "lifespan.shutdown.complete"})
+        return
+
+    message = await receive()
+    body = {
+        "path": scope["path"],
+        "data": message["body"].decode(),
+        "started": scope["state"].get("started", False),
+    }
+    await send(
+        {
+            "type": "http.response.start",
+            "status": 201,
+            "headers": [(b"content-type", b"application/json")],
+        }
+    )
+    await send({"type": "http.response.body", "body": json.dumps(body).encode()})
+
+
+class TestInProcessApps:
+    @pytest.fixture(autouse=True)
+    def apps_module(self, monkeypatch):
+        module = types.ModuleType("tavern_test_apps")
+        module.wsgi_app = _wsgi_app
+        module.asgi_app = _asgi_app
+        monkeypatch.setitem(sys.modules, "tavern_test_apps", module)
+
+        yield
+
+        app_adapter.cache_clear()
+
+    def test_route_url(self):
+        assert route_app_url("wsgi://tavern_test_apps:wsgi_app/users?id=1") == (
+            AppTarget("wsgi", "tavern_test_apps:wsgi_app"),
+            "http://wsgi-app.tavern-test-apps.wsgi/users?id=1",
+        )
+        assert route_app_url("asgi://a.b:app") == (
+            AppTarget("asgi", "a.b:app"),
+            "http://app.a.b.asgi/",
+        )
+        assert route_app_url("http://localhost:5000/users") is None
+
+    @pytest.mark.parametrize("app", ("http://a:b", "wsgi://a", "wsgi://a:b/path"))
+    def test_parse_invalid(self, app):
+        with pytest.raises(exceptions.BadSchemaError):
+            AppTarget.parse(app)
+
+    def test_wsgi_verify(self, includes):
+        login = {"method": "GET", "url": "wsgi://tavern_test_apps:wsgi_app/login"}
+        users = {
+            "method": "POST",
+            "url": "wsgi://tavern_test_apps:wsgi_app/users",
+            "params": {"id": 1},
+            "data": "abc",
+        }
+
+        with RestSession() as session:
+            response = RestRequest(session, login, includes).run()
+            expected = {
+                "status_code": 302,
+                "cookies": ["token"],
+                "redirect_query_params": {"id": "1"},
+            }
+            RestResponse(session, "login", expected, includes).verify(response)
+
+            response = RestRequest(session, users, includes).run()
+            expected = {
+                "status_code": 200,
+                "json": {
+                    "path": "/users",
+                    "query": "id=1",
+                    "cookie": "token=abc",
+                    "data": "abc",
+                },
+            }
+            RestResponse(session, "users", expected, includes).verify(response)
+
+    def test_asgi(self):
+        with RestSession() as session:
+            response = session.request(
+                "POST", "asgi://tavern_test_apps:asgi_app/users", data="abc"
+            )
+
+        assert response.status_code == 201
+        assert response.reason == "Created"
+        assert response.json() == {"path": "/users", "data": "abc", "started": True}
+
+    def test_app_setting(self):
+        with RestSession(app="wsgi://tavern_test_apps:wsgi_app") as session:
+            response = session.request("PUT", "http://localhost:5000/a", data="xyz")
+
+        assert response.json()["path"] == "/a"
+        assert response.json()["data"] == "xyz"
+
+    def test_app_error(self):
+        with RestSession() as session:
+            response = session.request("GET", "wsgi://tavern_test_apps:wsgi_app/error")
+
+        assert response.status_code == 500
+
+
+class _UnixHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def address_string(self):
+        return "unix"
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        if self.path == "/login":
+            self.send_response(302)
+            self.send_header("Location", "/users?id=1")
+            self.send_header("Set-Cookie", "token=abc")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        body = json.dumps(
+            {
+                "path": self.path,
+                "host": self.headers["Host"],
+                "cookie": self.headers.get("Cookie"),
+                "connection": id(self.connection),
+                "socket": self.server.server_address,
+            }
+        ).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="No Unix sockets")
+class TestUnixSocket:
+    @pytest.fixture(name="start_server")
+    def fix_start_server(self):
+        """Start a server listening on a socket with the given name"""
+
+        class Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+            daemon_threads = True
+
+        with ExitStack() as stack:
+            # Not using tmp_path, which can be longer than a socket path can be
+            tmpdir = stack.enter_context(tempfile.TemporaryDirectory())
+
+            def start(name):
+                path = os.path.join(tmpdir, name)
+                server = stack.enter_context(Server(path, _UnixHandler))
+                threading.Thread(target=server.serve_forever, daemon=True).start()
+                stack.callback(server.shutdown)
+                return path
+
+            yield start
+
+    @pytest.fixture(name="socket_path")
+    def fix_socket_path(self, start_server):
+        return start_server("app.sock")
+
+    def test_route_url(self):
+        assert route_unix_url("http+unix://%2Frun%2Fapp.sock/users?id=1") == (
+            "/run/app.sock",
+            "http://run-app-sock-1a5f35e6cb91a4f3.unix/users?id=1",
+        )
+        assert route_unix_url("http+unix://%2Frun%2Fapp.sock") == (
+            "/run/app.sock",
+            "http://run-app-sock-1a5f35e6cb91a4f3.unix/",
+        )
+        assert route_unix_url("http://localhost/users") is None
+
+    def test_similar_paths(self, start_server):
+        paths = [start_server(name) for name in ("app.sock", "app-sock", "App.sock")]
+
+        with RestSession() as session:
+            for path in paths:
+                url = "http+unix://" + quote(path, safe="") + "/a"
+                assert session.request("GET", url).json()["socket"] == path
+
+    def test_unix_url_verify(self, socket_path, includes):
+        url = "http+unix://" + quote(socket_path, safe="")
+        login = {"method": "GET", "url": url + "/login"}
+        users = {"method": "GET", "url": url + "/users", "params": {"id": 1}}
+
+        with RestSession() as session:
+            response = RestRequest(session, login, includes).run()
+            expected = {
+                "status_code": 302,
+                "cookies": ["token"],
+                "redirect_query_params": {"id": "1"},
+            }
+            RestResponse(session, "login", expected, includes).verify(response)
+
+            response = RestRequest(session, users, includes).run()
+            expected = {
+                "status_code": 200,
+                "json": {
+                    "path": "/users?id=1",
+                    "host": ANYTHING,
+                    "cookie": "token=abc",
+                    "connection": ANYTHING,
+                    "socket": ANYTHING,
+                },
+            }
+            RestResponse(session, "users", expected, includes).verify(response)
+
+    def test_request_unix_socket(self, socket_path, includes):
+        rspec = {
+            "method": "GET",
+            "url": "http://myservice:8080/users",
+            "unix_socket": socket_path,
+        }
+
+        with RestSession() as session:
+            response = RestRequest(session, rspec, includes).run()
+
+            # Only used for that request
+            assert "http://myservice:8080/" not in session.adapters
+
+        assert response.json()["host"] == "myservice:8080"
+
+    def test_session_unix_socket(self, socket_path):
+        with RestSession(unix_socket=socket_path) as session:
+            first = session.request("GET", "http://myservice/a").json()
+            second = session.request("GET", "http://myservice/b").json()
+
+            adapter = session.get_adapter("http://myservice/a")
+
+        assert isinstance(adapter, UnixSocketAdapter)
+        assert adapter is adapter_pool.get(AdapterSettings(unix_socket=socket_path))
+        assert first["connection"] == second["connection"]
+
+    def test_https_not_allowed(self, socket_path):
+        with RestSession(unix_socket=socket_path) as session:
+            with pytest.raises(requests.exceptions.InvalidSchema):
+                session.request("GET", "https://myservice/a")
+
+    def test_missing_socket(self, includes):
+        rspec = {"method": "GET", "url": "http+unix://%2Fdoes%2Fnot%2Fexist.sock/"}
+
+        with RestSession() as session:
+            with pytest.raises(exceptions.RestRequestException):
+                RestRequest(session, rspec, includes).run()
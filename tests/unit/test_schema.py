@@ -2,13 +2,30 @@ import contextlib
 import os
 import tempfile
 from textwrap import dedent
+from unittest.mock import patch
 
 import pytest
 import yaml
 
+from tavern._core.dict_util import recurse_access_key
 from tavern._core.exceptions import BadSchemaError
-from tavern._core.loader import load_single_document_yaml
+from tavern._core.loader import (
+    AnythingSentinel,
+    BoolToken,
+    IntSentinel,
+    IntToken,
+    RawStrToken,
+    load_single_document_yaml,
+)
+from tavern._core.schema.compiled import compile_validator
 from tavern._core.schema.files import verify_tests
+from tavern._core.schema.jsonschema import (
+    _EXTRA_CHECKS,
+    _get_compiled_validator,
+    _get_validator,
+    iter_extra_check_values,
+    verify_jsonschema,
+)
 
 
 @pytest.fixture(name="test_dict")
@@ -205,3 +222,184 @@ class TestBadSchemaAtCollect:
         with TestBadSchemaAtCollect.wrapfile_nondict(text) as filename:
             with pytest.raises(BadSchemaError):
                 load_single_document_yaml(filename)
+
+
+class TestVerifyCache:
+    def test_verified_once(self, test_dict):
+        with patch(
+            "tavern._core.schema.files.verify_jsonschema",
+            wraps=verify_jsonschema,
+        ) as pverify:
+            verify_tests(test_dict, cache_key=("test_verified_once", 0))
+            verify_tests(test_dict, cache_key=("test_verified_once", 0))
+
+        assert pverify.call_count == 1
+
+    def test_no_key_always_verified(self, test_dict):
+        with patch(
+            "tavern._core.schema.files.verify_jsonschema",
+            wraps=verify_jsonschema,
+        ) as pverify:
+            verify_tests(test_dict)
+            verify_tests(test_dict)
+
+        assert pverify.call_count == 2
+
+    def test_failure_not_cached(self, test_dict):
+        test_dict["stages"][0]["request"]["timeout"] = "bad"
+
+        for _ in range(2):
+            with pytest.raises(BadSchemaError):
+                verify_tests(test_dict, cache_key=("test_failure_not_cached", 0))
+
+    def test_validator_reused(self, test_dict):
+        schema = {"type": "object"}
+
+        assert _get_validator(schema) is _get_validator(schema)
+        assert _get_validator(schema) is not _get_validator({"type": "object"})
+
+
+class TestCompiledValidator:
+    @pytest.mark.parametrize(
+        ("path", "value"),
+        (
+            (("request", "timeout"), 1.5),
+            (("request", "timeout"), "abc"),
+            (("request", "timeout"), [1, None]),
+            (("request", "cert"), ["a", "b"]),
+            (("request", "cert"), ["a", "b", "c"]),
+            (("request", "verify"), "a"),
+            (("request", "verify"), 1),
+            (("request", "verify"), BoolToken("{verify}")),
+            (("request", "headers"), [1, "text", -1]),
+            (("request", "method"), "GET"),
+            (("request", "method"), RawStrToken("{method}")),
+            (("request", "json"), {"number": IntToken("{n}")}),
+            (("response", "status_code"), IntToken("{code}")),
+            (("response", "status_code"), AnythingSentinel()),
+            (("response", "status_code"), IntSentinel()),
+            (("response", "status_code"), "200"),
+            (("response", "json"), None),
+            (("response", "unknown"), 1),
+            (("max_retries",), -1),
+            (("max_retries",), AnythingSentinel()),
+            (("delay_before",), [1]),
+            (("skip",), "yes"),
+        ),
+    )
+    def test_same_as_jsonschema(self, test_dict, path, value):
+        """Compiled validator gives the same result and error as jsonschema"""
+        target = test_dict["stages"][0]
+        for key in path[:-1]:
+            target = target[key]
+        target[path[-1]] = value
+
+        errors = []
+        for compiled in (False, True):
+            try:
+                verify_tests(test_dict, compiled=compiled)
+            except BadSchemaError as e:
+                errors.append(str(e))
+            else:
+                errors.append(None)
+
+        assert errors[0] == errors[1]
+
+    def test_empty_stages(self, test_dict):
+        test_dict["stages"] = []
+
+        with pytest.raises(BadSchemaError):
+            verify_tests(test_dict, compiled=True)
+
+    def test_compiled_once(self, test_dict):
+        schema = {"type": "object"}
+
+        assert _get_compiled_validator(schema) is _get_compiled_validator(schema)
+
+    @pytest.mark.parametrize(
+        ("instance", "valid"),
+        (
+            ({"a": [1, 2]}, True),
+            ({"a": [1, 1]}, False),
+            ({"b": "x"}, True),
+            ({"b": "xyz"}, False),
+        ),
+    )
+    def test_unsupported_keywords(self, instance, valid):
+        """Parts of the schema which can't be compiled are checked by jsonschema"""
+        schema = {
+            "type": "object",
+            "properties": {
+                "a": {"type": "array", "uniqueItems": True},
+                "b": {"type": "string", "maxLength": 2},
+            },
+        }
+
+        validator = _get_validator(schema)
+        is_valid = compile_validator(validator)
+
+        assert is_valid(instance) is valid
+        assert validator.is_valid(instance) is valid
+
+    def test_recursive_ref(self):
+        schema = {
+            "definitions": {
+                "tree": {
+                    "type": "object",
+                    "properties": {
+                        "value": {"type": "integer"},
+                        "children": {
+                            "type": "array",
+                            "items": {"$ref": "#/definitions/tree"},
+                        },
+                    },
+                    "required": ["value"],
+                    "additionalProperties": False,
+                }
+            },
+            "$ref": "#/definitions/tree",
+        }
+
+        is_valid = compile_validator(_get_validator(schema))
+
+        assert is_valid({"value": 1, "children": [{"value": 2, "children": []}]})
+        assert not is_valid({"value": 1, "children": [{"value": "2"}]})
+        assert not is_valid({"value": 1, "children": [{"value": 2, "other": 3}]})
+
+
+class TestExtraCheckValues:
+    @pytest.mark.parametrize(
+        "extra",
+        (
+            {},
+            {"strict": False},
+            {"strict": ["json:off"], "marks": ["slow", {"parametrize": {}}]},
+            {"marks": "slow"},
+            {
+                "stages": [
+                    {"request": {"json": [1, [2, 3]], "method": "GET"}},
+                    {"request": {"json": None, "data": 0, "headers": {}}},
+                    {"request": "not a dict", "max_retries": 2},
+                    {"response": {"strict": [True]}, "mqtt_response": {}},
+                    [{"request": {"json": {}}}],
+                    None,
+                ]
+            },
+        ),
+    )
+    def test_same_as_jmespath(self, test_dict, extra):
+        """Gets the same values as querying with jmespath"""
+        test_dict.update(extra)
+
+        from_jmespath = []
+        for query in _EXTRA_CHECKS:
+            data = recurse_access_key(test_dict, query)
+            if data:
+                if query.endswith("[]"):
+                    from_jmespath.extend((query, element) for element in data)
+                else:
+                    from_jmespath.append((query, data))
+
+        values = list(iter_extra_check_values(test_dict))
+
+        assert sorted(values, key=repr) == sorted(from_jmespath, key=repr)
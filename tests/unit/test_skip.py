@@ -4,10 +4,12 @@ from collections.abc import Mapping
 from unittest.mock import patch
 
 import pytest
+import simpleeval
 
 from tavern._core import exceptions
 from tavern._core.pytest.config import TestConfig
 from tavern._core.run import run_test
+from tavern._core.skip import _compile_skip, eval_skip
 
 
 def _run_test(
@@ -122,3 +124,70 @@ class TestSkipStage:
 
         stage["skip"] = ""
         assert _run_test(stage, test_block_config, run_mock) is True
+
+
+class TestCompiledSkip:
+    @pytest.fixture
+    def test_block_config(self, includes):
+        return dataclasses.replace(includes, variables={})
+
+    @pytest.mark.parametrize(
+        ("content", "variables", "expected"),
+        (
+            ("{number} > 2", {"number": 3}, True),
+            ("{number} > 2", {"number": 1}, False),
+            ("{flag}", {"flag": True}, True),
+            ("{value} is None", {"value": None}, True),
+            ("'https' in '{hostname}'", {"hostname": "https://a.com"}, True),
+            ("'{a}' == '{a}' and {b} == 1.5", {"a": "x", "b": 1.5}, True),
+            ("'{a}' == \"{a}\"", {"a": "x"}, True),
+            ("{nested.value} == 2", {"nested": {"value": 2}}, True),
+        ),
+    )
+    def test_bound_as_names(self, content, variables, expected, test_block_config):
+        test_block_config.variables.update(variables)
+
+        assert eval_skip(content, test_block_config) is expected
+        assert _compile_skip(content) is not None
+
+    @pytest.mark.parametrize(
+        ("content", "variables", "expected"),
+        (
+            # Formatted into the code, so it's parsed as a boolean
+            ("{flag}", {"flag": "True"}, True),
+            ("{number} ** 2 == -4", {"number": -2}, True),
+            ("'{a}' == 'it\\'s'", {"a": "it\\'s"}, True),
+            ("'prefix-{a}' == 'prefix-x'", {"a": "x"}, True),
+            ("{number:d} == 2", {"number": 2}, True),
+        ),
+    )
+    def test_formatted(self, content, variables, expected, test_block_config):
+        """Same result as formatting the expression when values can't be
+        bound as names"""
+        test_block_config.variables.update(variables)
+
+        assert eval_skip(content, test_block_config) is expected
+
+    def test_parsed_once(self, test_block_config):
+        content = "{number} > 2 and '{name}' != 'skip'"
+        _compile_skip.cache_clear()
+
+        with (
+            patch(
+                "tavern._core.skip.simpleeval.SimpleEval.parse",
+                wraps=simpleeval.SimpleEval.parse,
+            ) as pparse,
+            patch("tavern._core.skip._parse") as pformatted,
+        ):
+            for number in range(5):
+                test_block_config.variables.update(
+                    {"number": number, "name": f"test{number}"}
+                )
+                assert eval_skip(content, test_block_config) is (number > 2)
+
+        assert pparse.call_count == 1
+        assert pformatted.call_count == 0
+
+    def test_missing_variable(self, test_block_config):
+        with pytest.raises(exceptions.MissingFormatError):
+            eval_skip("{missing} > 2", test_block_config)
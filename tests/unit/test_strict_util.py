@@ -1,6 +1,12 @@
 import pytest
 
-from tavern._core.strict_util import StrictOption, StrictSetting, extract_strict_setting
+from tavern._core import exceptions
+from tavern._core.strict_util import (
+    StrictLevel,
+    StrictOption,
+    StrictSetting,
+    extract_strict_setting,
+)
 
 
 @pytest.mark.parametrize(
@@ -33,3 +39,19 @@ def test_extract_strict_setting_false(strict):
         assert as_setting == strict
     if isinstance(strict, StrictOption):
         assert as_setting == strict.setting
+
+
+def test_strict_level_interned():
+    level = StrictLevel.from_options(["json:off", "headers:on"])
+
+    assert StrictLevel.from_options(["json:off", "headers:on"]) is level
+    assert StrictLevel.from_options("json:off") is StrictLevel.from_options(
+        ["json:off"]
+    )
+    assert StrictLevel.all_on() is StrictLevel.all_on()
+
+
+def test_strict_level_invalid_not_cached():
+    for _ in range(2):
+        with pytest.raises(exceptions.InvalidConfigurationException):
+            StrictLevel.from_options(["json:maybe"])
@@ -1,6 +1,7 @@
 import contextlib
 import copy
 import os
+import pickle
 import tempfile
 from collections import OrderedDict
 from textwrap import dedent
@@ -8,18 +9,30 @@ from unittest.mock import Mock, patch
 
 import pytest
 import yaml
+from box import Box
 
 from tavern._core import exceptions
 from tavern._core.dict_util import (
+    EnvironmentVariables,
     check_keys_match_recursive,
+    compile_format_string,
     deep_dict_merge,
     format_keys,
+    get_tavern_box,
     recurse_access_key,
 )
+from tavern._core.extfunctions import (
+    ext_function_registry,
+    get_wrapped_create_function,
+    get_wrapped_response_function,
+    import_ext_function,
+)
 from tavern._core.loader import (
     ANYTHING,
     DictSentinel,
     FloatSentinel,
+    ForceIncludeToken,
+    IncludeCache,
     IncludeLoader,
     IntSentinel,
     ListSentinel,
@@ -27,6 +40,7 @@ from tavern._core.loader import (
     StrSentinel,
     construct_include,
     load_single_document_yaml,
+    update_static_marks,
 )
 from tavern._core.schema.extensions import validate_extensions
 from tavern._core.schema.files import wrapfile
@@ -80,6 +94,97 @@ class TestValidateFunctions:
             validate_extensions(spec, None, None)
 
 
+class TestWrappedFunctions:
+    @pytest.fixture(autouse=True)
+    def clear_registry(self):
+        ext_function_registry.clear()
+        yield
+        ext_function_registry.clear()
+
+    def test_wrapped_once(self):
+        ext = {"function": "operator:add", "extra_args": [2]}
+
+        with patch(
+            "tavern._core.extfunctions.import_ext_function",
+            wraps=import_ext_function,
+        ) as pimport:
+            first = get_wrapped_response_function(ext)
+            second = get_wrapped_response_function(copy.deepcopy(ext))
+
+        assert first is second
+        assert first(1) == 3
+        assert pimport.call_count == 1
+
+    def test_different_arguments(self):
+        add_one = get_wrapped_create_function(
+            {"function": "operator:add", "extra_args": [1, 1]}
+        )
+        add_true = get_wrapped_create_function(
+            {"function": "operator:add", "extra_args": [1, True]}
+        )
+
+        assert add_one is not add_true
+        assert add_one() == 2
+        assert type(add_one()) is int
+
+    def test_response_and_create_separate(self):
+        ext = {"function": "operator:not_"}
+
+        assert get_wrapped_create_function(ext) is not get_wrapped_response_function(
+            ext
+        )
+
+    def test_unhashable_arguments(self):
+        ext = {
+            "function": "builtins:len",
+            "extra_args": [{"a": [1, 2], "b": {"c"}}],
+        }
+
+        assert get_wrapped_create_function(ext)() == 2
+        assert get_wrapped_create_function(ext) is get_wrapped_create_function(ext)
+
+        ext = {"function": "builtins:len", "extra_args": [bytearray(b"abc")]}
+
+        assert get_wrapped_create_function(ext)() == 3
+        assert get_wrapped_create_function(ext) is not get_wrapped_create_function(ext)
+
+    def test_arguments_not_shared(self):
+        ext = {"function": "builtins:dict", "extra_kwargs": {"a": {"b": 1}}}
+
+        first = get_wrapped_create_function(ext)()
+        first["a"]["b"] = 2
+
+        assert get_wrapped_create_function(ext)() == {"a": {"b": 1}}
+        assert ext["extra_kwargs"] == {"a": {"b": 1}}
+
+    def test_immutable_arguments_not_copied(self):
+        ext = {
+            "function": "builtins:dict",
+            "extra_kwargs": {"a": "b", "c": (1, 2.0, None)},
+        }
+
+        with patch("tavern._core.extfunctions.copy.deepcopy") as pcopy:
+            assert get_wrapped_create_function(ext)() == ext["extra_kwargs"]
+
+        pcopy.assert_not_called()
+
+    def test_patched_after_first_use(self, monkeypatch):
+        ext = {"function": "operator:add", "extra_args": [2]}
+
+        assert get_wrapped_response_function(ext)(1) == 3
+
+        monkeypatch.setattr("operator.add", lambda a, b: a - b)
+
+        assert get_wrapped_response_function(ext)(1) == -1
+
+    def test_invalid_not_cached(self):
+        with pytest.raises(exceptions.InvalidExtFunctionError):
+            get_wrapped_create_function({"function": "os:aaueurhg"})
+
+        with pytest.raises(exceptions.BadSchemaError):
+            get_wrapped_create_function({"extra_args": [1]})
+
+
 class TestDictMerge:
     def test_single_level(self):
         """Merge two depth-one dicts with no conflicts"""
@@ -366,6 +471,169 @@ class TestFormatKeys:
         formatted_2 = format_keys(formatted, {})
         assert formatted_2 == final_value
 
+    def test_no_placeholders_not_copied(self):
+        to_format = {"a": ["plain string"]}
+
+        formatted = format_keys(to_format, {})
+
+        assert formatted == to_format
+        assert formatted["a"][0] is to_format["a"][0]
+
+    @pytest.mark.parametrize(
+        "to_format",
+        (
+            "{a.b[0]}",
+            "{a[b][0]:>5}",
+            "x{n}y{f:.2f}z",
+            "{s!r}",
+            "{s!a:>10}",
+            "{n:{w}}",
+            "{{literal}} {n}",
+            "{k[x.y]}",
+            "{a.b[0].upper}",
+        ),
+    )
+    def test_same_as_str_format(self, to_format):
+        format_variables = {
+            "a": {"b": ["c"]},
+            "n": 5,
+            "f": 1.2345,
+            "s": "x y",
+            "w": 8,
+            "k": {"x.y": 1},
+        }
+
+        assert format_keys(to_format, format_variables) == to_format.format(
+            **Box(format_variables)
+        )
+
+    @pytest.mark.parametrize(
+        "to_format, expected",
+        (
+            ("{a.b[0].c}", "1"),
+            ("{a[b][0][c]}", "1"),
+            ("{a.my_key}", "2"),
+            ("{a.b}", "[{'c': 1}]"),
+            ("{a.b!r:>12}", "[{'c': 1}]".rjust(12)),
+        ),
+    )
+    def test_variables_not_converted_to_box(self, to_format, expected):
+        format_variables = {"a": {"b": [{"c": 1}], "my-key": 2}}
+
+        with patch("tavern._core.dict_util.Box", wraps=Box) as pbox:
+            assert format_keys(to_format, format_variables) == expected
+
+        # Only used to find keys which aren't valid attribute names
+        assert pbox.call_count == (1 if "my_key" in to_format else 0)
+
+    def test_missing_attribute(self):
+        with pytest.raises(exceptions.MissingFormatError):
+            format_keys("{a.c}", {"a": {"b": 1}})
+
+    def test_force_include_not_copied(self):
+        saved = {"records": [{"id": i} for i in range(3)]}
+
+        formatted = format_keys(ForceIncludeToken("{saved.records}"), {"saved": saved})
+
+        assert formatted is saved["records"]
+
+    def test_format_string_parsed_once(self):
+        compile_format_string.cache_clear()
+
+        for _ in range(3):
+            format_keys({"a": "{b}", "c": ["{b}"]}, {"b": "x"})
+
+        assert compile_format_string.cache_info().misses == 1
+
+
+class TestStaticSubtrees:
+    @pytest.fixture(name="loaded")
+    def fix_loaded(self):
+        return yaml.load(
+            dedent(
+                """
+            request:
+              url: "{host}/path"
+              json:
+                static:
+                  a: [1, 2.5, null, true, abc]
+                  b: !anyint
+                token: [!int "{number}"]
+                ext:
+                  $ext:
+                    function: abc:def
+                placeholder:
+                  a: ["{value}"]
+            """
+            ),
+            Loader=IncludeLoader,
+        )
+
+    def test_marked_when_loaded(self, loaded):
+        json_block = loaded["request"]["json"]
+
+        assert json_block["static"].is_static
+        assert json_block["static"]["a"].is_static
+        assert not json_block["token"].is_static
+        assert not json_block["ext"].is_static
+        assert not json_block["placeholder"].is_static
+        assert not json_block.is_static
+        assert not loaded.is_static
+
+    def test_static_shared_when_formatted(self, loaded):
+        formatted = format_keys(
+            loaded["request"], {"host": "h", "value": "v", "number": "1"}
+        )
+
+        assert formatted["url"] == "h/path"
+        assert formatted["json"]["placeholder"] == {"a": ["v"]}
+        assert formatted["json"]["token"] == [1]
+
+        static = loaded["request"]["json"]["static"]
+        assert formatted["json"]["static"] is static
+
+    def test_top_level_always_copied(self, loaded):
+        static = loaded["request"]["json"]["static"]
+
+        assert format_keys(static, {}) == static
+        assert format_keys(static, {}) is not static
+
+    def test_update_after_modifying(self, loaded):
+        static = loaded["request"]["json"]["static"]
+        static["a"].append("{value}")
+
+        assert not update_static_marks(loaded)
+        assert not static.is_static
+        assert not static["a"].is_static
+
+        formatted = format_keys(
+            loaded["request"], {"host": "h", "value": "v", "number": "1"}
+        )
+        assert formatted["json"]["static"]["a"][-1] == "v"
+
+
+class TestEnvironmentVariables:
+    def test_looked_up_when_used(self):
+        env_vars = EnvironmentVariables()
+
+        with patch.dict(os.environ, {"TAVERN_TEST_VAR": "abc"}):
+            assert env_vars.TAVERN_TEST_VAR == "abc"
+            assert format_keys("{env.TAVERN_TEST_VAR}", {"env": env_vars}) == "abc"
+
+        with pytest.raises(exceptions.MissingFormatError):
+            format_keys("{env.TAVERN_TEST_VAR}", {"env": env_vars})
+
+    def test_not_converted_to_box(self):
+        tavern_box = get_tavern_box()
+
+        assert isinstance(tavern_box.tavern.env_vars, EnvironmentVariables)
+
+    def test_pickle_snapshot(self):
+        with patch.dict(os.environ, {"TAVERN_TEST_VAR": "abc"}):
+            pickled = pickle.dumps(EnvironmentVariables())
+
+        assert pickle.loads(pickled)["TAVERN_TEST_VAR"] == "abc"
+
 
 class TestRecurseAccess:
     @pytest.fixture
@@ -487,3 +755,172 @@ class TestLoadFile:
                     ),
                     Mock(),
                 )
+
+
+@pytest.mark.skipif(not yaml.__with_libyaml__, reason="libyaml not available")
+class TestCLoader:
+    @pytest.fixture(name="test_file")
+    def fix_test_file(self, tmp_path):
+        (tmp_path / "common.yaml").write_text(
+            dedent(
+                """
+            name: common
+            variables:
+              host: localhost
+            """
+            )
+        )
+        (tmp_path / "body.txt").write_text("raw body")
+
+        test_file = tmp_path / "test_c_loader.tavern.yaml"
+        test_file.write_text(
+            dedent(
+                """
+            ---
+            test_name: first
+            includes:
+              - !include common.yaml
+            stages:
+              - &shared_stage
+                name: stage one
+                request:
+                  url: "{host}"
+                  json:
+                    a: !anyint
+                    b: !int "{value:d}"
+                    c: !approx 1.5
+                response:
+                  text: !include_raw body.txt
+            ---
+            test_name: second
+            stages:
+              - *shared_stage
+            """
+            )
+        )
+
+        return test_file
+
+    def _load_all(self, test_file, loader):
+        with test_file.open(encoding="utf-8") as infile:
+            return list(yaml.load_all(infile, Loader=loader))
+
+    def test_same_as_pure_python(self, test_file):
+        from tavern._core.loader import CIncludeLoader
+
+        c_loaded = self._load_all(test_file, CIncludeLoader)
+        py_loaded = self._load_all(test_file, IncludeLoader)
+
+        assert yaml.dump_all(c_loaded) == yaml.dump_all(py_loaded)
+
+        assert c_loaded[0]["includes"][0]["variables"]["host"] == "localhost"
+        assert c_loaded[1]["stages"][0]["response"]["text"] == "raw body"
+
+    def test_same_marks(self, test_file):
+        from tavern._core.loader import CIncludeLoader
+
+        c_loaded = self._load_all(test_file, CIncludeLoader)
+        py_loaded = self._load_all(test_file, IncludeLoader)
+
+        for c_doc, py_doc in zip(c_loaded, py_loaded):
+            for c_block, py_block in [
+                (c_doc, py_doc),
+                (c_doc["stages"], py_doc["stages"]),
+                (c_doc["stages"][0], py_doc["stages"][0]),
+            ]:
+                assert c_block.start_mark.name == py_block.start_mark.name
+                assert c_block.start_mark.line == py_block.start_mark.line
+                assert c_block.end_mark.line == py_block.end_mark.line
+
+    def test_empty_scalar_hook(self, test_file):
+        from tavern._core.loader import CIncludeLoader, error_on_empty_scalar
+
+        with patch("yaml.parser.Parser.process_empty_scalar", error_on_empty_scalar):
+            with pytest.raises(exceptions.BadSchemaError):
+                yaml.load("a:\nb: c\n", Loader=CIncludeLoader)
+
+            # Explicit empty strings are fine
+            assert yaml.load("a: ''\n", Loader=CIncludeLoader) == {"a": ""}
+
+
+class TestIncludeCache:
+    @pytest.fixture(name="include_file")
+    def fix_include_file(self, tmp_path):
+        include_file = tmp_path / "common.yaml"
+        include_file.write_text(
+            dedent(
+                """
+            variables:
+              nested:
+                value: 1
+              items: [1, 2]
+              any: !anything
+            """
+            )
+        )
+        return include_file
+
+    def test_cached(self, include_file):
+        cache = IncludeCache()
+
+        first = cache(str(include_file))
+        second = cache(str(include_file))
+
+        assert (cache.hits, cache.misses) == (1, 1)
+        assert first == second
+        assert second["variables"]["any"] is ANYTHING
+        assert second["variables"].start_mark.line == first["variables"].start_mark.line
+
+    def test_copies_isolated(self, include_file):
+        cache = IncludeCache()
+
+        first = cache(str(include_file))
+        first["variables"]["nested"]["value"] = 2
+        first["variables"]["items"].append(3)
+
+        second = cache(str(include_file))
+        assert second["variables"]["nested"]["value"] == 1
+        assert second["variables"]["items"] == [1, 2]
+
+    def test_reloaded_on_change(self, include_file):
+        cache = IncludeCache()
+
+        cache(str(include_file))
+        include_file.write_text("variables:\n  changed: true\n")
+
+        assert cache(str(include_file)) == {"variables": {"changed": True}}
+        assert cache.misses == 2
+
+    def test_reloaded_on_nested_change(self, tmp_path):
+        nested_file = tmp_path / "nested.yaml"
+        nested_file.write_text("value: 1\n")
+        include_file = tmp_path / "common.yaml"
+        include_file.write_text("nested: !include nested.yaml\n")
+
+        cache = IncludeCache()
+
+        assert cache(str(include_file)) == {"nested": {"value": 1}}
+
+        nested_file.write_text("value: 22\n")
+
+        assert cache(str(include_file)) == {"nested": {"value": 22}}
+        assert cache.hits == 0
+
+    def test_static_marks_copied(self, include_file):
+        cache = IncludeCache()
+
+        cache(str(include_file))
+        copied = cache(str(include_file))
+
+        assert copied["variables"]["nested"].is_static
+        assert copied["variables"]["items"].is_static
+
+    def test_nondeterministic_not_cached(self, tmp_path):
+        include_file = tmp_path / "uuid.yaml"
+        include_file.write_text("id: !uuid\n")
+
+        cache = IncludeCache()
+        cache(str(include_file))
+        cache(str(include_file))
+
+        assert (cache.hits, cache.misses) == (0, 2)